@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import os
-from datetime import datetime
+from datetime import date, datetime
 import gspread
 from google.oauth2.service_account import Credentials
 from gspread_dataframe import get_as_dataframe, set_with_dataframe
@@ -10,8 +10,78 @@ import json
 import matplotlib.pyplot as plt
 import numpy as np
 import time
-from modules.suggestions.get_brewing_suggestions import get_brewing_suggestions
+from modules.suggestions.get_brewing_suggestions import (
+    resolve_suggestion_keys,
+    rule_pack_errors,
+    rule_pack_signature,
+    suggestions_for_keys,
+)
+from modules.suggestions.brew_suggestion_model import BrewModelCache
+from modules.inventory.bean_freshness import (
+    FRESHNESS_COLUMNS,
+    FRESHNESS_ENTERING,
+    FRESHNESS_PAST,
+    FRESHNESS_PEAK,
+    bean_freshness,
+)
+from modules.inventory.inventory_styles import (
+    DEFAULT_LOW_STOCK_THRESHOLD,
+    low_stock_thresholds,
+    style_inventory,
+)
+from modules.water_chemistry.water_profiles import water_profiles
+from modules.water_chemistry.recipe_matching import RecipeIndex, water_target_vector
+from modules.brew_analytics.brewer_analytics import (
+    DRIFT_PERIOD_DAYS,
+    brewer_analytics,
+)
+from modules.brew_analytics.brew_rollups import DIMENSIONS, GRANULARITIES, BrewRollups
+from modules.brew_timer.brew_stopwatch import brew_stopwatch, format_brew_time
+from modules.option_lists.option_labels import (
+    brewer_option_labels,
+    coffee_option_labels,
+    inventory_option_labels,
+    water_recipe_option_labels,
+)
+from modules.inventory.depletion_forecast import (
+    REORDER_LEAD_DAYS,
+    ConsumptionTracker,
+    forecast_depletion,
+    reorder_list,
+)
 from modules.extraction_chart.add_extraction_chart import add_extraction_chart
+from modules.extraction_chart.brew_density import BrewDensity
+from modules.extraction_calculator.calculate_extraction import calculate_extraction
+from modules.extraction_calculator.optimize_brew_parameters import (
+    DEFAULT_RETENTION_RATIO,
+    DEFAULT_TARGET_EY,
+    DEFAULT_TARGET_TDS,
+    DEFAULT_TOTAL_WATER,
+    brew_profiles,
+    optimize_brew_parameters,
+)
+from modules.gsheets.worksheet_io import WORKSHEET_NAMES, prefetch_worksheets
+from modules.gsheets.async_worksheet_io import (
+    fetch_worksheets_async,
+    run_async,
+    write_worksheets_async,
+)
+from modules.gsheets.provision_sheet import provision_coffee_tracker_sheet
+from modules.gsheets.tenant_cache import TENANT_CACHE, next_revision
+from modules.gsheets.shared_cache import (
+    SHARED_CACHE,
+    cache_key,
+    get_or_load,
+    store_worksheet,
+    worksheet_generation,
+    worksheet_key,
+)
+from modules.brew_export.export_brew_log import EXPORT_FORMATS, export_brew_log
+from modules.brew_import.import_brews import (
+    deduct_grams_used,
+    import_brews,
+    write_brew_import,
+)
 import csv
 
 
@@ -91,69 +161,7 @@ def create_coffee_tracker_sheet(gc, email):
     """Create and initialize the Coffee Tracker Google Sheet with Water Recipes."""
     try:
         sheet = gc.create("Coffee Tracker")
-        sheet.share(email, perm_type="user", role="writer")
-
-        # Create worksheets
-        beans_ws = sheet.add_worksheet(title="Beans Inventory", rows=1000, cols=20)
-        brew_log_ws = sheet.add_worksheet(title="Brew Log", rows=1000, cols=20)
-        brewers_ws = sheet.add_worksheet(title="Brewers", rows=1000, cols=10)
-        water_recipes_ws = sheet.add_worksheet(
-            title="Water Recipes", rows=1000, cols=10
-        )  # New Worksheet
-
-        # Initialize Beans Inventory
-        beans_data = pd.DataFrame(
-            columns=[
-                "id",
-                "name",
-                "varietal",
-                "process",
-                "origin",
-                "roast_date",
-                "grams_remaining",
-                "notes",
-            ]
-        )
-        set_with_dataframe(beans_ws, beans_data)
-
-        # Initialize Brew Log
-        brew_log_data = pd.DataFrame(
-            columns=[
-                "date",
-                "coffee_id",
-                "coffee_name",
-                "dose",
-                "water_recipe",
-                "total_water",
-                "grind_size",
-                "tds_percent",
-                "extraction_yield",
-                "notes",
-            ]
-        )
-        set_with_dataframe(brew_log_ws, brew_log_data)
-
-        # Initialize Brewers
-        brewers_data = pd.DataFrame(columns=["id", "name", "type", "capacity", "notes"])
-        set_with_dataframe(brewers_ws, brewers_data)
-
-        # Initialize Water Recipes
-        water_recipes_data = pd.DataFrame(
-            columns=[
-                "id",
-                "name",
-                "magnesium_drops",
-                "calcium_drops",
-                "sodium_drops",
-                "potassium_drops",
-                "total_volume_ml",
-                "notes",
-            ]
-        )
-        set_with_dataframe(water_recipes_ws, water_recipes_data)
-
-        # Remove default sheet
-        sheet.del_worksheet(sheet.get_worksheet(0))
+        run_async(provision_coffee_tracker_sheet(sheet, email))
 
         # Store sheet ID in session state
         st.session_state["sheet_id"] = sheet.id
@@ -164,31 +172,206 @@ def create_coffee_tracker_sheet(gc, email):
         return None
 
 
-def load_data(gc, worksheet_name):
-    """Load data from a Google Sheet worksheet with caching."""
-    cache_key = f"{worksheet_name}_data"
+def tenant_get(key, default=None):
+    """Cached value shared by every session on this session's sheet."""
+    return TENANT_CACHE.get(st.session_state["sheet_id"], key, default)
 
-    if cache_key in st.session_state and not st.session_state.get(
-        "force_refresh", False
-    ):
-        return st.session_state[cache_key]
 
-    try:
-        sheet = gc.open_by_key(st.session_state["sheet_id"])
-        worksheet = sheet.worksheet(worksheet_name)
-        values = worksheet.get_all_values()
+def tenant_put(key, value):
+    """Cache a value for every session on this session's sheet."""
+    TENANT_CACHE.put(st.session_state["sheet_id"], key, value)
 
-        if values:
-            data = pd.DataFrame(values[1:], columns=values[0])
-            data = data.dropna(how="all")  # Remove empty rows
 
-            st.session_state[cache_key] = data
-            return data
+def get_data_revision(worksheet_name):
+    """Revision of a cached worksheet, bumped whenever its contents change."""
+    cached = tenant_get(("worksheet", worksheet_name))
+    return 0 if cached is None else cached[0]
 
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Error loading {worksheet_name}: {e}")
-        return pd.DataFrame()
+
+def cache_worksheet(worksheet_name, df, generation):
+    """
+    Store a worksheet in the sheet's cache, noting the shared cache
+    generation it was loaded at.
+
+    A refetch that comes back unchanged keeps its revision, so aggregates
+    built from it stay valid.
+    """
+    cached = tenant_get(("worksheet", worksheet_name))
+    if cached is not None and cached[1].equals(df):
+        revision = cached[0]
+    else:
+        revision = next_revision()
+    tenant_put(
+        ("worksheet", worksheet_name), (revision, df.copy(deep=False), generation)
+    )
+
+
+def publish_worksheet(worksheet_name, df):
+    """Cache a just-saved worksheet here and for every other replica."""
+    generation = store_worksheet(st.session_state["sheet_id"], worksheet_name, df)
+    cache_worksheet(worksheet_name, df, generation)
+
+
+def load_worksheets(gc, worksheet_names):
+    """
+    Load several worksheets with caching, fetching uncached ones concurrently.
+
+    Returns a list of DataFrames in the same order as worksheet_names.
+    """
+    force_refresh = st.session_state.get("force_refresh", False)
+    prefetch_futures = st.session_state.get("prefetch_futures", {})
+    sheet_id = st.session_state["sheet_id"]
+    generations = {}
+    frames = {}
+    missing = []
+
+    for worksheet_name in worksheet_names:
+        generation = worksheet_generation(sheet_id, worksheet_name)
+        generations[worksheet_name] = generation
+        cached = tenant_get(("worksheet", worksheet_name))
+        # A save on another replica moves the generation on
+        if cached is not None and cached[2] == generation and not force_refresh:
+            frames[worksheet_name] = cached[1]
+            continue
+
+        # Another replica may already have loaded or saved this generation
+        if not force_refresh:
+            shared = SHARED_CACHE.get(
+                worksheet_key(sheet_id, worksheet_name, generation)
+            )
+            if shared is not None:
+                frames[worksheet_name] = shared
+                cache_worksheet(worksheet_name, shared, generation)
+                continue
+
+        # Use the background prefetch started on connect if it's still pending
+        future = prefetch_futures.pop(worksheet_name, None)
+        if future is not None and not force_refresh:
+            try:
+                frames[worksheet_name] = future.result()
+                cache_worksheet(worksheet_name, frames[worksheet_name], generation)
+                continue
+            except Exception:
+                pass  # Fall back to a fresh fetch below
+
+        missing.append(worksheet_name)
+
+    if missing:
+        try:
+            sheet = gc.open_by_key(sheet_id)
+            fetched = run_async(
+                fetch_worksheets_async(sheet, missing, refresh=force_refresh)
+            )
+        except Exception as e:
+            fetched = {worksheet_name: e for worksheet_name in missing}
+
+        for worksheet_name, result in fetched.items():
+            if isinstance(result, Exception):
+                st.error(f"Error loading {worksheet_name}: {result}")
+                frames[worksheet_name] = pd.DataFrame()
+            else:
+                cache_worksheet(worksheet_name, result, generations[worksheet_name])
+                frames[worksheet_name] = result
+
+    # Other sessions share the cached frames; with copy-on-write on (see
+    # tenant_cache) a shallow copy keeps this session's edits to itself
+    return [
+        frames[worksheet_name].copy(deep=False) for worksheet_name in worksheet_names
+    ]
+
+
+def get_option_labels(worksheet_name, df, build_labels):
+    """
+    Selectbox labels for a worksheet, built once per revision and patched
+    by refresh_option_labels after a save.
+    """
+    revision = get_data_revision(worksheet_name)
+    cache = tenant_get("option_labels", {})
+    cached = cache.get((worksheet_name, build_labels))
+    if cached is None or cached[0] != revision:
+        cached = (revision, build_labels(df))
+        cache[(worksheet_name, build_labels)] = cached
+        tenant_put("option_labels", cache)
+    return cached[1]
+
+
+def refresh_option_labels(worksheet_name, previous_revision, changed_rows):
+    """
+    Relabel only changed_rows after a save and carry the rest of each cached
+    label dict over to the new revision.
+
+    Label dicts built from an older revision are left alone and get rebuilt
+    on their next use.
+    """
+    revision = get_data_revision(worksheet_name)
+    cache = tenant_get("option_labels", {})
+    for (name, build_labels), (cached_revision, labels) in list(cache.items()):
+        if name == worksheet_name and cached_revision == previous_revision:
+            labels.update(build_labels(changed_rows))
+            cache[(name, build_labels)] = (revision, labels)
+    tenant_put("option_labels", cache)
+
+
+def load_data(gc, worksheet_name):
+    """Load data from a Google Sheet worksheet with caching."""
+    return load_worksheets(gc, [worksheet_name])[0]
+
+
+def get_bean_suggestion_keys(bean_id, varietal, process):
+    """
+    Resolve a bean's varietal/process text to suggestion rule keys, once per
+    bean. The cached keys are reused until the bean's text or the loaded rule
+    packs change.
+    """
+    cache = tenant_get("bean_suggestion_keys", {})
+    names = (varietal, process, rule_pack_signature())
+    cached = cache.get(bean_id)
+    if cached is None or cached[0] != names:
+        # Resolved keys don't depend on the sheet, so every replica shares them
+        keys = get_or_load(
+            cache_key("suggestion_keys", *names),
+            lambda: resolve_suggestion_keys(varietal, process),
+        )
+        cached = (names, keys)
+        cache[bean_id] = cached
+        tenant_put("bean_suggestion_keys", cache)
+    return cached[1]
+
+
+def get_water_profiles(water_recipes_df):
+    """Mineral profile per water recipe, computed once per recipes revision."""
+    revision = get_data_revision("Water Recipes")
+    cached = tenant_get("water_profiles")
+    if cached is None or cached[0] != revision:
+        cached = (revision, water_profiles(water_recipes_df))
+        tenant_put("water_profiles", cached)
+    return cached[1]
+
+
+def get_recipe_index(water_recipes_df):
+    """Nearest-recipe index over the water profiles, built once per revision."""
+    revision = get_data_revision("Water Recipes")
+    cached = tenant_get("recipe_index")
+    if cached is None or cached[0] != revision:
+        cached = (revision, RecipeIndex(get_water_profiles(water_recipes_df)))
+        tenant_put("recipe_index", cached)
+    return cached[1]
+
+
+def water_match_caption(gc, water_quality):
+    """Rank the saved water recipes against a suggested water_quality."""
+    water_recipes_df = load_data(gc, "Water Recipes")
+    matches = get_recipe_index(water_recipes_df).nearest(
+        water_target_vector(water_quality)
+    )
+    if not matches:
+        return
+    profiles = get_water_profiles(water_recipes_df)
+    ranked = ", ".join(
+        f"**{name}** ({profiles.at[name, 'tds_ppm']:.0f} ppm TDS)"
+        for name, _ in matches
+    )
+    st.caption(f"💧 Best matching recipes: {ranked}")
 
 
 # Add this function to update the extraction calculator page
@@ -200,25 +383,36 @@ def add_brewing_suggestions_to_extraction_calculator(gc):
     beans_df = load_data(gc, "Beans Inventory")
 
     # Check if there's a selected coffee
-    if (
-        "selected_coffee_option" in st.session_state
-        and st.session_state.selected_coffee_option
-    ):
-        coffee_name = st.session_state.selected_coffee_option.split(" (")[0]
-        if not beans_df.empty and coffee_name in beans_df["name"].values:
+    coffee_id = st.session_state.get("selected_coffee_id")
+    if coffee_id and not beans_df.empty:
+        selected = beans_df[beans_df["id"] == coffee_id]
+        if not selected.empty:
             # Get varietal and process
-            coffee_data = beans_df[beans_df["name"] == coffee_name].iloc[0]
+            coffee_data = selected.iloc[0]
+            coffee_name = coffee_data["name"]
             varietal = coffee_data.get("varietal", "")
             process = coffee_data.get("process", "")
 
             # Get brewing suggestions
             if varietal or process:
-                suggestions = get_brewing_suggestions(varietal, process)
+                suggestion_keys = get_bean_suggestion_keys(
+                    coffee_data["id"], varietal, process
+                )
+                suggestions = suggestions_for_keys(*suggestion_keys)
 
                 # Display suggestions
                 with st.expander("☕ AI Brewing Suggestions", expanded=True):
                     st.markdown(f"### Suggested Brewing Parameters for {coffee_name}")
                     st.markdown(f"**Based on:** {varietal} varietal, {process} process")
+                    for error in rule_pack_errors():
+                        st.warning(f"Skipped invalid rule pack: {error}")
+                    matched = " × ".join(
+                        key.replace("_", " ").replace("/", " / ").title()
+                        for key in suggestion_keys
+                        if key
+                    )
+                    if matched:
+                        st.caption(f"Matched rules: {matched}")
                     st.markdown(f"**Description:** {suggestions['description']}")
                     # st.write(suggestions)
                     col1, col2 = st.columns(2)
@@ -232,54 +426,29 @@ def add_brewing_suggestions_to_extraction_calculator(gc):
                         st.markdown(
                             f"**Water Quality:** {suggestions['water_quality']}"
                         )
+                        water_match_caption(gc, suggestions["water_quality"])
                         st.markdown(f"**Target Brew Time:** {suggestions['brew_time']}")
                         st.markdown(f"**Technique:** {suggestions['technique']}")
 
                     # Add a button to apply these suggestions
                     if st.button("Apply These Settings"):
-                        # Parse brew ratio to calculate coffee and water amounts
-                        brew_ratio = suggestions["brew_ratio"]
-                        # Extract the ratio as a number, handling different formats
-                        try:
-                            if ":" in brew_ratio:
-                                ratio_parts = brew_ratio.split(":")
-                                # Handle format like "1:15.5 to 1"
-                                ratio_text = ratio_parts[1].strip()
-                                # Extract just the number part
-                                ratio = float(ratio_text.split()[0])
-                            elif "to" in brew_ratio.lower():
-                                # Handle format like "1 to 15.5"
-                                ratio_parts = brew_ratio.lower().split("to")
-                                ratio = float(ratio_parts[1].strip())
-                            else:
-                                # Default case, just try to convert the whole string
-                                ratio = float(brew_ratio)
-
-                            # Set a default coffee amount and calculate water
-                            coffee_amount = 15.0  # Convert to float (was 15)
-                            water_amount = coffee_amount * ratio
-
-                            # Update session state to apply these values - ensure consistent types
-                            st.session_state.suggested_coffee_dose = float(
-                                coffee_amount
-                            )
-                            st.session_state.suggested_water_amount = float(
-                                water_amount
+                        # Scale the dose to the planned batch size
+                        water_amount = float(
+                            st.session_state.get(
+                                "planned_total_water", DEFAULT_TOTAL_WATER
                             )
+                        )
+                        st.session_state.suggested_coffee_dose = round(
+                            water_amount / suggestions["ratio"], 1
+                        )
+                        st.session_state.suggested_water_amount = water_amount
 
-                            # For grind size, make sure it's properly handled
-                            grind_text = suggestions["grind_size"]
-                            if " " in grind_text:
-                                grind_part = grind_text.split(" ")[0]
-                            else:
-                                grind_part = grind_text
-                            st.session_state.suggested_grind_size = grind_part
-
-                            st.rerun()
-                        except (ValueError, IndexError) as e:
-                            st.error(
-                                f"Could not parse brew ratio: {brew_ratio}. Error: {str(e)}"
-                            )
+                        # Middle of the suggested grind range
+                        grind_low, grind_high = suggestions["grind_range"]
+                        st.session_state.suggested_grind_size = (
+                            f"{(grind_low + grind_high) / 2:g}"
+                        )
+                        st.rerun()
 
 
 def save_data(gc, data_dict):
@@ -287,14 +456,12 @@ def save_data(gc, data_dict):
     try:
         sheet = gc.open_by_key(st.session_state["sheet_id"])
 
-        # Save each dataset
-        for worksheet_name, df in data_dict.items():
-            worksheet = sheet.worksheet(worksheet_name)
-            worksheet.clear()
-            set_with_dataframe(worksheet, df)
+        # Save each dataset concurrently
+        run_async(write_worksheets_async(sheet, data_dict))
 
-            # Update cache
-            st.session_state[f"{worksheet_name}_data"] = df
+        # Update cache
+        for worksheet_name, df in data_dict.items():
+            publish_worksheet(worksheet_name, df)
 
         # Reset force refresh flag
         st.session_state["force_refresh"] = False
@@ -315,21 +482,36 @@ def update_coffee_inventory(beans_df, coffee_id, used_grams):
     return False, 0, beans_df
 
 
-def initialize_stopwatch():
-    """Initialize stopwatch in session state if not present"""
-    if "start_time" not in st.session_state:
-        st.session_state.start_time = 0
-    if "elapsed_time" not in st.session_state:
-        st.session_state.elapsed_time = 0
-    if "running" not in st.session_state:
-        st.session_state.running = False
+def save_beans_inventory(gc, beans_df, coffee_id):
+    """
+    Save the Beans Inventory after one coffee was added or edited, relabelling
+    only that coffee in the cached selectbox labels.
+    """
+    previous_revision = get_data_revision("Beans Inventory")
+    if not save_data(gc, {"Beans Inventory": beans_df}):
+        return False
+    refresh_option_labels(
+        "Beans Inventory", previous_revision, beans_df[beans_df["id"] == coffee_id]
+    )
+    return True
+
 
+def brew_timer_section():
+    """
+    Browser-side brew stopwatch feeding the Brew Time field.
 
-def format_time(seconds):
-    """Format time in mm:ss format"""
-    minutes = int(seconds // 60)
-    seconds = int(seconds % 60)
-    return f"{minutes:02d}:{seconds:02d}"
+    Stopping the timer fills Brew Time with the total and its pour phases.
+    """
+    last_state = st.session_state.get("stopwatch_state")
+    stopwatch = brew_stopwatch(last_state, key="brew_stopwatch")
+    if stopwatch and stopwatch["seq"] != (last_state or {}).get("seq"):
+        # Kept outside the widget's own state so it survives leaving the page
+        st.session_state["stopwatch_state"] = stopwatch
+        if stopwatch["event"] == "stop":
+            st.session_state["brew_time_input"] = format_brew_time(
+                stopwatch["elapsed"], stopwatch["laps"]
+            )
+    return st.text_input("Brew Time(mm : ss)", key="brew_time_input")
 
 
 def main():
@@ -346,9 +528,6 @@ def main():
         )
         return
 
-    # Initialize stopwatch
-    initialize_stopwatch()
-
     # Check if we've already set up the sheet
     if "sheet_id" not in st.session_state:
         st.title("Coffee Tracker Setup")
@@ -372,9 +551,14 @@ def main():
                 ].iloc[0]
                 try:
                     # Test if we can open the sheet
-                    gc.open_by_key(sheet_id)
+                    sheet = gc.open_by_key(sheet_id)
                     st.session_state["sheet_id"] = sheet_id
                     st.session_state["user_email"] = selected_email
+
+                    # Warm the worksheet caches while the pages rerun
+                    st.session_state["prefetch_futures"] = prefetch_worksheets(
+                        sheet, WORKSHEET_NAMES
+                    )
                     st.success(f"Loaded sheet for {selected_email}")
                     st.rerun()
                 except Exception as e:
@@ -404,9 +588,12 @@ def main():
         if sheet_id and sheet_email and st.button("Connect to Existing Sheet"):
             try:
                 # Test if we can open the sheet
-                gc.open_by_key(sheet_id)
+                sheet = gc.open_by_key(sheet_id)
                 st.session_state["sheet_id"] = sheet_id
                 st.session_state["user_email"] = sheet_email
+                st.session_state["prefetch_futures"] = prefetch_worksheets(
+                    sheet, WORKSHEET_NAMES
+                )
 
                 # Save to registry for future use
                 save_sheet_registry(sheet_email, sheet_id)
@@ -448,6 +635,185 @@ def main():
     elif page == "Brew Log":
         brew_log_page(gc)
 
+    # Every page has now reloaded what it shows, so later reruns can use the
+    # cache again
+    st.session_state["force_refresh"] = False
+
+
+def get_brew_profiles(brew_log_df):
+    """Per-coffee retention/yield profiles, cached until the brew log changes."""
+    revision = get_data_revision("Brew Log")
+    cached = tenant_get("brew_profiles")
+    if cached is None or cached[0] != revision:
+        cached = (revision, brew_profiles(brew_log_df))
+        tenant_put("brew_profiles", cached)
+    return cached[1]
+
+
+def get_brew_models(brew_log_df):
+    """Per-coffee learned brew models, fitted once per brew log revision."""
+    revision = get_data_revision("Brew Log")
+    cached = tenant_get("brew_models")
+    if cached is None or cached[0] != revision:
+        cached = (revision, BrewModelCache.from_brew_log(brew_log_df))
+        tenant_put("brew_models", cached)
+    return cached[1]
+
+
+def get_consumption_tracker(brew_log_df):
+    """Per-coffee daily consumption, aggregated once per brew log revision."""
+    revision = get_data_revision("Brew Log")
+    cached = tenant_get("consumption_tracker")
+    if cached is None or cached[0] != revision:
+        cached = (revision, ConsumptionTracker.from_brew_log(brew_log_df))
+        tenant_put("consumption_tracker", cached)
+    return cached[1]
+
+
+def get_depletion_forecast(beans_df, brew_log_df):
+    """
+    Run-out forecast for every bean, recomputed once per day or when the
+    inventory or brew log changes.
+    """
+    key = (
+        date.today(),
+        get_data_revision("Beans Inventory"),
+        get_data_revision("Brew Log"),
+    )
+    cached = tenant_get("depletion_forecast")
+    if cached is None or cached[0] != key:
+        rates = get_consumption_tracker(brew_log_df).rates(key[0])
+        cached = (key, forecast_depletion(beans_df, rates, key[0]))
+        tenant_put("depletion_forecast", cached)
+    return cached[1]
+
+
+def record_saved_brew(new_brew, previous_revision):
+    """
+    Fold a just-saved brew into the cached per-brew aggregates instead of
+    rebuilding them from the whole log.
+
+    Aggregates built from an older revision are left alone and get rebuilt
+    on their next use.
+    """
+    revision = get_data_revision("Brew Log")
+    for cache_key in (
+        "brew_models",
+        "consumption_tracker",
+        "brew_rollups",
+        "brew_density",
+    ):
+        cached = tenant_get(cache_key)
+        if cached is not None and cached[0] == previous_revision:
+            cached[1].add_brew(new_brew)
+            tenant_put(cache_key, (revision, cached[1]))
+
+
+def get_brew_density(brew_log_df):
+    """Brew history density grids, built once per brew log revision."""
+    revision = get_data_revision("Brew Log")
+    cached = tenant_get("brew_density")
+    if cached is None or cached[0] != revision:
+        cached = (revision, BrewDensity.from_brew_log(brew_log_df))
+        tenant_put("brew_density", cached)
+    return cached[1]
+
+
+def brew_history_overlay(coffee_id, coffee_name, brew_log_df):
+    """Let the user pick a brew history to show on the extraction map."""
+    choices = {"None": None, "This coffee": coffee_id, "Whole log": ""}
+    if not coffee_id:
+        del choices["This coffee"]
+    choice = st.radio("Show brew history", list(choices), horizontal=True)
+    if choices[choice] is None:
+        return None
+    label = coffee_name if choices[choice] else "whole log"
+    return get_brew_density(brew_log_df).overlay(choices[choice], label)
+
+
+def learned_suggestions_section(coffee_id, water_recipe, brew_log_df):
+    """Recommend grind and ratio from this coffee's own brew history."""
+    model = get_brew_models(brew_log_df).model_for(coffee_id, water_recipe)
+    if model is None:
+        return
+
+    grind, ratio = model.recommend(DEFAULT_TARGET_EY, DEFAULT_TARGET_TDS)
+    predicted_ey, predicted_tds = model.predict(grind, ratio)
+    st.info(
+        f"📈 Learned from {model.n} of your brews: grind **{grind:.1f}** at "
+        f"**1:{ratio:.1f}** should land around {predicted_ey:.1f}% EY / "
+        f"{predicted_tds:.2f}% TDS"
+    )
+
+
+def brew_planner_section(coffee_id, brew_log_df):
+    """Solve for the dose and water that hit a target TDS and EY."""
+    with st.expander("Brew Planner"):
+        profiles = get_brew_profiles(brew_log_df)
+        retention_ratio = DEFAULT_RETENTION_RATIO
+        if str(coffee_id) in profiles.index:
+            profile = profiles.loc[str(coffee_id)]
+            retention_ratio = profile["retention_ratio"]
+            st.caption(
+                f"From {int(profile['brews'])} logged brews: "
+                f"{retention_ratio:.2f} g water retained per gram, "
+                f"average {profile['mean_tds']:.2f}% TDS / {profile['mean_ey']:.1f}% EY"
+            )
+        else:
+            st.caption(
+                f"No logged brews for this coffee yet, assuming "
+                f"{DEFAULT_RETENTION_RATIO:.1f} g water retained per gram"
+            )
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            target_tds = st.number_input(
+                "Target TDS (%)",
+                min_value=0.5,
+                max_value=2.5,
+                value=DEFAULT_TARGET_TDS,
+                step=0.01,
+                format="%.2f",
+            )
+        with col2:
+            target_ey = st.number_input(
+                "Target EY (%)",
+                min_value=10.0,
+                max_value=30.0,
+                value=DEFAULT_TARGET_EY,
+                step=0.1,
+                format="%.1f",
+            )
+        with col3:
+            planned_water = st.number_input(
+                "Planned Water (g)",
+                min_value=50.0,
+                value=float(
+                    st.session_state.get("planned_total_water", DEFAULT_TOTAL_WATER)
+                ),
+                step=10.0,
+                format="%.0f",
+            )
+        st.session_state["planned_total_water"] = planned_water
+
+        plan = optimize_brew_parameters(
+            target_tds, target_ey, retention_ratio, total_water=planned_water
+        )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Coffee Dose", f"{plan['coffee_dose']:.1f} g")
+        with col2:
+            st.metric("Brew Ratio", f"1:{plan['brew_ratio']:.1f}")
+        with col3:
+            st.metric("Expected Beverage", f"{plan['beverage_weight']:.0f} g")
+
+        if st.button("Use This Plan"):
+            st.session_state.suggested_coffee_dose = round(
+                float(plan["coffee_dose"]), 1
+            )
+            st.session_state.suggested_water_amount = float(planned_water)
+            st.rerun()
+
 
 def extraction_calculator_page(gc):
     st.title("Coffee Extraction Calculator")
@@ -461,87 +827,107 @@ def extraction_calculator_page(gc):
         + "/edit)"
     )
 
-    beans_df = load_data(gc, "Beans Inventory")
-    brewers_df = load_data(gc, "Brewers")
-    water_recipes_df = load_data(gc, "Water Recipes")
+    beans_df, brewers_df, water_recipes_df, brew_log_df = load_worksheets(
+        gc, ["Beans Inventory", "Brewers", "Water Recipes", "Brew Log"]
+    )
 
-    coffee_options = []
-    if not beans_df.empty and "name" in beans_df.columns and "id" in beans_df.columns:
-        for _, row in beans_df.iterrows():
-            if pd.notna(row["name"]) and pd.notna(row["grams_remaining"]):
-                remaining = float(row["grams_remaining"])
-                coffee_options.append(f"{row['name']} ({remaining:.1f}g)")
+    coffee_labels = get_option_labels("Beans Inventory", beans_df, coffee_option_labels)
 
     selected_coffee = None
     selected_coffee_id = None
 
-    if coffee_options:
-        selected_coffee_option = st.selectbox("Select Coffee", [""] + coffee_options)
-        if selected_coffee_option:
-            coffee_name = selected_coffee_option.split(" (")[0]
+    if coffee_labels:
+        selected_coffee_id = st.selectbox(
+            "Select Coffee",
+            [""] + list(coffee_labels),
+            format_func=lambda x: coffee_labels.get(x, x),
+        )
+        if selected_coffee_id:
+            selected_row = beans_df["id"] == selected_coffee_id
+            coffee_name = beans_df.loc[selected_row, "name"].iloc[0]
             selected_coffee = coffee_name
-            selected_coffee_id = beans_df[beans_df["name"] == coffee_name]["id"].values[
-                0
-            ]
-            
+
             # Store the selected coffee in session state
-            st.session_state["selected_coffee_option"] = selected_coffee_option
+            st.session_state["selected_coffee_id"] = selected_coffee_id
 
             # Check if coffee is low on supply
-            remaining = float(
-                beans_df[beans_df["name"] == coffee_name]["grams_remaining"].values[0]
-            )
-            if remaining < 50:
+            remaining = float(beans_df.loc[selected_row, "grams_remaining"].iloc[0])
+            threshold = low_stock_thresholds(beans_df)[selected_row].iloc[0]
+            if remaining < threshold:
                 st.warning(
                     f"⚠️ Low coffee supply: Only {remaining:.1f}g remaining of {coffee_name}"
                 )
+            forecast = get_depletion_forecast(beans_df, brew_log_df)
+            days_left = forecast.loc[selected_row, "days_left"].max()
+            if days_left <= REORDER_LEAD_DAYS:
+                st.caption(
+                    f"At your current pace this coffee runs out in about "
+                    f"{days_left:.0f} days."
+                )
 
             # Display brewing suggestions after coffee selection
             add_brewing_suggestions_to_extraction_calculator(gc)
+            brew_planner_section(selected_coffee_id, brew_log_df)
     else:
         st.info(
             "No coffee beans in inventory. Please add some in the Beans Inventory page."
         )
 
     water_recipe = None
-    if (
-        not water_recipes_df.empty
-        and "name" in water_recipes_df.columns
-        and "notes" in water_recipes_df.columns
-    ):
-        water_recipe_options = {
-            row["name"]: row["notes"] for _, row in water_recipes_df.iterrows()
-        }
+    water_recipe_labels = get_option_labels(
+        "Water Recipes", water_recipes_df, water_recipe_option_labels
+    )
+    if water_recipe_labels:
         selected_water_recipe = st.selectbox(
             "Select Water Recipe",
-            [""] + list(water_recipe_options.keys()),
-            format_func=lambda x: f"{x} - {water_recipe_options[x]}"
-            if x in water_recipe_options
-            else x,
+            [""] + list(water_recipe_labels),
+            format_func=lambda x: water_recipe_labels.get(x, x),
         )
         if selected_water_recipe:
             water_recipe = selected_water_recipe
+            profiles = get_water_profiles(water_recipes_df)
+            if water_recipe in profiles.index:
+                profile = profiles.loc[water_recipe]
+                st.caption(
+                    f"Hardness {profile['hardness_ppm']:.0f} ppm · "
+                    f"Alkalinity {profile['alkalinity_ppm']:.0f} ppm · "
+                    f"TDS {profile['tds_ppm']:.0f} ppm"
+                )
 
     brewer = None
-    if not brewers_df.empty and "name" in brewers_df.columns:
-        brewer_options = [""] + brewers_df["name"].tolist()
-        selected_brewer = st.selectbox("Select Brewer", brewer_options)
+    brewer_labels = get_option_labels("Brewers", brewers_df, brewer_option_labels)
+    if brewer_labels:
+        selected_brewer = st.selectbox(
+            "Select Brewer",
+            [""] + list(brewer_labels),
+            format_func=lambda x: brewer_labels.get(x, x),
+        )
         if selected_brewer:
             brewer = selected_brewer
 
+    if selected_coffee_id:
+        learned_suggestions_section(selected_coffee_id, water_recipe, brew_log_df)
 
     col1, col2 = st.columns(2)
     with col1:
         coffee_dose = st.number_input(
-            "Coffee Dose (g)", min_value=0.0, step=0.1, format="%.1f"
+            "Coffee Dose (g)",
+            min_value=0.0,
+            value=float(st.session_state.get("suggested_coffee_dose", 0.0)),
+            step=0.1,
+            format="%.1f",
         )
         dry_weight = st.number_input(
             "Dry Weight (g)", min_value=0.0, step=0.1, format="%.1f"
         )
         total_water = st.number_input(
-            "Total Water (g)", min_value=0.0, step=0.1, format="%.1f"
+            "Total Water (g)",
+            min_value=0.0,
+            value=float(st.session_state.get("suggested_water_amount", 0.0)),
+            step=0.1,
+            format="%.1f",
         )
-        brew_time = st.text_input("Brew Time(mm : ss)")
+        brew_time = brew_timer_section()
 
     with col2:
         beverage_weight = st.number_input(
@@ -550,18 +936,20 @@ def extraction_calculator_page(gc):
         wet_weight = st.number_input(
             "Wet Weight (g)", min_value=0.0, step=0.1, format="%.1f"
         )
-        grind_size = st.text_input("Grind Size")
+        grind_size = st.text_input(
+            "Grind Size", value=st.session_state.get("suggested_grind_size", "")
+        )
         notes = st.text_area("Tasting Notes")
 
     if coffee_dose and dry_weight and total_water and beverage_weight and wet_weight:
-        retention = wet_weight - dry_weight
-        coffee_water = total_water - retention
-        solids = abs(coffee_water - beverage_weight)
-        tds_percent = (solids / coffee_water) * 100
-        extraction_yield = (tds_percent * beverage_weight) / (
-            coffee_dose - (0.035 * coffee_dose)
+        extraction = calculate_extraction(
+            coffee_dose, dry_weight, total_water, beverage_weight, wet_weight
         )
-        brew_ratio = total_water / coffee_dose
+        retention = extraction["retention"]
+        solids = extraction["solids"]
+        tds_percent = extraction["tds_percent"]
+        extraction_yield = extraction["extraction_yield"]
+        brew_ratio = extraction["brew_ratio"]
 
         col1, col2 = st.columns(2)
         with col1:
@@ -595,7 +983,8 @@ def extraction_calculator_page(gc):
             unsafe_allow_html=True,
         )
 
-        add_extraction_chart(tds_percent, extraction_yield)
+        history = brew_history_overlay(selected_coffee_id, selected_coffee, brew_log_df)
+        add_extraction_chart(tds_percent, extraction_yield, history=history)
 
         if st.button("Save Brew to Log"):
             if selected_coffee_id:
@@ -623,10 +1012,20 @@ def extraction_calculator_page(gc):
                 )
 
                 if success:
+                    previous_revision = get_data_revision("Brew Log")
+                    previous_beans_revision = get_data_revision("Beans Inventory")
                     if save_data(
                         gc,
                         {"Brew Log": brew_log_df, "Beans Inventory": updated_beans_df},
                     ):
+                        record_saved_brew(new_brew, previous_revision)
+                        refresh_option_labels(
+                            "Beans Inventory",
+                            previous_beans_revision,
+                            updated_beans_df[
+                                updated_beans_df["id"] == selected_coffee_id
+                            ],
+                        )
                         st.success(
                             f"Brew saved! Updated {selected_coffee} inventory: {remaining:.1f}g remaining"
                         )
@@ -641,11 +1040,48 @@ def extraction_calculator_page(gc):
         st.info("Fill in all required fields to calculate extraction yield")
 
 
+def get_bean_freshness(beans_df):
+    """
+    Freshness of every bean, computed once per day and inventory revision.
+    """
+    key = (
+        date.today(),
+        get_data_revision("Beans Inventory"),
+        rule_pack_signature(),
+    )
+    cached = tenant_get("bean_freshness")
+    if cached is None or cached[0] != key:
+        cached = (key, bean_freshness(beans_df, key[0]))
+        tenant_put("bean_freshness", cached)
+    return cached[1]
+
+
+def get_inventory_table(beans_df, freshness, forecast):
+    """
+    The styled inventory table, rebuilt only when the inventory, brew log or
+    day changes.
+    """
+    key = (
+        date.today(),
+        get_data_revision("Beans Inventory"),
+        get_data_revision("Brew Log"),
+        rule_pack_signature(),
+    )
+    cached = tenant_get("inventory_table")
+    if cached is None or cached[0] != key:
+        table = beans_df.join(freshness[FRESHNESS_COLUMNS]).join(
+            forecast[["days_left", "run_out_date"]]
+        )
+        cached = (key, style_inventory(table))
+        tenant_put("inventory_table", cached)
+    return cached[1]
+
+
 def beans_inventory_page(gc):
     st.title("Coffee Beans Inventory")
 
-    # Load existing inventory
-    beans_df = load_data(gc, "Beans Inventory")
+    # Load existing inventory, with the brew log for consumption rates
+    beans_df, brew_log_df = load_worksheets(gc, ["Beans Inventory", "Brew Log"])
 
     # Form for adding new coffee
     with st.form("add_coffee_form"):
@@ -664,6 +1100,12 @@ def beans_inventory_page(gc):
             origin = st.text_input("Origin")
             roast_date = st.date_input("Roast Date")
             grams = st.number_input("Grams", min_value=0.0, step=10.0)
+            low_stock_threshold = st.number_input(
+                "Low Stock Alert (g)",
+                min_value=0.0,
+                value=DEFAULT_LOW_STOCK_THRESHOLD,
+                step=10.0,
+            )
 
         notes = st.text_area("Notes")
 
@@ -679,6 +1121,7 @@ def beans_inventory_page(gc):
                 "origin": origin,
                 "roast_date": roast_date.strftime("%Y-%m-%d"),
                 "grams_remaining": grams,
+                "low_stock_threshold": low_stock_threshold,
                 "notes": notes,
             }
 
@@ -688,9 +1131,8 @@ def beans_inventory_page(gc):
             )
 
             # Save to Google Sheets
-            if save_data(gc, {"Beans Inventory": beans_df}):
+            if save_beans_inventory(gc, beans_df, new_id):
                 st.success(f"Added {name} to inventory!")
-                st.session_state["force_refresh"] = True
                 st.rerun()
             else:
                 st.error("Failed to save to inventory")
@@ -699,6 +1141,15 @@ def beans_inventory_page(gc):
     st.markdown("### Current Inventory")
 
     if not beans_df.empty:
+        freshness = get_bean_freshness(beans_df)
+        forecast = get_depletion_forecast(beans_df, brew_log_df)
+        counts = freshness["freshness"].value_counts()
+        st.caption(
+            f"🌱 {counts.get(FRESHNESS_ENTERING, 0)} entering peak · "
+            f"☕ {counts.get(FRESHNESS_PEAK, 0)} at peak · "
+            f"⏳ {counts.get(FRESHNESS_PAST, 0)} past peak"
+        )
+
         # Sort by newest first
         if "roast_date" in beans_df.columns:
             beans_df["roast_date"] = pd.to_datetime(beans_df["roast_date"])
@@ -710,39 +1161,38 @@ def beans_inventory_page(gc):
                 beans_df["grams_remaining"], errors="coerce"
             )
 
-        # Display table with highlighting for low inventory
-        if "grams_remaining" in beans_df.columns:
+        # Display table with highlighting for low inventory and freshness
+        st.dataframe(get_inventory_table(beans_df, freshness, forecast))
+
+        # Coffees that will run out soon at the current brewing pace
+        reorder = reorder_list(beans_df, forecast)
+        if not reorder.empty:
+            st.markdown("### Reorder Soon")
             st.dataframe(
-                beans_df.style.apply(
-                    lambda x: [
-                        "background-color: rgba(234, 67, 53, 0.2)"
-                        if x.name == "grams_remaining" and v < 50
-                        else ""
-                        for i, v in enumerate(x)
-                    ],
-                    axis=1,
-                )
+                reorder[["name", "grams_remaining", "daily_grams", "run_out_date"]],
+                hide_index=True,
             )
-        else:
-            st.dataframe(beans_df)
 
         # Add option to update coffee inventory
         st.markdown("### Update Coffee Inventory")
 
-        # Create options list with name and ID
-        options = []
-        for _, row in beans_df.iterrows():
-            if pd.notna(row["name"]) and pd.notna(row["id"]):
-                options.append(f"{row['name']} (ID: {row['id']})")
+        inventory_labels = get_option_labels(
+            "Beans Inventory", beans_df, inventory_option_labels
+        )
 
-        if options:
-            selected_option = st.selectbox("Select Coffee to Update", [""] + options)
+        if inventory_labels:
+            coffee_id = st.selectbox(
+                "Select Coffee to Update",
+                [""] + list(inventory_labels),
+                format_func=lambda x: inventory_labels.get(x, x),
+            )
 
-            if selected_option:
-                coffee_id = selected_option.split("(ID: ")[1].split(")")[0]
+            if coffee_id:
                 coffee_row = beans_df[beans_df["id"] == coffee_id].iloc[0]
 
-                update_type = st.radio("Update Type", ["Add More", "Adjust Amount"])
+                update_type = st.radio(
+                    "Update Type", ["Add More", "Adjust Amount", "Low Stock Alert"]
+                )
 
                 if update_type == "Add More":
                     add_amount = st.number_input(
@@ -752,14 +1202,13 @@ def beans_inventory_page(gc):
                         idx = beans_df[beans_df["id"] == coffee_id].index[0]
                         current = float(beans_df.at[idx, "grams_remaining"])
                         beans_df.at[idx, "grams_remaining"] = current + add_amount
-                        if save_data(gc, {"Beans Inventory": beans_df}):
+                        if save_beans_inventory(gc, beans_df, coffee_id):
                             st.success(
                                 f"Added {add_amount}g to {coffee_row['name']}. New total: {current + add_amount}g"
                             )
-                            st.session_state["force_refresh"] = True
                             st.rerun()
 
-                else:
+                elif update_type == "Adjust Amount":
                     new_amount = st.number_input(
                         "New Amount (g)",
                         min_value=0.0,
@@ -769,19 +1218,177 @@ def beans_inventory_page(gc):
                     if st.button("Save Changes"):
                         idx = beans_df[beans_df["id"] == coffee_id].index[0]
                         beans_df.at[idx, "grams_remaining"] = new_amount
-                        if save_data(gc, {"Beans Inventory": beans_df}):
+                        if save_beans_inventory(gc, beans_df, coffee_id):
                             st.success(f"Updated {coffee_row['name']} to {new_amount}g")
-                            st.session_state["force_refresh"] = True
+                            st.rerun()
+
+                else:
+                    idx = beans_df[beans_df["id"] == coffee_id].index[0]
+                    new_threshold = st.number_input(
+                        "Warn Below (g)",
+                        min_value=0.0,
+                        step=10.0,
+                        value=float(low_stock_thresholds(beans_df).at[idx]),
+                    )
+                    if st.button("Save Changes"):
+                        beans_df.at[idx, "low_stock_threshold"] = new_threshold
+                        if save_beans_inventory(gc, beans_df, coffee_id):
+                            st.success(
+                                f"{coffee_row['name']} will be flagged below {new_threshold}g"
+                            )
                             st.rerun()
     else:
         st.info("No coffee beans in inventory. Add some using the form above.")
 
 
+def brew_import_section(gc, brew_log_df):
+    """Bulk import of brews from refractometer or scale exports."""
+    with st.expander("Import Brews"):
+        st.markdown(
+            "Upload a CSV or JSONL export. Rows need a date, a coffee_id from "
+            "your inventory and a dose, plus TDS/EY, a TDS with the beverage or "
+            "filter weights, or dry, wet and beverage weights."
+        )
+        uploaded_file = st.file_uploader(
+            "Brew export", type=["csv", "jsonl", "json"], key="brew_import_file"
+        )
+        deduct_inventory = st.checkbox("Deduct doses from inventory", value=True)
+
+        if uploaded_file and st.button("Import Brews"):
+            file_format = "csv" if uploaded_file.name.endswith(".csv") else "jsonl"
+            beans_df = load_data(gc, "Beans Inventory")
+
+            try:
+                result = import_brews(uploaded_file, file_format, beans_df)
+            except (ValueError, UnicodeDecodeError) as e:
+                st.error(f"Could not read {uploaded_file.name}: {e}")
+                return
+
+            rows = result["rows"]
+            for reason, count in result["rejected"].items():
+                st.warning(f"Skipped {count} rows: {reason}")
+            if rows.empty:
+                st.error("No valid brews found in the file")
+                return
+
+            updated_beans_df = None
+            if deduct_inventory and not beans_df.empty:
+                updated_beans_df = deduct_grams_used(beans_df, result["grams_used"])
+
+            try:
+                sheet = gc.open_by_key(st.session_state["sheet_id"])
+                run_async(
+                    write_brew_import(
+                        sheet, rows, list(brew_log_df.columns), updated_beans_df
+                    )
+                )
+            except Exception as e:
+                st.error(f"Error importing brews: {e}")
+                return
+
+            # Update cache
+            publish_worksheet(
+                "Brew Log", pd.concat([brew_log_df, rows], ignore_index=True)
+            )
+            if updated_beans_df is not None:
+                publish_worksheet("Beans Inventory", updated_beans_df)
+
+            st.success(f"Imported {len(rows)} brews")
+            st.rerun()
+
+
+def brew_export_section(gc):
+    """Download of the full Brew Log, written to disk chunk by chunk."""
+    with st.expander("Export Brew Log"):
+        file_format = st.selectbox("Format", list(EXPORT_FORMATS))
+        if st.button("Prepare Export"):
+            extension, mime = EXPORT_FORMATS[file_format]
+            try:
+                sheet = gc.open_by_key(st.session_state["sheet_id"])
+                # Streamlit reads the file into the one copy it serves
+                with export_brew_log(sheet, file_format) as export:
+                    st.download_button(
+                        f"Download brew_log.{extension}",
+                        data=export,
+                        file_name=f"brew_log.{extension}",
+                        mime=mime,
+                    )
+            except ImportError:
+                st.error("Parquet export requires pyarrow (pip install pyarrow)")
+            except Exception as e:
+                st.error(f"Error exporting brew log: {e}")
+
+
+def get_brewer_analytics(brew_log_df, brewers_df):
+    """Per-brewer statistics, computed once per brew log and brewers revision."""
+    key = (get_data_revision("Brew Log"), get_data_revision("Brewers"))
+    cached = tenant_get("brewer_analytics")
+    if cached is None or cached[0] != key:
+        cached = (key, brewer_analytics(brew_log_df, brewers_df))
+        tenant_put("brewer_analytics", cached)
+    return cached[1]
+
+
+def brewer_analytics_section(brew_log_df, brewers_df):
+    """EY/TDS distribution, consistency and drift for every brewer."""
+    analytics = get_brewer_analytics(brew_log_df, brewers_df)
+    if analytics.empty:
+        return
+
+    st.markdown("### Brewer Analytics")
+    st.dataframe(analytics.round(3))
+    st.caption(
+        "Std is the brew-to-brew spread (lower is more consistent). Drift is "
+        f"the average change in EY or TDS per {DRIFT_PERIOD_DAYS} days."
+    )
+
+
+def get_brew_rollups(brew_log_df):
+    """Daily/weekly/monthly rollups, bucketed once per brew log revision."""
+    revision = get_data_revision("Brew Log")
+    cached = tenant_get("brew_rollups")
+    if cached is None or cached[0] != revision:
+        cached = (revision, BrewRollups.from_brew_log(brew_log_df))
+        tenant_put("brew_rollups", cached)
+    return cached[1]
+
+
+def brew_trends_section(brew_log_df):
+    """Extraction and consumption trends, read from the rollup buckets."""
+    rollups = get_brew_rollups(brew_log_df)
+    if not rollups.keys("All"):
+        return
+
+    st.markdown("### Trends")
+    trend_col1, trend_col2, trend_col3 = st.columns(3)
+    with trend_col1:
+        granularity = st.selectbox("Period", list(GRANULARITIES), index=1)
+    with trend_col2:
+        dimension = st.selectbox("Group by", list(DIMENSIONS))
+    key = ""
+    if dimension != "All":
+        names = rollups.coffee_names if dimension == "Coffee" else {}
+        with trend_col3:
+            key = st.selectbox(
+                dimension,
+                rollups.keys(dimension),
+                format_func=lambda k: names.get(k, k),
+            )
+
+    trend = rollups.trend(granularity, dimension, key)
+    st.line_chart(trend[["ey_p10", "ey_p50", "ey_p90", "ey_mean"]])
+    st.line_chart(trend[["tds_p10", "tds_p50", "tds_p90", "tds_mean"]])
+    st.bar_chart(trend[["brews", "grams"]])
+
+
 def brew_log_page(gc):
     st.title("Coffee Brew Log")
 
-    # Load brew log
-    brew_log_df = load_data(gc, "Brew Log")
+    # Load brew log, with the brewers for per-brewer analytics
+    brew_log_df, brewers_df = load_worksheets(gc, ["Brew Log", "Brewers"])
+
+    brew_import_section(gc, brew_log_df)
+    brew_export_section(gc)
 
     if not brew_log_df.empty:
         # Sort by newest first
@@ -836,6 +1443,9 @@ def brew_log_page(gc):
 
                 # Total brews
                 st.metric("Total Brews Logged", len(brew_log_df))
+
+            brewer_analytics_section(brew_log_df, brewers_df)
+            brew_trends_section(brew_log_df)
     else:
         st.info("No brews logged yet. Use the Extraction Calculator to record brews.")
 
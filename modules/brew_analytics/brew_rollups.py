@@ -0,0 +1,294 @@
+import numpy as np
+import pandas as pd
+
+# Bucket sizes: name -> pandas period frequency
+GRANULARITIES = {"Daily": "D", "Weekly": "W", "Monthly": "M"}
+
+# Groupings: name -> Brew Log column ("" rolls up every brew together)
+DIMENSIONS = {"All": "", "Coffee": "coffee_id", "Brewer": "brewer"}
+
+# Histogram bin edges used to estimate percentiles without the raw brews.
+# TDS bins are 0.005% wide over 0.8-2.0%, where filter brews land, and 0.05%
+# outside it, which keeps a bucket's TDS histogram to ~1 KB
+EY_BIN_EDGES = np.linspace(0.0, 30.0, 61)
+TDS_BIN_EDGES = np.unique(
+    np.concatenate(
+        [
+            np.linspace(0.0, 0.8, 17),
+            np.linspace(0.8, 2.0, 241),
+            np.linspace(2.0, 3.0, 21),
+        ]
+    ).round(3)
+)
+
+PERCENTILES = [10, 50, 90]
+
+_SUM_COLUMNS = ["brews", "ey_sum", "tds_sum", "grams"]
+
+
+def _bucket_starts(dates, freq):
+    """Start of the day, week or month each date falls in."""
+    return dates.dt.to_period(freq).dt.start_time
+
+
+def _histogram_bins(values, edges):
+    bins = np.searchsorted(edges, values, side="right") - 1
+    return np.clip(bins, 0, len(edges) - 2)
+
+
+def _order_statistics(histograms, cumulative, edges, ranks):
+    """
+    Estimated ranks-th smallest value (0-based) per row of a histogram
+    matrix, spread evenly through the bin it falls in.
+    """
+    bins = np.minimum((cumulative <= ranks[:, None]).sum(axis=1), len(edges) - 2)
+    rows = np.arange(len(histograms))
+    below = np.where(bins > 0, cumulative[rows, np.maximum(bins - 1, 0)], 0)
+    in_bin = histograms[rows, bins]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(in_bin > 0, (ranks - below + 0.5) / in_bin, 0.5)
+    return edges[bins] + fraction * (edges[bins + 1] - edges[bins])
+
+
+def _histogram_percentiles(histograms, edges, percentile):
+    """
+    Percentile per row of a histogram matrix.
+
+    Interpolates between order statistics the way Series.quantile does, and
+    each order statistic lands in its own bin, so estimates are within one
+    bin width of the exact percentile.
+    """
+    counts = histograms.sum(axis=1)
+    cumulative = histograms.cumsum(axis=1)
+    last = np.maximum(counts - 1, 0)
+    position = last * percentile / 100
+    lower = np.floor(position)
+    low = _order_statistics(histograms, cumulative, edges, lower)
+    high = _order_statistics(histograms, cumulative, edges, np.minimum(lower + 1, last))
+    values = low + (position - lower) * (high - low)
+    return np.where(counts > 0, values, np.nan)
+
+
+class RollupTable:
+    """
+    Pre-aggregated buckets for one granularity and dimension.
+
+    Each (bucket start, group key) row holds the brew count, EY/TDS sums,
+    grams used and an EY and a TDS histogram. Adding brews is a scatter-add
+    into those arrays; reading a trend only touches the buckets.
+    """
+
+    def __init__(self, freq):
+        self.freq = freq
+        self.rows = {}
+        self.buckets = []
+        self.keys = []
+        self.sums = np.zeros((0, len(_SUM_COLUMNS)))
+        self.ey_hist = np.zeros((0, len(EY_BIN_EDGES) - 1), dtype=np.int32)
+        self.tds_hist = np.zeros((0, len(TDS_BIN_EDGES) - 1), dtype=np.int32)
+
+    def _row(self, bucket, key):
+        """Row of a (bucket, key) pair, appending one for a new pair."""
+        row = self.rows.get((bucket, key))
+        if row is None:
+            row = self.rows[(bucket, key)] = len(self.buckets)
+            self.buckets.append(bucket)
+            self.keys.append(key)
+        return row
+
+    def _grow(self):
+        # Grow the arrays geometrically so single-brew adds stay cheap
+        needed = len(self.buckets)
+        if needed > len(self.sums):
+            size = max(needed, 2 * len(self.sums), 16)
+            for name in ("sums", "ey_hist", "tds_hist"):
+                array = getattr(self, name)
+                grown = np.zeros((size, array.shape[1]), dtype=array.dtype)
+                grown[: len(array)] = array
+                setattr(self, name, grown)
+
+    def add(self, dates, keys, ey, tds, grams):
+        """Scatter-add brews (parallel arrays) into their buckets."""
+        bucket_codes, buckets = pd.factorize(_bucket_starts(dates, self.freq))
+        key_codes, unique_keys = pd.factorize(keys)
+        pair_codes, rows = np.unique(
+            bucket_codes.astype(np.int64) * len(unique_keys) + key_codes,
+            return_inverse=True,
+        )
+        # Only distinct (bucket, key) pairs go through the row lookup
+        pair_rows = np.array(
+            [
+                self._row(
+                    buckets[code // len(unique_keys)],
+                    unique_keys[code % len(unique_keys)],
+                )
+                for code in pair_codes.tolist()
+            ],
+            dtype=np.int64,
+        )
+        rows = pair_rows[rows.ravel()]
+        self._grow()
+
+        values = np.column_stack([np.ones(len(rows)), ey, tds, grams])
+        np.add.at(self.sums, rows, values)
+        np.add.at(self.ey_hist, (rows, _histogram_bins(ey, EY_BIN_EDGES)), 1)
+        np.add.at(self.tds_hist, (rows, _histogram_bins(tds, TDS_BIN_EDGES)), 1)
+
+    def add_one(self, date, key, ey, tds, grams):
+        """Add a single brew without going through pandas."""
+        row = self._row(pd.Period(date, self.freq).start_time, key)
+        self._grow()
+        self.sums[row] += (1, ey, tds, grams)
+        self.ey_hist[row, _histogram_bins(ey, EY_BIN_EDGES)] += 1
+        self.tds_hist[row, _histogram_bins(tds, TDS_BIN_EDGES)] += 1
+
+    def frame(self, key=None):
+        """
+        Trend table read straight from the buckets.
+
+        Parameters:
+        key (str): Group to return, e.g. a coffee id. None returns every group
+
+        Returns:
+        pd.DataFrame: Indexed by bucket start with key, brews, grams,
+        ey_mean, ey_p10/p50/p90, tds_mean and tds_p10/p50/p90
+        """
+        used = len(self.buckets)
+        keys = np.array(self.keys, dtype=object)
+        selected = np.arange(used) if key is None else np.flatnonzero(keys == key)
+        sums = self.sums[selected]
+
+        table = pd.DataFrame(
+            {
+                "key": keys[selected],
+                "brews": sums[:, 0].astype(int),
+                "grams": sums[:, 3],
+                "ey_mean": sums[:, 1] / sums[:, 0],
+            },
+            index=pd.DatetimeIndex(np.array(self.buckets, dtype=object)[selected]),
+        )
+        for p in PERCENTILES:
+            table[f"ey_p{p}"] = _histogram_percentiles(
+                self.ey_hist[selected], EY_BIN_EDGES, p
+            )
+        table["tds_mean"] = sums[:, 2] / sums[:, 0]
+        for p in PERCENTILES:
+            table[f"tds_p{p}"] = _histogram_percentiles(
+                self.tds_hist[selected], TDS_BIN_EDGES, p
+            )
+        table.index.name = "period"
+        return table.sort_index()
+
+
+class BrewRollups:
+    """
+    Daily, weekly and monthly rollups of the Brew Log, overall, per coffee
+    and per brewer.
+
+    Built from the whole log once and kept current with add_brew as brews
+    are saved.
+    """
+
+    def __init__(self):
+        self.tables = {
+            (granularity, dimension): RollupTable(freq)
+            for granularity, freq in GRANULARITIES.items()
+            for dimension in DIMENSIONS
+        }
+        self.coffee_names = {}
+
+    def _add(self, brew_log_df):
+        required = {"date", "extraction_yield", "tds_percent"}
+        if brew_log_df.empty or not required <= set(brew_log_df.columns):
+            return
+
+        log = pd.DataFrame(
+            {
+                "date": pd.to_datetime(
+                    brew_log_df["date"], errors="coerce", format="mixed"
+                ),
+                "ey": pd.to_numeric(brew_log_df["extraction_yield"], errors="coerce"),
+                "tds": pd.to_numeric(brew_log_df["tds_percent"], errors="coerce"),
+                "grams": pd.to_numeric(
+                    brew_log_df.get("dose", pd.Series(index=brew_log_df.index)),
+                    errors="coerce",
+                ),
+            }
+        )
+        for column in ("coffee_id", "brewer"):
+            log[column] = (
+                brew_log_df.get(column, pd.Series(index=brew_log_df.index))
+                .astype("string")
+                .str.strip()
+                .fillna("")
+                .astype(object)
+            )
+        log = log.dropna(subset=["date", "ey", "tds"])
+        log["grams"] = log["grams"].fillna(0)
+        if log.empty:
+            return
+
+        if "coffee_name" in brew_log_df.columns:
+            names = brew_log_df.loc[log.index, ["coffee_id", "coffee_name"]].dropna()
+            names = names.drop_duplicates("coffee_id", keep="last")
+            self.coffee_names.update(
+                zip(
+                    names["coffee_id"].astype(str).str.strip(),
+                    names["coffee_name"].astype(str),
+                )
+            )
+
+        for (_, dimension), table in self.tables.items():
+            column = DIMENSIONS[dimension]
+            # Brews without a coffee or brewer only count towards "All"
+            rows = log[log[column] != ""] if column else log
+            keys = rows[column].to_numpy() if column else np.full(len(rows), "", object)
+            table.add(
+                rows["date"],
+                keys,
+                rows["ey"].to_numpy(),
+                rows["tds"].to_numpy(),
+                rows["grams"].to_numpy(),
+            )
+
+    @classmethod
+    def from_brew_log(cls, brew_log_df):
+        """Bucket the whole log, one vectorized pass per table."""
+        rollups = cls()
+        rollups._add(brew_log_df)
+        return rollups
+
+    def add_brew(self, brew):
+        """Add one saved brew (a Brew Log row as a dict) to every table."""
+        date = pd.to_datetime(brew.get("date"), errors="coerce")
+        ey = pd.to_numeric(brew.get("extraction_yield"), errors="coerce")
+        tds = pd.to_numeric(brew.get("tds_percent"), errors="coerce")
+        if pd.isna(date) or pd.isna(ey) or pd.isna(tds):
+            return
+        grams = pd.to_numeric(brew.get("dose"), errors="coerce")
+        grams = 0.0 if pd.isna(grams) else float(grams)
+
+        coffee_id = str(brew.get("coffee_id") or "").strip()
+        if coffee_id and brew.get("coffee_name"):
+            self.coffee_names[coffee_id] = str(brew["coffee_name"])
+
+        keys = {"coffee_id": coffee_id, "brewer": str(brew.get("brewer") or "").strip()}
+        for (_, dimension), table in self.tables.items():
+            column = DIMENSIONS[dimension]
+            if column and not keys[column]:
+                continue  # Only counted towards "All"
+            table.add_one(date, keys.get(column, ""), float(ey), float(tds), grams)
+
+    def trend(self, granularity, dimension, key=""):
+        """Trend table for one group, see RollupTable.frame."""
+        return self.tables[(granularity, dimension)].frame(key)
+
+    def keys(self, dimension):
+        """Group keys seen for a dimension, most brews first."""
+        table = self.tables[("Monthly", dimension)]
+        totals = (
+            pd.Series(table.sums[: len(table.keys), 0], index=table.keys)
+            .groupby(level=0)
+            .sum()
+        )
+        return totals.sort_values(ascending=False).index.tolist()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# Percentiles reported for the EY and TDS distributions
+DISTRIBUTION_QUANTILES = [0.1, 0.5, 0.9]
+
+# Drift is reported as the change per this many days
+DRIFT_PERIOD_DAYS = 30
+
+METRICS = {"extraction_yield": "ey", "tds_percent": "tds"}
+
+
+def _brewer_key(brew_log_df, brewers_df):
+    """Brew Log brewer names as a categorical over the known brewers."""
+    known = []
+    if not brewers_df.empty and "name" in brewers_df.columns:
+        known = brewers_df["name"].dropna().astype(str).unique().tolist()
+    # Brews logged without a brewer are left out rather than grouped as ""
+    names = brew_log_df["brewer"].astype("string").str.strip().replace("", pd.NA)
+    # Brewers that only appear in the log still get their own group
+    extra = pd.Index(names.dropna().unique()).difference(known).tolist()
+    return pd.Categorical(names, categories=known + sorted(extra))
+
+
+def brewer_analytics(brew_log_df, brewers_df):
+    """
+    Per-brewer extraction statistics from one pass over the Brew Log.
+
+    Brews are grouped on a categorical brewer key, and every statistic comes
+    from reductions on that single groupby. Drift is the least-squares slope
+    of EY and TDS against brew date, derived from per-group sums so no group
+    is fitted on its own.
+
+    Parameters:
+    brew_log_df (pd.DataFrame): The Brew Log worksheet
+    brewers_df (pd.DataFrame): The Brewers worksheet
+
+    Returns:
+    pd.DataFrame: Indexed by brewer name with type and capacity, brews, and
+    for ey and tds: mean, std, p10/p50/p90 and drift (change per
+    DRIFT_PERIOD_DAYS)
+    """
+    required = {"brewer", "date", *METRICS}
+    if brew_log_df.empty or not required <= set(brew_log_df.columns):
+        return pd.DataFrame()
+
+    frame = pd.DataFrame(
+        {
+            short: pd.to_numeric(brew_log_df[column], errors="coerce").to_numpy()
+            for column, short in METRICS.items()
+        }
+    )
+    dates = pd.to_datetime(brew_log_df["date"], errors="coerce", format="mixed")
+    frame["days"] = (
+        (dates - dates.min()).dt.total_seconds().to_numpy() / 86400 / DRIFT_PERIOD_DAYS
+    )
+    frame["brewer"] = _brewer_key(brew_log_df, brewers_df)
+    frame = frame.dropna(subset=["brewer", "ey", "tds", "days"])
+
+    # Sums needed for the drift slope: n, Σx, Σx², and Σy, Σxy per metric
+    frame["days_sq"] = frame["days"] ** 2
+    for short in METRICS.values():
+        frame[f"{short}_days"] = frame[short] * frame["days"]
+
+    grouped = frame.groupby("brewer", observed=True)
+    sums = grouped.sum()
+    n = grouped.size()
+    stats = pd.DataFrame({"brews": n})
+
+    quantiles = grouped[list(METRICS.values())].quantile(DISTRIBUTION_QUANTILES)
+    means = sums[list(METRICS.values())].div(n, axis=0)
+    stds = grouped[list(METRICS.values())].std()
+    spread = n * sums["days_sq"] - sums["days"] ** 2
+
+    for short in METRICS.values():
+        stats[f"{short}_mean"] = means[short]
+        stats[f"{short}_std"] = stds[short]
+        for q in DISTRIBUTION_QUANTILES:
+            stats[f"{short}_p{int(q * 100)}"] = quantiles[short].xs(q, level=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (n * sums[f"{short}_days"] - sums["days"] * sums[short]) / spread
+        # A brewer used on a single day has no drift to speak of
+        stats[f"{short}_drift"] = slope.where(spread > 1e-12)
+
+    stats.index = stats.index.astype(str)
+    stats.index.name = "brewer"
+    if not brewers_df.empty and "name" in brewers_df.columns:
+        details = brewers_df.dropna(subset=["name"]).drop_duplicates("name")
+        details = details.set_index(details["name"].astype(str))
+        details = details.reindex(columns=["type", "capacity"])
+        stats = details.reindex(stats.index).join(stats)
+    return stats
@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+import tempfile
+from gspread.utils import rowcol_to_a1
+
+# Rows fetched from the worksheet per request
+EXPORT_CHUNK_ROWS = 5000
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "JSONL": ("jsonl", "application/x-ndjson"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def iter_worksheet_chunks(worksheet, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Read a worksheet in fixed-size row ranges.
+
+    Parameters:
+    worksheet (gspread.Worksheet): Worksheet with a header in row 1
+    chunk_rows (int): Number of rows per range request
+
+    Yields:
+    tuple: (header, list of rows padded to the header width)
+    """
+    header = worksheet.row_values(1)
+    if not header:
+        return
+
+    width = len(header)
+    start = 2
+    while start <= worksheet.row_count:
+        end = start + chunk_rows - 1
+        rows = worksheet.get(f"A{start}:{rowcol_to_a1(end, width)}")
+        rows = [row + [""] * (width - len(row)) for row in rows if any(row)]
+        if rows:
+            yield header, rows
+        start = end + 1
+
+
+def _write_text_export(buffer, chunks, file_format):
+    # TextIOWrapper is detached (not closed) so the buffer stays open
+    text = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    header_written = False
+
+    for header, rows in chunks:
+        if file_format == "csv":
+            if not header_written:
+                writer.writerow(header)
+                header_written = True
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                text.write(json.dumps(dict(zip(header, row))) + "\n")
+
+    text.flush()
+    text.detach()
+
+
+def _write_parquet_export(buffer, chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    for header, rows in chunks:
+        table = pa.table(dict(zip(header, map(list, zip(*rows)))))
+        if writer is None:
+            writer = pq.ParquetWriter(buffer, table.schema)
+        writer.write_table(table)  # One row group per chunk
+
+    if writer is not None:
+        writer.close()
+
+
+def export_brew_log(spreadsheet, file_format, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Export the Brew Log to a temporary file, reading the worksheet one range
+    of chunk_rows rows at a time. Each chunk is written out before the next
+    is fetched, so building the export holds one chunk in memory.
+
+    Parameters:
+    spreadsheet (gspread.Spreadsheet): The user's Coffee Tracker
+    file_format (str): A key of EXPORT_FORMATS
+    chunk_rows (int): Number of rows per range request
+
+    Returns:
+    io.FileIO: The export, rewound and ready for st.download_button. The
+    caller closes it, which deletes it.
+    """
+    worksheet = spreadsheet.worksheet("Brew Log")
+    chunks = iter_worksheet_chunks(worksheet, chunk_rows)
+    # An unbuffered file is an io.RawIOBase, one of the file types
+    # st.download_button accepts; writes go through a buffer on top of it
+    export = tempfile.TemporaryFile(buffering=0)
+    buffer = io.BufferedWriter(export)
+
+    try:
+        extension, _ = EXPORT_FORMATS[file_format]
+        if extension == "parquet":
+            _write_parquet_export(buffer, chunks)
+        else:
+            _write_text_export(buffer, chunks, extension)
+        buffer.flush()
+        buffer.detach()
+    except BaseException:
+        export.close()
+        raise
+
+    export.seek(0)
+    return export
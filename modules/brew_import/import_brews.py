@@ -0,0 +1,245 @@
+import asyncio
+import csv
+import io
+import json
+from itertools import islice
+import numpy as np
+import pandas as pd
+from modules.extraction_calculator.calculate_extraction import (
+    calculate_extraction,
+    extraction_yield_from_tds,
+)
+from modules.gsheets.async_worksheet_io import run_sheets_call, write_worksheets_async
+from modules.gsheets.sheet_layout import WORKSHEET_LAYOUT
+
+# Rows validated and computed together
+IMPORT_BATCH_SIZE = 5000
+
+BREW_LOG_COLUMNS = WORKSHEET_LAYOUT["Brew Log"]["columns"]
+
+# Measurement columns used to compute TDS/EY when an export doesn't carry them
+MEASUREMENT_COLUMNS = ["dry_weight", "wet_weight", "beverage_weight"]
+
+# Column names seen in refractometer and scale exports -> Brew Log columns
+COLUMN_ALIASES = {
+    "timestamp": "date",
+    "datetime": "date",
+    "brew_date": "date",
+    "coffee": "coffee_id",
+    "bean_id": "coffee_id",
+    "coffee_dose": "dose",
+    "dose_g": "dose",
+    "water": "total_water",
+    "water_g": "total_water",
+    "tds": "tds_percent",
+    "tds_%": "tds_percent",
+    "ey": "extraction_yield",
+    "ey_%": "extraction_yield",
+    "beverage": "beverage_weight",
+    "beverage_g": "beverage_weight",
+    "grind": "grind_size",
+    "time": "brew_time",
+    "recipe": "water_recipe",
+}
+
+
+def _normalize_key(key):
+    key = str(key).strip().lower().replace(" ", "_")
+    key = key.replace("(", "").replace(")", "")
+    return COLUMN_ALIASES.get(key, key)
+
+
+def iter_brew_records(uploaded_file, file_format):
+    """
+    Stream brew records out of a CSV or JSONL export one row at a time.
+
+    Parameters:
+    uploaded_file (file-like): Binary file, e.g. from st.file_uploader
+    file_format (str): "csv" or "jsonl"
+
+    Yields:
+    dict: One record with keys mapped onto Brew Log column names
+    """
+    text = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+
+    if file_format == "csv":
+        records = csv.DictReader(text)
+    else:
+        records = (json.loads(line) for line in text if line.strip())
+
+    for record in records:
+        yield {_normalize_key(key): value for key, value in record.items()}
+
+
+def iter_batches(records, batch_size=IMPORT_BATCH_SIZE):
+    """Group a record stream into DataFrames of at most batch_size rows."""
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield pd.DataFrame.from_records(batch)
+
+
+def prepare_brew_batch(batch, coffee_names):
+    """
+    Validate a batch against the Brew Log schema and fill in TDS/EY.
+
+    TDS/EY are computed from scale measurements when both are missing. A
+    measured TDS without an EY gets the EY of that TDS, using the beverage
+    weight if given, else the one implied by the water and the retention.
+
+    Parameters:
+    batch (pd.DataFrame): Raw records from iter_batches
+    coffee_names (dict): Inventory coffee id -> name. Rows for coffees not
+    in it are rejected
+
+    Returns:
+    tuple: (valid rows as a Brew Log DataFrame, dict of reason -> rejected count)
+    """
+    batch = batch.reindex(
+        columns=list(dict.fromkeys(BREW_LOG_COLUMNS + MEASUREMENT_COLUMNS))
+    )
+    rejected = {}
+
+    batch["coffee_id"] = batch["coffee_id"].astype("string").str.strip()
+    batch["date"] = pd.to_datetime(batch["date"], errors="coerce", format="mixed")
+    numeric_columns = [
+        "dose",
+        "total_water",
+        "tds_percent",
+        "extraction_yield",
+    ] + MEASUREMENT_COLUMNS
+    batch[numeric_columns] = batch[numeric_columns].apply(
+        pd.to_numeric, errors="coerce"
+    )
+
+    # Derive EY from a measured TDS; the beverage is what's left of the
+    # water once the grounds' retention and the dissolved solids are out
+    needs_ey = batch["tds_percent"].notna() & batch["extraction_yield"].isna()
+    if needs_ey.any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            retention = batch["wet_weight"] - batch["dry_weight"]
+            beverage = batch["beverage_weight"].fillna(
+                (batch["total_water"] - retention) * (1 - batch["tds_percent"] / 100)
+            )
+            batch["extraction_yield"] = batch["extraction_yield"].where(
+                ~needs_ey,
+                extraction_yield_from_tds(
+                    batch["dose"], batch["tds_percent"], beverage
+                ),
+            )
+
+    # Compute TDS/EY for rows that only carry scale measurements
+    needs_calc = batch["tds_percent"].isna() | batch["extraction_yield"].isna()
+    if needs_calc.any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            extraction = calculate_extraction(
+                batch["dose"],
+                batch["dry_weight"],
+                batch["total_water"],
+                batch["beverage_weight"],
+                batch["wet_weight"],
+            )
+        for column in ["tds_percent", "extraction_yield"]:
+            batch[column] = batch[column].where(~needs_calc, extraction[column])
+
+    checks = {
+        "missing coffee_id": batch["coffee_id"].isna() | (batch["coffee_id"] == ""),
+        "coffee_id not in inventory": ~batch["coffee_id"].isin(list(coffee_names)),
+        "invalid date": batch["date"].isna(),
+        "invalid dose": ~(batch["dose"] > 0),
+        "missing TDS/EY": ~np.isfinite(batch["tds_percent"])
+        | ~np.isfinite(batch["extraction_yield"]),
+    }
+    invalid = pd.Series(False, index=batch.index)
+    for reason, mask in checks.items():
+        mask = mask.fillna(True) & ~invalid
+        if mask.any():
+            rejected[reason] = int(mask.sum())
+        invalid |= mask
+
+    valid = batch.loc[~invalid, BREW_LOG_COLUMNS].copy()
+    valid["date"] = valid["date"].dt.strftime("%Y-%m-%d %H:%M")
+    valid["coffee_name"] = valid["coffee_name"].fillna(
+        valid["coffee_id"].map(coffee_names)
+    )
+    return valid, rejected
+
+
+def import_brews(uploaded_file, file_format, beans_df, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Run an export through the import pipeline.
+
+    Parameters:
+    uploaded_file (file-like): CSV or JSONL export
+    file_format (str): "csv" or "jsonl"
+    beans_df (pd.DataFrame): Current Beans Inventory
+    batch_size (int): Rows validated and computed together
+
+    Returns:
+    dict: "rows" (Brew Log DataFrame to append), "rejected" (reason -> count)
+    and "grams_used" (coffee id -> total dose)
+    """
+    coffee_names = {}
+    if not beans_df.empty and "id" in beans_df.columns:
+        coffee_names = dict(zip(beans_df["id"].astype(str), beans_df["name"]))
+
+    valid_batches = []
+    rejected = {}
+    grams_used = pd.Series(dtype="float64")
+
+    records = iter_brew_records(uploaded_file, file_format)
+    for batch in iter_batches(records, batch_size):
+        valid, batch_rejected = prepare_brew_batch(batch, coffee_names)
+        valid_batches.append(valid)
+        for reason, count in batch_rejected.items():
+            rejected[reason] = rejected.get(reason, 0) + count
+        grams_used = grams_used.add(
+            valid.groupby("coffee_id")["dose"].sum(), fill_value=0
+        )
+
+    rows = (
+        pd.concat(valid_batches, ignore_index=True)
+        if valid_batches
+        else pd.DataFrame(columns=BREW_LOG_COLUMNS)
+    )
+    return {"rows": rows, "rejected": rejected, "grams_used": grams_used}
+
+
+def deduct_grams_used(beans_df, grams_used):
+    """Subtract aggregated doses from the inventory in one vectorized pass."""
+    beans_df = beans_df.copy()
+    used = beans_df["id"].astype(str).map(grams_used).fillna(0)
+    beans_df["grams_remaining"] = (
+        pd.to_numeric(beans_df["grams_remaining"], errors="coerce") - used
+    )
+    return beans_df
+
+
+async def write_brew_import(spreadsheet, rows, header, beans_df=None):
+    """
+    Append imported brews in one call, updating the inventory alongside.
+
+    Parameters:
+    spreadsheet (gspread.Spreadsheet): The user's Coffee Tracker
+    rows (pd.DataFrame): Output of import_brews
+    header (list): Column order of the Brew Log worksheet, empty if it has none
+    beans_df (pd.DataFrame): Updated inventory to write, if any
+    """
+    values = rows.reindex(columns=header or BREW_LOG_COLUMNS).astype(object)
+    values = values.where(values.notna(), "").values.tolist()
+    if not header:
+        values.insert(0, BREW_LOG_COLUMNS)
+
+    brew_log_ws = await run_sheets_call(spreadsheet.worksheet, "Brew Log")
+    writes = [
+        run_sheets_call(
+            brew_log_ws.append_rows, values, value_input_option="USER_ENTERED"
+        )
+    ]
+    if beans_df is not None:
+        writes.append(
+            write_worksheets_async(spreadsheet, {"Beans Inventory": beans_df})
+        )
+    await asyncio.gather(*writes)
@@ -0,0 +1,51 @@
+import os
+import streamlit.components.v1 as components
+
+# Phases the lap button steps through; laps past the end become "Pour N"
+DEFAULT_PHASES = ["Bloom", "Pour 1", "Pour 2", "Drawdown"]
+
+# The stopwatch runs entirely in the browser (frontend/index.html) and only
+# sends a value back, triggering a rerun, on start, lap, stop and reset
+_stopwatch_component = components.declare_component(
+    "brew_stopwatch", path=os.path.join(os.path.dirname(__file__), "frontend")
+)
+
+
+def format_time(seconds):
+    """Format time in mm:ss format"""
+    minutes = int(seconds // 60)
+    seconds = int(seconds % 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def format_brew_time(elapsed, laps):
+    """
+    Brew Log text for a timed brew, e.g. "03:05 (Bloom 00:45, Pour 1 00:40,
+    Drawdown 01:40)". The total comes first so it still reads as mm:ss.
+    """
+    brew_time = format_time(elapsed)
+    if laps:
+        phases = ", ".join(
+            f"{lap['phase']} {format_time(lap['seconds'])}" for lap in laps
+        )
+        brew_time += f" ({phases})"
+    return brew_time
+
+
+def brew_stopwatch(state=None, phases=DEFAULT_PHASES, key=None):
+    """
+    Render the browser-side brew stopwatch.
+
+    Parameters:
+    state (dict): The last value it returned. Passed back in so a running
+    timer picks up where it was when the page is revisited
+    phases (list): Names of the pour phases marked with the lap button
+    key (str): Streamlit widget key
+
+    Returns:
+    dict: The latest event, or None before the first one: event ("start",
+    "lap", "stop" or "reset"), elapsed seconds, running, started_at (epoch
+    ms), elapsed_before, laps (list of {"phase", "seconds"}) and seq, which
+    increases with every event
+    """
+    return _stopwatch_component(phases=list(phases), state=state, key=key, default=None)
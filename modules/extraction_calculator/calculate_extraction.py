@@ -0,0 +1,54 @@
+import numpy as np
+
+# Fraction of the dose treated as moisture when computing extraction yield
+DOSE_MOISTURE_FRACTION = 0.035
+
+
+def calculate_extraction(
+    coffee_dose, dry_weight, total_water, beverage_weight, wet_weight
+):
+    """
+    Calculate TDS and extraction yield from scale measurements.
+
+    Works on plain floats as well as NumPy arrays / pandas Series, so the same
+    formulas back the calculator page and batch imports.
+
+    Parameters:
+    coffee_dose (float): Dose of ground coffee in grams
+    dry_weight (float): Weight of the dry filter/brewer in grams
+    total_water (float): Total brew water in grams
+    beverage_weight (float): Weight of the finished beverage in grams
+    wet_weight (float): Weight of the spent filter/brewer in grams
+
+    Returns:
+    dict: retention, solids, tds_percent, extraction_yield and brew_ratio
+    """
+    retention = wet_weight - dry_weight
+    coffee_water = total_water - retention
+    solids = np.abs(coffee_water - beverage_weight)
+    tds_percent = (solids / coffee_water) * 100
+    extraction_yield = extraction_yield_from_tds(
+        coffee_dose, tds_percent, beverage_weight
+    )
+    brew_ratio = total_water / coffee_dose
+
+    return {
+        "retention": retention,
+        "solids": solids,
+        "tds_percent": tds_percent,
+        "extraction_yield": extraction_yield,
+        "brew_ratio": brew_ratio,
+    }
+
+
+def extraction_yield_from_tds(coffee_dose, tds_percent, beverage_weight):
+    """
+    Extraction yield of a beverage whose TDS is already known, e.g. read off
+    a refractometer. Works on floats and arrays alike.
+
+    Returns:
+    float: Extraction yield in percent
+    """
+    return (tds_percent * beverage_weight) / (
+        coffee_dose - (DOSE_MOISTURE_FRACTION * coffee_dose)
+    )
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from modules.extraction_calculator.calculate_extraction import DOSE_MOISTURE_FRACTION
+
+# Grams of water held back per gram of coffee when a coffee has no history.
+# Typical for paper-filter pour-over.
+DEFAULT_RETENTION_RATIO = 2.0
+
+# Centre of the ideal zone on the extraction map
+DEFAULT_TARGET_TDS = 1.35
+DEFAULT_TARGET_EY = 20.0
+
+# Batch size used when planning a brew from scratch
+DEFAULT_TOTAL_WATER = 250.0
+
+PROFILE_COLUMNS = ["retention_ratio", "mean_tds", "mean_ey", "brews"]
+
+
+def brew_profiles(brew_log_df):
+    """
+    Derive each coffee's historical water retention from the brew log.
+
+    The calculator's formulas are inverted row-wise: beverage weight follows
+    from EY and TDS, the water that reached the cup from the beverage weight
+    and TDS, and retention is whatever of total_water is left over. The
+    beverage yield needs no profile of its own: it is fixed by the target
+    TDS and EY once retention is known.
+
+    Parameters:
+    brew_log_df (pd.DataFrame): The Brew Log worksheet
+
+    Returns:
+    pd.DataFrame: Indexed by coffee_id with retention_ratio (g water per g
+    coffee), mean_tds, mean_ey and brews
+    """
+    columns = ["dose", "total_water", "tds_percent", "extraction_yield"]
+    if brew_log_df.empty or not set(columns + ["coffee_id"]) <= set(
+        brew_log_df.columns
+    ):
+        return pd.DataFrame(columns=PROFILE_COLUMNS)
+
+    log = brew_log_df[columns].apply(pd.to_numeric, errors="coerce")
+    log["coffee_id"] = brew_log_df["coffee_id"].astype(str)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beverage = (
+            log["extraction_yield"]
+            * (1 - DOSE_MOISTURE_FRACTION)
+            * log["dose"]
+            / log["tds_percent"]
+        )
+        coffee_water = beverage / (1 - log["tds_percent"] / 100)
+        log["retention_ratio"] = (log["total_water"] - coffee_water) / log["dose"]
+        beverage_yield = beverage / log["total_water"]
+
+    # Drop brews whose numbers can't come from a real pour-over
+    plausible = log["retention_ratio"].between(0, 5) & beverage_yield.between(0, 1)
+    log = log[plausible]
+
+    return log.groupby("coffee_id").agg(
+        retention_ratio=("retention_ratio", "median"),
+        mean_tds=("tds_percent", "mean"),
+        mean_ey=("extraction_yield", "mean"),
+        brews=("dose", "size"),
+    )
+
+
+def optimize_brew_parameters(
+    target_tds,
+    target_ey,
+    retention_ratio=DEFAULT_RETENTION_RATIO,
+    total_water=None,
+    coffee_dose=None,
+):
+    """
+    Solve for the dose and water that land on a target (TDS, EY) point.
+
+    Inverting the calculator's formulas gives the brew ratio in closed form:
+
+        total_water / dose = 0.965 * EY / (TDS * (1 - TDS / 100)) + retention
+
+    so the answer is a handful of float operations. All numeric arguments
+    may also be NumPy arrays to evaluate a whole grid of targets at once.
+
+    Parameters:
+    target_tds (float): Target TDS in percent (e.g. 1.35)
+    target_ey (float): Target extraction yield in percent (e.g. 20)
+    retention_ratio (float): Grams of water retained per gram of coffee
+    total_water (float): Fix the total water and solve for the dose
+    coffee_dose (float): Fix the dose and solve for the water
+
+    Returns:
+    dict: coffee_dose, total_water, beverage_weight and brew_ratio
+    """
+    target_tds = np.asarray(target_tds, dtype=float)
+    target_ey = np.asarray(target_ey, dtype=float)
+
+    soluble_ratio = (1 - DOSE_MOISTURE_FRACTION) * target_ey / target_tds
+    brew_ratio = soluble_ratio / (1 - target_tds / 100) + retention_ratio
+
+    if coffee_dose is None:
+        if total_water is None:
+            raise ValueError("Either total_water or coffee_dose must be given")
+        coffee_dose = total_water / brew_ratio
+    else:
+        total_water = coffee_dose * brew_ratio
+
+    return {
+        "coffee_dose": coffee_dose,
+        "total_water": total_water,
+        "beverage_weight": coffee_dose * soluble_ratio,
+        "brew_ratio": brew_ratio,
+    }
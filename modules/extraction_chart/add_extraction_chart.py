@@ -1,21 +1,76 @@
+import io
+from functools import lru_cache
 import numpy as np
 import streamlit as st
-import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
+from modules.extraction_chart.brew_density import DENSITY_EY_EDGES, DENSITY_TDS_EDGES
 
+# Brew points are rounded to these steps before rendering, so brews that
+# would look the same on the chart share one cached image
+CHART_TDS_STEP = 0.01
+CHART_EY_STEP = 0.05
 
-def add_extraction_chart(tds_percent, extraction_yield):
+# Rendered charts kept in memory, shared by every session (~100 KB each)
+CHART_CACHE_SIZE = 256
+
+CHART_DPI = 100
+
+
+def quantize_brew_point(tds_percent, extraction_yield):
+    """Round a brew point to the chart's steps; (None, None) if not plotted."""
+    if not (tds_percent and extraction_yield):
+        return None, None
+    return (
+        round(round(tds_percent / CHART_TDS_STEP) * CHART_TDS_STEP, 2),
+        round(round(extraction_yield / CHART_EY_STEP) * CHART_EY_STEP, 2),
+    )
+
+
+def brew_point_label(tds_percent, extraction_yield):
     """
-    Adds a beautiful coffee extraction chart visualization to the Streamlit app
-    showing where the current brew falls on the extraction map.
+    Annotation text for a brew point, from its unrounded values.
+
+    TDS is printed to CHART_TDS_STEP and EY to one decimal, no finer than the
+    point is plotted, so one cached image can carry the label of every brew
+    that shares it. The zone comes from the unrounded EY as well, so a brew
+    just under 17% never reads as ideal.
+    """
+    if not (tds_percent and extraction_yield):
+        return None
+    brew_status = (
+        "Under-extracted"
+        if extraction_yield < 17
+        else "Over-extracted" if extraction_yield > 22 else "Ideal"
+    )
+    return f"{tds_percent:.2f}% TDS\n{extraction_yield:.1f}% EY\n{brew_status}"
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def render_extraction_chart(
+    tds_percent, extraction_yield, dpi=CHART_DPI, history=None, label=None
+):
+    """
+    Render the extraction map as PNG bytes.
+
+    Draws on a standalone Figure rather than pyplot's global state, so
+    concurrent sessions can render safely. Results are cached by their
+    arguments; pass the point through quantize_brew_point first, with the
+    label made from the unrounded values.
 
     Parameters:
-    tds_percent (float): The calculated TDS percentage
+    tds_percent (float): The calculated TDS percentage, or None for no point
     extraction_yield (float): The calculated extraction yield percentage
-    """
-    st.markdown("### Coffee Extraction Map")
+    dpi (int): Resolution of the image
+    history (HistoryOverlay): Past brews to draw under the current one
+    label (str): Annotation for the point, see brew_point_label; defaults to
+    the label of the plotted point
 
+    Returns:
+    bytes: The chart as a PNG
+    """
     # Create figure with high-resolution and better aspect ratio
-    fig = plt.figure(figsize=(12, 8), dpi=100)
+    fig = Figure(figsize=(12, 8), dpi=dpi)
     ax = fig.add_subplot(111)
 
     # Set background color for the plot
@@ -49,21 +104,21 @@ def add_extraction_chart(tds_percent, extraction_yield):
         extent=[13, 17, 1.0, 1.7],
         aspect="auto",
         alpha=0.6,
-        cmap=plt.cm.colors.ListedColormap([under_color]),
+        cmap=ListedColormap([under_color]),
     )
     ax.imshow(
         np.flipud(ideal_range),
         extent=[17, 22, 1.0, 1.7],
         aspect="auto",
         alpha=0.7,
-        cmap=plt.cm.colors.ListedColormap([ideal_color]),
+        cmap=ListedColormap([ideal_color]),
     )
     ax.imshow(
         np.flipud(over_extracted),
         extent=[22, 26, 1.0, 1.7],
         aspect="auto",
         alpha=0.6,
-        cmap=plt.cm.colors.ListedColormap([over_color]),
+        cmap=ListedColormap([over_color]),
     )
 
     # Add zone dividers
@@ -159,7 +214,7 @@ def add_extraction_chart(tds_percent, extraction_yield):
     add_zone_label(24, 1.05, "WEAK\nBITTER", fontsize=9)
 
     # Add title at the top with styled text
-    plt.figtext(
+    fig.text(
         0.5,
         0.97,
         "Brewing Ratio | Grams per One Liter",
@@ -192,8 +247,8 @@ def add_extraction_chart(tds_percent, extraction_yield):
     ax.set_ylim(1.0, 1.7)
 
     # Add custom tick marks
-    plt.xticks(np.arange(13, 27, 1))
-    plt.yticks(
+    ax.set_xticks(np.arange(13, 27, 1))
+    ax.set_yticks(
         [1.0, 1.05, 1.1, 1.15, 1.2, 1.25, 1.3, 1.35, 1.4, 1.45, 1.5, 1.55, 1.6, 1.65]
     )
 
@@ -202,9 +257,43 @@ def add_extraction_chart(tds_percent, extraction_yield):
         spine.set_color("#AAAAAA")
         spine.set_linewidth(1.5)
 
+    if history is not None:
+        if history.points:
+            ey_values, tds_values = zip(*history.points)
+            ax.scatter(
+                ey_values,
+                tds_values,
+                s=30,
+                color="#6D4C41",
+                edgecolors="white",
+                linewidths=0.5,
+                alpha=0.6,
+                zorder=8,
+            )
+        else:
+            # Long histories as a density layer under the ratio lines
+            ax.pcolormesh(
+                DENSITY_EY_EDGES,
+                DENSITY_TDS_EDGES,
+                np.ma.masked_equal(history.counts.T, 0),
+                cmap="copper_r",
+                alpha=0.55,
+                zorder=1.5,
+            )
+        ax.text(
+            13.1,
+            1.69,
+            f"History: {history.label} ({history.brews} brews)",
+            fontsize=10,
+            color="#6D4C41",
+            fontweight="bold",
+            va="top",
+        )
+
     # Plot the current brew point if values are provided
     if tds_percent and extraction_yield:
-        tds_value = tds_percent / 100  # Convert percentage to decimal
+        # The strength axis is in percent, like tds_percent
+        tds_value = tds_percent
 
         # Create the marker with a halo effect
         ax.plot(
@@ -234,20 +323,14 @@ def add_extraction_chart(tds_percent, extraction_yield):
             )
 
         # Add elegant annotation for current brew
-        brew_status = (
-            "Under-extracted"
-            if extraction_yield < 17
-            else "Over-extracted"
-            if extraction_yield > 22
-            else "Ideal"
-        )
+        label = label or brew_point_label(tds_percent, extraction_yield)
 
         # Adjust text position based on point location to avoid going off-chart
         x_offset = -2.5 if extraction_yield > 24 else 1.5
         y_offset = -0.15 if tds_value > 1.6 else 0.1
 
         ax.annotate(
-            f"Current Brew\n{tds_percent:.2f}% TDS\n{extraction_yield:.2f}% EY\n{brew_status}",
+            f"Current Brew\n{label}",
             xy=(extraction_yield, tds_value),
             xytext=(extraction_yield + x_offset, tds_value + y_offset),
             arrowprops=dict(
@@ -269,10 +352,33 @@ def add_extraction_chart(tds_percent, extraction_yield):
         )
 
     # Add a slight padding around the figure
-    plt.tight_layout(rect=[0.02, 0.02, 0.98, 0.94])
+    fig.tight_layout(rect=[0.02, 0.02, 0.98, 0.94])
+
+    image = io.BytesIO()
+    fig.savefig(image, format="png", dpi=dpi)
+    return image.getvalue()
+
 
-    # Show in Streamlit with proper sizing
-    st.pyplot(fig)
+def add_extraction_chart(tds_percent, extraction_yield, history=None):
+    """
+    Adds a beautiful coffee extraction chart visualization to the Streamlit app
+    showing where the current brew falls on the extraction map.
+
+    Parameters:
+    tds_percent (float): The calculated TDS percentage
+    extraction_yield (float): The calculated extraction yield percentage
+    history (HistoryOverlay): Past brews to overlay, see BrewDensity.overlay
+    """
+    st.markdown("### Coffee Extraction Map")
+
+    # A brew point seen before is served from the cache without matplotlib
+    label = brew_point_label(tds_percent, extraction_yield)
+    tds_percent, extraction_yield = quantize_brew_point(tds_percent, extraction_yield)
+    st.image(
+        render_extraction_chart(
+            tds_percent, extraction_yield, history=history, label=label
+        )
+    )
 
     # Add an explanation below the chart
     st.markdown(
@@ -286,7 +392,7 @@ def add_extraction_chart(tds_percent, extraction_yield):
             <li><strong>Diagonal red lines:</strong> Different coffee-to-water ratios (grams of coffee per liter)</li>
             <li><strong>Colored zones:</strong> Flavor profiles from under-developed to bitter</li>
         </ul>
-        <p>The blue marker shows where your current brew falls on the chart.</p>
+        <p>The blue marker shows where your current brew falls on the chart, over any brew history you chose to show (brown dots, or shading where brews cluster).</p>
     </div>
     """,
         unsafe_allow_html=True,
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+# Density grid over the extraction map's axes: 0.25% EY by 0.0125% TDS cells.
+# Brews outside the map are left out.
+DENSITY_EY_EDGES = np.linspace(13.0, 26.5, 55)
+DENSITY_TDS_EDGES = np.linspace(1.0, 1.7, 57)
+
+# Histories up to this many brews are drawn as individual markers; longer
+# ones as the density grid
+MAX_HISTORY_MARKERS = 150
+
+
+def _density_cells(ey, tds):
+    """Grid cell of each brew, and which brews fall on the map at all."""
+    ey = np.asarray(ey, dtype=float)
+    tds = np.asarray(tds, dtype=float)
+    on_map = (
+        (ey >= DENSITY_EY_EDGES[0])
+        & (ey <= DENSITY_EY_EDGES[-1])
+        & (tds >= DENSITY_TDS_EDGES[0])
+        & (tds <= DENSITY_TDS_EDGES[-1])
+    )
+    # The last edge is inclusive, as in np.histogram2d
+    x = np.minimum(
+        np.searchsorted(DENSITY_EY_EDGES, ey, side="right") - 1,
+        len(DENSITY_EY_EDGES) - 2,
+    )
+    y = np.minimum(
+        np.searchsorted(DENSITY_TDS_EDGES, tds, side="right") - 1,
+        len(DENSITY_TDS_EDGES) - 2,
+    )
+    return x, y, on_map
+
+
+class HistoryOverlay:
+    """
+    Immutable snapshot of one brew history for the extraction map.
+
+    Compares and hashes by content, so the chart image cache reuses a
+    rendering for as long as the history it shows is unchanged.
+    """
+
+    def __init__(self, label, counts, points):
+        """
+        Parameters:
+        label (str): Shown on the chart, e.g. the coffee name
+        counts (np.ndarray): Brews per density cell, EY along the first axis
+        points (tuple): (ey, tds) of every brew when the history is short
+        enough to draw as markers, else empty
+        """
+        self.label = label
+        self.counts = counts.copy()
+        self.counts.flags.writeable = False
+        self.points = tuple(points)
+        self.brews = int(counts.sum())
+        self._key = (label, self.counts.tobytes(), self.points)
+
+    def __eq__(self, other):
+        return isinstance(other, HistoryOverlay) and self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+
+class BrewDensity:
+    """
+    EY/TDS density grids of the Brew Log: one per coffee and one ("") for
+    the whole log.
+
+    Built from the whole log once and kept current with add_brew as brews
+    are saved. Overlay snapshots are cached per coffee until its grid
+    changes.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.points = {}
+        self.overlays = {}
+
+    def _grid(self, coffee_id):
+        if coffee_id not in self.counts:
+            self.counts[coffee_id] = np.zeros(
+                (len(DENSITY_EY_EDGES) - 1, len(DENSITY_TDS_EDGES) - 1), dtype=np.int32
+            )
+            self.points[coffee_id] = []
+        return self.counts[coffee_id]
+
+    def _add_points(self, coffee_id, ey, tds):
+        # Markers are only drawn for short histories, so stop keeping them
+        # once a history outgrows that
+        kept = self.points[coffee_id]
+        if kept is not None:
+            if len(kept) + len(ey) > MAX_HISTORY_MARKERS:
+                self.points[coffee_id] = None
+            else:
+                kept.extend(zip(np.asarray(ey).tolist(), np.asarray(tds).tolist()))
+        self.overlays.pop(coffee_id, None)
+
+    @classmethod
+    def from_brew_log(cls, brew_log_df):
+        """Grid the whole log, one scatter-add for every coffee at once."""
+        density = cls()
+        density._grid("")
+        required = {"extraction_yield", "tds_percent"}
+        if brew_log_df.empty or not required <= set(brew_log_df.columns):
+            return density
+
+        ey = pd.to_numeric(brew_log_df["extraction_yield"], errors="coerce")
+        tds = pd.to_numeric(brew_log_df["tds_percent"], errors="coerce")
+        x, y, on_map = _density_cells(ey, tds)
+        coffee_ids = brew_log_df.get("coffee_id", pd.Series(index=brew_log_df.index))
+        coffee_ids = coffee_ids.fillna("").astype(str).to_numpy()[on_map]
+        x, y = x[on_map], y[on_map]
+        ey, tds = ey.to_numpy()[on_map], tds.to_numpy()[on_map]
+
+        codes, coffees = pd.factorize(coffee_ids)
+        counts = np.zeros((len(coffees),) + density.counts[""].shape, dtype=np.int32)
+        np.add.at(counts, (codes, x, y), 1)
+        density.counts[""] += counts.sum(axis=0, dtype=np.int32)
+        density._add_points("", ey, tds)
+
+        # Brews grouped by coffee, in log order within each coffee
+        order = np.argsort(codes, kind="stable")
+        groups = np.split(order, np.cumsum(np.bincount(codes, minlength=len(coffees))))
+        for code, coffee_id in enumerate(coffees):
+            if not coffee_id:
+                continue  # Only part of the whole log's grid
+            density._grid(coffee_id)[:] += counts[code]
+            density._add_points(coffee_id, ey[groups[code]], tds[groups[code]])
+        return density
+
+    def add_brew(self, brew):
+        """Add one saved brew (a Brew Log row as a dict) to its grids."""
+        ey = pd.to_numeric(brew.get("extraction_yield"), errors="coerce")
+        tds = pd.to_numeric(brew.get("tds_percent"), errors="coerce")
+        x, y, on_map = _density_cells([ey], [tds])
+        if not on_map[0]:
+            return
+        for coffee_id in dict.fromkeys(["", str(brew.get("coffee_id") or "")]):
+            self._grid(coffee_id)[x[0], y[0]] += 1
+            self._add_points(coffee_id, [float(ey)], [float(tds)])
+
+    def overlay(self, coffee_id, label):
+        """
+        The history of one coffee, or of the whole log for coffee_id "".
+
+        Returns:
+        HistoryOverlay: None if the history has no brews on the map
+        """
+        cached = self.overlays.get(coffee_id)
+        if cached is None or cached.label != label:
+            counts = self.counts.get(coffee_id)
+            if counts is None or not counts.any():
+                return None
+            cached = HistoryOverlay(label, counts, self.points[coffee_id] or ())
+            self.overlays[coffee_id] = cached
+        return cached
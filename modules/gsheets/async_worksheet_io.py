@@ -0,0 +1,72 @@
+import asyncio
+from functools import partial
+from gspread_dataframe import set_with_dataframe
+from modules.gsheets.worksheet_io import SHEETS_IO_EXECUTOR, fetch_worksheet
+
+
+async def run_sheets_call(func, *args, **kwargs):
+    """
+    Run a blocking gspread call on the shared Sheets I/O pool.
+
+    Parameters:
+    func (callable): The blocking call, e.g. worksheet.get_all_values
+    *args, **kwargs: Arguments passed through to func
+
+    Returns:
+    The return value of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        SHEETS_IO_EXECUTOR, partial(func, *args, **kwargs)
+    )
+
+
+async def fetch_worksheets_async(spreadsheet, worksheet_names, refresh=False):
+    """
+    Fetch several worksheets concurrently.
+
+    Parameters:
+    spreadsheet (gspread.Spreadsheet): An opened spreadsheet
+    worksheet_names (list): Titles of the worksheets to fetch
+    refresh (bool): Fetch from Google Sheets even if the shared cache has them
+
+    Returns:
+    dict: Worksheet name -> DataFrame, or the exception raised for that sheet
+    """
+    results = await asyncio.gather(
+        *(
+            run_sheets_call(fetch_worksheet, spreadsheet, name, refresh)
+            for name in worksheet_names
+        ),
+        return_exceptions=True,
+    )
+    return dict(zip(worksheet_names, results))
+
+
+def _replace_worksheet(worksheet, df):
+    worksheet.clear()
+    set_with_dataframe(worksheet, df)
+
+
+async def write_worksheets_async(spreadsheet, data_dict):
+    """
+    Replace the contents of several worksheets concurrently.
+
+    Parameters:
+    spreadsheet (gspread.Spreadsheet): An opened spreadsheet
+    data_dict (dict): Worksheet name -> DataFrame to write
+    """
+    worksheets = await asyncio.gather(
+        *(run_sheets_call(spreadsheet.worksheet, name) for name in data_dict)
+    )
+    await asyncio.gather(
+        *(
+            run_sheets_call(_replace_worksheet, worksheet, df)
+            for worksheet, df in zip(worksheets, data_dict.values())
+        )
+    )
+
+
+def run_async(coro):
+    """Run a coroutine to completion from Streamlit's (synchronous) script thread."""
+    return asyncio.run(coro)
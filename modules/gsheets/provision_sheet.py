@@ -0,0 +1,105 @@
+import asyncio
+from modules.gsheets.async_worksheet_io import run_sheets_call
+from modules.gsheets.sheet_layout import WORKSHEET_LAYOUT
+
+# Sheet ID of "Sheet1", which every new spreadsheet starts with
+DEFAULT_SHEET_ID = 0
+
+
+def build_provisioning_requests(layout=WORKSHEET_LAYOUT):
+    """
+    Build the batchUpdate requests that turn a blank spreadsheet into a
+    Coffee Tracker: add the worksheets with frozen headers, write the header
+    rows, apply column formats and drop the default sheet.
+
+    Parameters:
+    layout (dict): Worksheet layout, see modules/gsheets/sheet_layout.py
+
+    Returns:
+    list: Request objects for spreadsheets.batchUpdate
+    """
+    requests = []
+
+    for index, (title, spec) in enumerate(layout.items()):
+        sheet_id = index + 1  # 0 is taken by the default sheet
+        requests.append(
+            {
+                "addSheet": {
+                    "properties": {
+                        "sheetId": sheet_id,
+                        "title": title,
+                        "index": index,
+                        "gridProperties": {
+                            "rowCount": spec["rows"],
+                            "columnCount": spec["cols"],
+                            "frozenRowCount": 1,
+                        },
+                    }
+                }
+            }
+        )
+        requests.append(
+            {
+                "updateCells": {
+                    "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+                    "rows": [
+                        {
+                            "values": [
+                                {
+                                    "userEnteredValue": {"stringValue": column},
+                                    "userEnteredFormat": {
+                                        "textFormat": {"bold": True}
+                                    },
+                                }
+                                for column in spec["columns"]
+                            ]
+                        }
+                    ],
+                    "fields": "userEnteredValue,userEnteredFormat.textFormat.bold",
+                }
+            }
+        )
+        for column, (format_type, pattern) in spec["formats"].items():
+            column_index = spec["columns"].index(column)
+            requests.append(
+                {
+                    "repeatCell": {
+                        "range": {
+                            "sheetId": sheet_id,
+                            "startRowIndex": 1,
+                            "startColumnIndex": column_index,
+                            "endColumnIndex": column_index + 1,
+                        },
+                        "cell": {
+                            "userEnteredFormat": {
+                                "numberFormat": {"type": format_type, "pattern": pattern}
+                            }
+                        },
+                        "fields": "userEnteredFormat.numberFormat",
+                    }
+                }
+            )
+
+    requests.append({"deleteSheet": {"sheetId": DEFAULT_SHEET_ID}})
+    return requests
+
+
+# The layout is static, so the request body is built once at import
+PROVISIONING_BODY = {"requests": build_provisioning_requests()}
+
+
+async def provision_coffee_tracker_sheet(spreadsheet, email):
+    """
+    Share a freshly created spreadsheet and lay out all of its worksheets.
+
+    The share goes through the Drive API, so it runs alongside the single
+    Sheets batchUpdate rather than inside it.
+
+    Parameters:
+    spreadsheet (gspread.Spreadsheet): The newly created spreadsheet
+    email (str): Address to share the sheet with as a writer
+    """
+    await asyncio.gather(
+        run_sheets_call(spreadsheet.share, email, perm_type="user", role="writer"),
+        run_sheets_call(spreadsheet.batch_update, PROVISIONING_BODY),
+    )
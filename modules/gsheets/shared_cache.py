@@ -0,0 +1,284 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+# Bump when the layout of cached values changes, so replicas running old and
+# new code never read each other's entries
+SHARED_CACHE_VERSION = 1
+
+# Cache shared by every app replica: "memory" keeps it inside this process
+# (one replica, or tests), "file:<directory>" shares it through a directory
+# every replica mounts. Only point it at storage the replicas alone can write:
+# entries are pickles.
+SHARED_CACHE_URL = os.environ.get("COFFEE_SHARED_CACHE", "memory")
+
+# How long a cached worksheet is trusted, in seconds. Saves made through the
+# app show up at once; this bounds how long edits made directly in Google
+# Sheets can go unseen.
+SHARED_CACHE_TTL = float(os.environ.get("COFFEE_SHARED_CACHE_TTL", "300"))
+
+# Generations only change on save, so they outlive the worksheets they label
+GENERATION_TTL = 30 * 24 * 3600
+
+# How long one caller may hold a load lease before another may take it over,
+# and how often waiting callers check for its result, in seconds
+LEASE_TTL = 30.0
+LEASE_POLL_INTERVAL = 0.1
+
+# Minimum seconds between sweeps of expired entries, run on set
+SWEEP_INTERVAL = 60.0
+
+
+def cache_key(*parts):
+    """Versioned shared cache key, e.g. cache_key("worksheet", sheet_id, name)."""
+    return ":".join(["coffee", f"v{SHARED_CACHE_VERSION}", *map(str, parts)])
+
+
+class MemoryCache:
+    """Shared cache tier kept in this process's memory."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+        self.leases = {}
+        self.swept_at = time.time()
+
+    def get(self, key):
+        """The value stored under key, or None if missing or expired."""
+        with self.lock:
+            item = self.values.get(key)
+            if item is None or item[0] < time.time():
+                self.values.pop(key, None)
+                return None
+            return item[1]
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self.lock:
+            self.values[key] = (now + ttl, value)
+            if now - self.swept_at >= SWEEP_INTERVAL:
+                self._sweep(now)
+
+    def delete(self, key):
+        with self.lock:
+            self.values.pop(key, None)
+
+    def _sweep(self, now):
+        # Entries nobody reads again would otherwise never be dropped
+        self.values = {k: item for k, item in self.values.items() if item[0] >= now}
+        self.leases = {k: until for k, until in self.leases.items() if until > now}
+        self.swept_at = now
+
+    def acquire(self, key, ttl):
+        """Take the load lease on key. False while someone else holds it."""
+        now = time.time()
+        with self.lock:
+            if self.leases.get(key, 0) > now:
+                return False
+            self.leases[key] = now + ttl
+            return True
+
+    def release(self, key):
+        with self.lock:
+            self.leases.pop(key, None)
+
+
+class FileCache:
+    """
+    Shared cache tier in a directory, one pickle per key.
+
+    Entries are replaced atomically, so readers on other replicas never see
+    a half-written file. Each entry's modification time is set to its expiry,
+    so expired ones can be swept without reading them. A lease is a lock
+    file created exclusively; one older than its ttl is treated as abandoned.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.swept_at = time.time()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, suffix):
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest + suffix)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, key):
+        """The value stored under key, or None if missing or expired."""
+        path = self._path(key, ".pickle")
+        try:
+            with open(path, "rb") as f:
+                expires, stored_key, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated, or pickled by code that can no longer load it
+            self._remove(path)
+            return None
+        if stored_key != key or expires < time.time():
+            return None
+        return value
+
+    def set(self, key, value, ttl):
+        expires = time.time() + ttl
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((expires, key, value), f, pickle.HIGHEST_PROTOCOL)
+            os.utime(temp_path, (expires, expires))
+            os.replace(temp_path, self._path(key, ".pickle"))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        if time.time() - self.swept_at >= SWEEP_INTERVAL:
+            self._sweep()
+
+    def delete(self, key):
+        self._remove(self._path(key, ".pickle"))
+
+    def _sweep(self):
+        # Replicas sweep independently; one racing a fresh write at worst
+        # removes it, which is only a cache miss
+        now = self.swept_at = time.time()
+        for entry in os.scandir(self.directory):
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+            if entry.name.endswith(".pickle") and mtime < now:
+                self._remove(entry.path)
+            elif entry.name.endswith(".tmp") and mtime + LEASE_TTL < now:
+                self._remove(entry.path)  # Left behind by a crashed writer
+
+    def acquire(self, key, ttl):
+        """Take the load lease on key. False while someone else holds it."""
+        path = self._path(key, ".lease")
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            pass
+        try:
+            if os.path.getmtime(path) + ttl >= time.time():
+                return False
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        # The holder gave up or crashed; race the other waiters for it
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            return False
+
+    def release(self, key):
+        try:
+            os.remove(self._path(key, ".lease"))
+        except FileNotFoundError:
+            pass
+
+
+# Shared cache backends by URL scheme. A networked store only needs the same
+# get/set/delete/acquire/release methods to be registered here.
+SHARED_CACHE_BACKENDS = {
+    "memory": lambda location: MemoryCache(),
+    "file": FileCache,
+}
+
+
+def open_shared_cache(url):
+    """
+    Parameters:
+    url (str): "memory" or "<scheme>:<location>", e.g. "file:/mnt/coffee-cache"
+
+    Returns:
+    The backend registered for the URL's scheme
+    """
+    scheme, _, location = url.partition(":")
+    if scheme not in SHARED_CACHE_BACKENDS:
+        raise ValueError(f"Unknown shared cache backend: {url}")
+    return SHARED_CACHE_BACKENDS[scheme](location)
+
+
+# Lives in an imported module so it survives Streamlit reruns of app.py
+SHARED_CACHE = open_shared_cache(SHARED_CACHE_URL)
+
+
+def get_or_load(key, load, ttl=SHARED_CACHE_TTL, cache=None, refresh=False):
+    """
+    The value cached under key, calling load at most once across replicas
+    when it is missing.
+
+    The caller that wins the key's lease runs load and stores the result;
+    everyone else polls the cache until it appears. If load fails, the lease
+    is released and the next waiter tries in turn.
+
+    Parameters:
+    key (str): A cache_key
+    load (callable): Computes the value, takes no arguments. Must not return
+    None
+    ttl (float): Seconds to keep the loaded value
+    cache: Backend to use, SHARED_CACHE by default
+    refresh (bool): Ignore the cached value and load it again, unless another
+    caller is loading it right now
+
+    Returns:
+    The cached or freshly loaded value
+    """
+    cache = cache or SHARED_CACHE
+    while True:
+        if not refresh:
+            value = cache.get(key)
+            if value is not None:
+                return value
+        if cache.acquire(key, LEASE_TTL):
+            try:
+                # It may have been stored between the get and the lease
+                value = None if refresh else cache.get(key)
+                if value is None:
+                    value = load()
+                    cache.set(key, value, ttl)
+                return value
+            finally:
+                cache.release(key)
+        # Whoever holds the lease is loading it now, so their result will do
+        refresh = False
+        time.sleep(LEASE_POLL_INTERVAL)
+
+
+def worksheet_generation(sheet_id, worksheet_name, cache=None):
+    """Generation of a worksheet, changed by every save through the app."""
+    cache = cache or SHARED_CACHE
+    return cache.get(cache_key("generation", sheet_id, worksheet_name)) or 0
+
+
+def worksheet_key(sheet_id, worksheet_name, generation):
+    return cache_key("worksheet", sheet_id, worksheet_name, generation)
+
+
+def store_worksheet(sheet_id, worksheet_name, df, cache=None):
+    """
+    Publish a just-saved worksheet to every replica under a new generation,
+    dropping the frame of the generation it replaces.
+
+    Returns:
+    int: The new generation
+    """
+    cache = cache or SHARED_CACHE
+    previous = worksheet_generation(sheet_id, worksheet_name, cache)
+    generation = time.time_ns()
+    # The frame goes in first so no replica sees the generation without it
+    cache.set(worksheet_key(sheet_id, worksheet_name, generation), df, SHARED_CACHE_TTL)
+    cache.set(
+        cache_key("generation", sheet_id, worksheet_name), generation, GENERATION_TTL
+    )
+    cache.delete(worksheet_key(sheet_id, worksheet_name, previous))
+    return generation
@@ -0,0 +1,68 @@
+# Layout of every worksheet in a Coffee Tracker sheet. "formats" maps a column
+# to the Sheets number format applied below its header row. Numeric columns
+# keep the automatic format: worksheets are read back as their displayed
+# text, so a pattern like "0.00" would round every value the app reads.
+WORKSHEET_LAYOUT = {
+    "Beans Inventory": {
+        "rows": 1000,
+        "cols": 20,
+        "columns": [
+            "id",
+            "name",
+            "varietal",
+            "process",
+            "origin",
+            "roast_date",
+            "grams_remaining",
+            "low_stock_threshold",
+            "notes",
+        ],
+        "formats": {
+            "id": ("TEXT", "@"),
+            "roast_date": ("DATE", "yyyy-mm-dd"),
+        },
+    },
+    "Brew Log": {
+        "rows": 1000,
+        "cols": 20,
+        "columns": [
+            "date",
+            "coffee_id",
+            "coffee_name",
+            "dose",
+            "water_recipe",
+            "total_water",
+            "brew_time",
+            "grind_size",
+            "tds_percent",
+            "extraction_yield",
+            "brewer",
+            "notes",
+        ],
+        "formats": {
+            "date": ("DATE_TIME", "yyyy-mm-dd hh:mm"),
+            "coffee_id": ("TEXT", "@"),
+        },
+    },
+    "Brewers": {
+        "rows": 1000,
+        "cols": 10,
+        "columns": ["id", "name", "type", "capacity", "notes"],
+        "formats": {"id": ("TEXT", "@")},
+    },
+    "Water Recipes": {
+        "rows": 1000,
+        "cols": 10,
+        "columns": [
+            "id",
+            "name",
+            "magnesium_drops",
+            "calcium_drops",
+            "sodium_drops",
+            "potassium_drops",
+            "total_volume_ml",
+            "notes",
+        ],
+        "formats": {"id": ("TEXT", "@")},
+    },
+}
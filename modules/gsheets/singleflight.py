@@ -0,0 +1,46 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait on its Future and get the same result or exception.
+    Nothing is kept once the call finishes, so a later call runs afresh.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, func):
+        """
+        Parameters:
+        key (hashable): Identifies the call, e.g. (sheet_id, worksheet, revision)
+        func (callable): Takes no arguments
+
+        Returns:
+        The result of func, shared by every caller with the same key
+        """
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+
+        if leader:
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self.lock:
+                    del self.calls[key]
+        return future.result()
+
+    def in_flight(self):
+        """Number of calls currently running."""
+        with self.lock:
+            return len(self.calls)
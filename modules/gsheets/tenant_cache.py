@@ -0,0 +1,150 @@
+import itertools
+import os
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Sessions are handed shallow copies of the shared frames, which keeps their
+# edits to themselves only under copy-on-write: always on from pandas 3, an
+# opt-in before that
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Memory budget for one sheet's cached frames and aggregates, in MB. Past it,
+# that sheet's least recently used entries are dropped.
+TENANT_BUDGET_MB = float(os.environ.get("COFFEE_TENANT_BUDGET_MB", "64"))
+
+# Memory budget for every sheet served by this process, in MB. Past it, the
+# least recently used sheets are dropped whole.
+PROCESS_BUDGET_MB = float(os.environ.get("COFFEE_PROCESS_BUDGET_MB", "1024"))
+
+# Revisions come from one process-wide counter so a worksheet reloaded after
+# eviction never reuses a revision an older aggregate was built from
+_revisions = itertools.count(1)
+
+
+def next_revision():
+    """A worksheet revision no other worksheet or sheet has used."""
+    return next(_revisions)
+
+
+def estimate_nbytes(value, _seen=None):
+    """
+    Rough in-memory size of a cached value, in bytes.
+
+    DataFrames and arrays report their own buffers; containers and this
+    app's own objects are walked, counting anything reachable from several
+    places once. A pandas Styler is sized by the frame it styles.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(value)
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        children = itertools.chain.from_iterable(value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        children = value
+    elif type(value).__module__.startswith("modules."):
+        children = vars(value).values()
+    elif isinstance(getattr(value, "data", None), pd.DataFrame):
+        return size + estimate_nbytes(value.data, seen)
+    else:
+        return size
+    return size + sum(estimate_nbytes(child, seen) for child in children)
+
+
+class TenantCache:
+    """
+    Process-wide cache with one namespace per sheet id.
+
+    Every session on the same sheet shares its entries, so a shop with
+    several open tabs holds one copy of each worksheet. Each sheet is held to
+    tenant_budget bytes by dropping its least recently used entries, and the
+    process to process_budget bytes by dropping the coldest sheets whole.
+    Safe to use from concurrent Streamlit sessions.
+    """
+
+    def __init__(self, tenant_budget, process_budget):
+        """
+        Parameters:
+        tenant_budget (int): Bytes one sheet may hold
+        process_budget (int): Bytes all sheets together may hold
+        """
+        self.tenant_budget = tenant_budget
+        self.process_budget = process_budget
+        self.lock = threading.RLock()
+        # sheet_id -> OrderedDict(key -> (value, nbytes)), both coldest first
+        self.tenants = OrderedDict()
+        self.sizes = {}
+        self.total = 0
+
+    def get(self, sheet_id, key, default=None):
+        """Cached value for key on sheet_id, marking both as recently used."""
+        with self.lock:
+            entries = self.tenants.get(sheet_id)
+            if entries is None or key not in entries:
+                return default
+            entries.move_to_end(key)
+            self.tenants.move_to_end(sheet_id)
+            return entries[key][0]
+
+    def put(self, sheet_id, key, value):
+        """Cache value for key on sheet_id, then evict down to the budgets."""
+        nbytes = estimate_nbytes(value)
+        with self.lock:
+            entries = self.tenants.setdefault(sheet_id, OrderedDict())
+            self.tenants.move_to_end(sheet_id)
+            if key in entries:
+                self._resize(sheet_id, -entries.pop(key)[1])
+            entries[key] = (value, nbytes)
+            self._resize(sheet_id, nbytes)
+
+            # The entry just stored is kept even when it alone is over budget
+            while self.sizes[sheet_id] > self.tenant_budget and len(entries) > 1:
+                _, (_, evicted) = entries.popitem(last=False)
+                self._resize(sheet_id, -evicted)
+            while self.total > self.process_budget and len(self.tenants) > 1:
+                self.drop(next(iter(self.tenants)))
+
+    def drop(self, sheet_id):
+        """Forget everything cached for sheet_id."""
+        with self.lock:
+            if self.tenants.pop(sheet_id, None) is not None:
+                self.total -= self.sizes.pop(sheet_id)
+
+    def _resize(self, sheet_id, delta):
+        self.sizes[sheet_id] = self.sizes.get(sheet_id, 0) + delta
+        self.total += delta
+
+    def stats(self):
+        """
+        Returns:
+        pd.DataFrame: entries and MB per cached sheet, coldest first
+        """
+        with self.lock:
+            return pd.DataFrame(
+                {
+                    "entries": [len(e) for e in self.tenants.values()],
+                    "mb": [self.sizes[s] / 2**20 for s in self.tenants],
+                },
+                index=pd.Index(list(self.tenants), name="sheet_id"),
+            )
+
+
+# Lives in an imported module so it survives Streamlit reruns of app.py and
+# is shared by every session in the process
+TENANT_CACHE = TenantCache(
+    int(TENANT_BUDGET_MB * 2**20), int(PROCESS_BUDGET_MB * 2**20)
+)
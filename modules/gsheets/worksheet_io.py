@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import pandas as pd
+from modules.gsheets.shared_cache import (
+    get_or_load,
+    worksheet_generation,
+    worksheet_key,
+)
+from modules.gsheets.sheet_layout import WORKSHEET_LAYOUT
+from modules.gsheets.singleflight import SingleFlight
+
+
+# Worksheets every Coffee Tracker sheet is created with
+WORKSHEET_NAMES = list(WORKSHEET_LAYOUT)
+
+# Shared pool for Google Sheets I/O. It lives in an imported module so it
+# survives Streamlit reruns of app.py.
+SHEETS_IO_EXECUTOR = ThreadPoolExecutor(
+    max_workers=8, thread_name_prefix="sheets-io"
+)
+
+# Fetches in flight in this process, keyed by (sheet id, worksheet, generation,
+# refresh). Sessions loading the same worksheet at once share one fetch.
+WORKSHEET_FETCHES = SingleFlight()
+
+
+def _download_worksheet(spreadsheet, worksheet_name):
+    values = spreadsheet.worksheet(worksheet_name).get_all_values()
+
+    if values:
+        data = pd.DataFrame(values[1:], columns=values[0])
+        return data.dropna(how="all")  # Remove empty rows
+
+    return pd.DataFrame()
+
+
+def fetch_worksheet(spreadsheet, worksheet_name, refresh=False):
+    """
+    Fetch a worksheet and convert it to a DataFrame.
+
+    Concurrent calls for the same worksheet generation in this process share
+    one fetch, which goes through the shared cache tier, so replicas loading
+    it make one Sheets API call between them.
+    Safe to run on a worker thread: it doesn't touch st.session_state.
+
+    Parameters:
+    spreadsheet (gspread.Spreadsheet): An opened spreadsheet
+    worksheet_name (str): Title of the worksheet to fetch
+    refresh (bool): Fetch from Google Sheets even if the shared cache has it
+
+    Returns:
+    pd.DataFrame: The worksheet rows with the first row used as headers
+    """
+    generation = worksheet_generation(spreadsheet.id, worksheet_name)
+    return WORKSHEET_FETCHES.do(
+        (spreadsheet.id, worksheet_name, generation, refresh),
+        partial(
+            get_or_load,
+            worksheet_key(spreadsheet.id, worksheet_name, generation),
+            partial(_download_worksheet, spreadsheet, worksheet_name),
+            refresh=refresh,
+        ),
+    )
+
+
+def prefetch_worksheets(spreadsheet, worksheet_names=WORKSHEET_NAMES):
+    """
+    Start fetching worksheets in the background.
+
+    Parameters:
+    spreadsheet (gspread.Spreadsheet): An opened spreadsheet
+    worksheet_names (list): Titles of the worksheets to fetch
+
+    Returns:
+    dict: Worksheet name -> Future resolving to a DataFrame
+    """
+    return {
+        name: SHEETS_IO_EXECUTOR.submit(fetch_worksheet, spreadsheet, name)
+        for name in worksheet_names
+    }
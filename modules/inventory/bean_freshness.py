@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+from modules.suggestions.get_brewing_suggestions import (
+    resolve_suggestion_keys,
+    suggestions_for_keys,
+)
+
+# Days before the optimal window opens that a bean counts as entering its peak
+ENTERING_PEAK_DAYS = 3
+
+FRESHNESS_RESTING = "Resting"
+FRESHNESS_ENTERING = "Entering peak"
+FRESHNESS_PEAK = "At peak"
+FRESHNESS_PAST = "Past peak"
+FRESHNESS_UNKNOWN = "Unknown"
+
+FRESHNESS_COLUMNS = ["days_off_roast", "peak_start_days", "peak_end_days", "freshness"]
+
+
+def optimal_age_windows(beans_df):
+    """
+    Look up each bean's optimal (low, high) days off roast.
+
+    Suggestions are resolved once per distinct varietal/process pair rather
+    than once per bean.
+
+    Returns:
+    pd.DataFrame: peak_start_days and peak_end_days, indexed like beans_df
+    """
+    pairs = pd.DataFrame(
+        {
+            column: beans_df.get(column, pd.Series("", index=beans_df.index))
+            .fillna("")
+            .astype(str)
+            for column in ["varietal", "process"]
+        }
+    )
+    codes, unique_pairs = pd.MultiIndex.from_frame(pairs).factorize()
+
+    windows = np.array(
+        [
+            suggestions_for_keys(*resolve_suggestion_keys(varietal, process)).get(
+                "optimal_age_days", (np.nan, np.nan)
+            )
+            for varietal, process in unique_pairs
+        ],
+        dtype=float,
+    ).reshape(-1, 2)
+
+    return pd.DataFrame(
+        windows[codes], index=beans_df.index, columns=FRESHNESS_COLUMNS[1:3]
+    )
+
+
+def bean_freshness(beans_df, today=None):
+    """
+    Compare every bean's days off roast with its optimal window.
+
+    Parameters:
+    beans_df (pd.DataFrame): The Beans Inventory worksheet
+    today (date): Day to measure from, defaults to today
+
+    Returns:
+    pd.DataFrame: Indexed like beans_df with days_off_roast, peak_start_days,
+    peak_end_days and freshness (one of the FRESHNESS_* statuses)
+    """
+    if beans_df.empty:
+        return pd.DataFrame(columns=FRESHNESS_COLUMNS)
+
+    today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+    roast_dates = pd.to_datetime(
+        beans_df.get("roast_date", pd.Series(index=beans_df.index)),
+        errors="coerce",
+        format="mixed",
+    ).dt.normalize()
+
+    freshness = optimal_age_windows(beans_df)
+    freshness.insert(0, "days_off_roast", (today - roast_dates).dt.days)
+
+    days = freshness["days_off_roast"]
+    start = freshness["peak_start_days"]
+    end = freshness["peak_end_days"]
+    freshness["freshness"] = np.select(
+        [
+            days.isna() | start.isna(),
+            days > end,
+            days >= start,
+            days >= start - ENTERING_PEAK_DAYS,
+        ],
+        [FRESHNESS_UNKNOWN, FRESHNESS_PAST, FRESHNESS_PEAK, FRESHNESS_ENTERING],
+        default=FRESHNESS_RESTING,
+    )
+    return freshness
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+# Days of brew history a consumption rate is averaged over
+CONSUMPTION_WINDOW_DAYS = 30
+
+# Shortest history a rate is averaged over, so a single brew on a new bag
+# doesn't read as a whole dose per day forever
+MIN_RATE_DAYS = 7
+
+# Coffees projected to run out within this many days go on the reorder list
+REORDER_LEAD_DAYS = 7
+
+FORECAST_COLUMNS = ["daily_grams", "days_left", "run_out_date"]
+
+
+class ConsumptionTracker:
+    """
+    Grams of each coffee brewed per day, for rolling consumption rates.
+
+    Built from the Brew Log once and kept current with add_brew as brews
+    are saved, so rates never need another pass over the log.
+    """
+
+    def __init__(self):
+        self.daily_grams = {}
+        self.first_brew = {}
+
+    @classmethod
+    def from_brew_log(cls, brew_log_df, today=None):
+        """
+        Aggregate doses per coffee and day in one groupby.
+
+        Days that have already left the rate window are dropped, since they
+        can't re-enter it as time moves on.
+        """
+        tracker = cls()
+        if brew_log_df.empty or not {"date", "coffee_id", "dose"} <= set(
+            brew_log_df.columns
+        ):
+            return tracker
+
+        log = pd.DataFrame(
+            {
+                "coffee_id": brew_log_df["coffee_id"].astype(str),
+                "day": pd.to_datetime(
+                    brew_log_df["date"], errors="coerce", format="mixed"
+                ).dt.normalize(),
+                "dose": pd.to_numeric(brew_log_df["dose"], errors="coerce"),
+            }
+        ).dropna()
+
+        tracker.first_brew = log.groupby("coffee_id")["day"].min().to_dict()
+        today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+        recent = log[log["day"] > today - pd.Timedelta(days=CONSUMPTION_WINDOW_DAYS)]
+        for (coffee_id, day), grams in (
+            recent.groupby(["coffee_id", "day"])["dose"].sum().items()
+        ):
+            tracker.daily_grams.setdefault(coffee_id, {})[day] = grams
+        return tracker
+
+    def add_brew(self, brew):
+        """Count one saved brew (a Brew Log row as a dict)."""
+        day = pd.to_datetime(brew.get("date"), errors="coerce")
+        dose = pd.to_numeric(brew.get("dose"), errors="coerce")
+        if pd.isna(day) or pd.isna(dose):
+            return
+        coffee_id = str(brew.get("coffee_id"))
+        day = day.normalize()
+        days = self.daily_grams.setdefault(coffee_id, {})
+        days[day] = days.get(day, 0.0) + float(dose)
+        self.first_brew[coffee_id] = min(self.first_brew.get(coffee_id, day), day)
+
+    def rates(self, today=None, window_days=CONSUMPTION_WINDOW_DAYS):
+        """
+        Average grams per day over the last window_days.
+
+        Coffees first brewed inside the window are averaged over the days
+        since that first brew (at least MIN_RATE_DAYS).
+
+        Returns:
+        pd.Series: Grams per day indexed by coffee_id
+        """
+        today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+        window_start = today - pd.Timedelta(days=window_days - 1)
+
+        rates = {}
+        for coffee_id, days in self.daily_grams.items():
+            grams = sum(g for day, g in days.items() if window_start <= day <= today)
+            span = (today - max(self.first_brew[coffee_id], window_start)).days + 1
+            rates[coffee_id] = grams / min(max(span, MIN_RATE_DAYS), window_days)
+        return pd.Series(rates, dtype="float64")
+
+
+def forecast_depletion(beans_df, rates, today=None):
+    """
+    Project when each bean runs out at its current consumption rate.
+
+    Parameters:
+    beans_df (pd.DataFrame): The Beans Inventory worksheet
+    rates (pd.Series): Grams per day by coffee_id, from ConsumptionTracker
+    today (date): Day to project from, defaults to today
+
+    Returns:
+    pd.DataFrame: Indexed like beans_df with daily_grams, days_left and
+    run_out_date (NaN/NaT for coffees that aren't being brewed)
+    """
+    if beans_df.empty or "id" not in beans_df.columns:
+        return pd.DataFrame(columns=FORECAST_COLUMNS)
+
+    today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+    daily_grams = beans_df["id"].astype(str).map(rates).fillna(0.0)
+    remaining = pd.to_numeric(
+        beans_df.get("grams_remaining", pd.Series(index=beans_df.index)),
+        errors="coerce",
+    ).clip(lower=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_left = (remaining / daily_grams).where(daily_grams > 0)
+
+    return pd.DataFrame(
+        {
+            "daily_grams": daily_grams,
+            "days_left": days_left,
+            "run_out_date": today + pd.to_timedelta(np.ceil(days_left), unit="D"),
+        },
+        index=beans_df.index,
+    )
+
+
+def reorder_list(beans_df, forecast, lead_days=REORDER_LEAD_DAYS):
+    """
+    Coffees projected to run out within lead_days, soonest first.
+
+    Returns:
+    pd.DataFrame: id, name, grams_remaining and the forecast columns
+    """
+    columns = [c for c in ["id", "name", "grams_remaining"] if c in beans_df]
+    due = forecast["days_left"] <= lead_days
+    return (
+        beans_df.loc[due, columns]
+        .join(forecast.loc[due])
+        .sort_values("days_left")
+        .reset_index(drop=True)
+    )
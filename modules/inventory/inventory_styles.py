@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from modules.inventory.bean_freshness import (
+    FRESHNESS_ENTERING,
+    FRESHNESS_PAST,
+    FRESHNESS_PEAK,
+)
+
+# Grams below which a bean counts as low on stock, unless the bean sets its
+# own low_stock_threshold
+DEFAULT_LOW_STOCK_THRESHOLD = 50.0
+
+LOW_STOCK_STYLE = "background-color: rgba(234, 67, 53, 0.2)"
+
+FRESHNESS_STYLES = {
+    FRESHNESS_ENTERING: "background-color: rgba(251, 188, 5, 0.2)",
+    FRESHNESS_PEAK: "background-color: rgba(52, 168, 83, 0.2)",
+    FRESHNESS_PAST: "background-color: rgba(154, 160, 166, 0.25)",
+}
+
+
+def low_stock_thresholds(beans_df):
+    """Each bean's low-stock threshold in grams, with the default filled in."""
+    thresholds = beans_df.get("low_stock_threshold", pd.Series(index=beans_df.index))
+    return pd.to_numeric(thresholds, errors="coerce").fillna(
+        DEFAULT_LOW_STOCK_THRESHOLD
+    )
+
+
+def low_stock_mask(beans_df):
+    """Boolean Series, True for beans below their low-stock threshold."""
+    remaining = pd.to_numeric(beans_df["grams_remaining"], errors="coerce")
+    return remaining < low_stock_thresholds(beans_df)
+
+
+def style_inventory(table):
+    """
+    Highlight low stock and freshness in the inventory table.
+
+    The cell styles are computed up front as whole-column masks, and each
+    Styler.apply call only hands back one precomputed column, so rendering
+    doesn't run any Python per row.
+
+    Parameters:
+    table (pd.DataFrame): Beans Inventory, optionally joined with the
+    freshness columns
+
+    Returns:
+    pandas.io.formats.style.Styler
+    """
+    column_styles = {}
+    if "grams_remaining" in table.columns:
+        column_styles["grams_remaining"] = np.where(
+            low_stock_mask(table), LOW_STOCK_STYLE, ""
+        )
+    if "freshness" in table.columns:
+        column_styles["freshness"] = (
+            table["freshness"].map(FRESHNESS_STYLES).fillna("").to_numpy()
+        )
+
+    styler = table.style
+    for column, styles in column_styles.items():
+        styler = styler.apply(lambda _, styles=styles: styles, subset=[column])
+    return styler
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+# Builders turning a worksheet (or any subset of its rows) into a
+# key -> selectbox label dict, keyed by what a selection stands for: a coffee
+# id, or a water recipe or brewer name. Selectboxes take the keys as options
+# and the labels through format_func, so a selection never has to be parsed
+# back out of its label. Every builder is vectorized over the whole frame.
+
+
+def _text(series):
+    # str() of every value, missing ones included: astype(str) keeps NaN as
+    # NaN, which can't be concatenated
+    return series.map(str).to_numpy(dtype=object)
+
+
+def coffee_option_labels(beans_df):
+    """Coffees with stock, labelled "Name (123.4g)"."""
+    if beans_df.empty or not {"id", "name", "grams_remaining"} <= set(beans_df.columns):
+        return {}
+    remaining = pd.to_numeric(beans_df["grams_remaining"], errors="coerce")
+    usable = beans_df["id"].notna() & beans_df["name"].notna() & remaining.notna()
+    grams = np.char.mod("%.1f", remaining[usable].to_numpy(dtype=float))
+    labels = _text(beans_df.loc[usable, "name"]) + " (" + grams.astype(object) + "g)"
+    return dict(zip(beans_df.loc[usable, "id"], labels))
+
+
+def inventory_option_labels(beans_df):
+    """Every coffee, labelled "Name (ID: id)"."""
+    if beans_df.empty or not {"id", "name"} <= set(beans_df.columns):
+        return {}
+    usable = beans_df["id"].notna() & beans_df["name"].notna()
+    ids = beans_df.loc[usable, "id"]
+    labels = _text(beans_df.loc[usable, "name"]) + " (ID: " + _text(ids) + ")"
+    return dict(zip(ids, labels))
+
+
+def water_recipe_option_labels(water_recipes_df):
+    """
+    Water recipes keyed by name (the value the Brew Log stores), labelled
+    "Name - notes".
+    """
+    if water_recipes_df.empty or not {"name", "notes"} <= set(water_recipes_df.columns):
+        return {}
+    recipes = water_recipes_df[water_recipes_df["name"].notna()]
+    labels = _text(recipes["name"]) + " - " + _text(recipes["notes"])
+    return dict(zip(recipes["name"], labels))
+
+
+def brewer_option_labels(brewers_df):
+    """Brewers keyed and labelled by name, the value the Brew Log stores."""
+    if brewers_df.empty or "name" not in brewers_df.columns:
+        return {}
+    names = brewers_df["name"].dropna()
+    return dict(zip(names, _text(names)))
@@ -3,6 +3,7 @@ import streamlit as st
 import pandas as pd
 from app.py import load_data, save_data, update_coffee_inventory
 
+
 # Add this function to update the extraction calculator page
 def add_brewing_suggestions_to_extraction_calculator(gc):
     """
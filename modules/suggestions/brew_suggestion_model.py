@@ -0,0 +1,202 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Regularisation on the grind/ratio coefficients so a coffee with only a few
+# brews still gets a usable (if flat) model
+RIDGE_PENALTY = 1e-3
+
+# Brews needed before a model is trusted for recommendations
+MIN_BREWS = 4
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_grind_setting(grind_size):
+    """Pull the numeric setting out of a grind entry like "22 clicks"."""
+    match = _NUMBER.search(str(grind_size)) if grind_size is not None else None
+    return float(match.group()) if match else np.nan
+
+
+class BrewModel:
+    """
+    Linear model of (extraction_yield, tds_percent) against grind and ratio.
+
+    Only the sufficient statistics X'X and X'y are kept, so adding a brew is
+    an O(1) update and the coefficients are re-solved lazily on the next
+    prediction.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.xtx = np.zeros((3, 3))
+        self.xty = np.zeros((3, 2))
+        self.grind_range = [np.inf, -np.inf]
+        self.ratio_range = [np.inf, -np.inf]
+        self._coef = None
+
+    def add_stats(self, n, xtx, xty, grind_range, ratio_range):
+        """Merge pre-aggregated statistics into the model."""
+        self.n += n
+        self.xtx += xtx
+        self.xty += xty
+        self.grind_range = [
+            min(self.grind_range[0], grind_range[0]),
+            max(self.grind_range[1], grind_range[1]),
+        ]
+        self.ratio_range = [
+            min(self.ratio_range[0], ratio_range[0]),
+            max(self.ratio_range[1], ratio_range[1]),
+        ]
+        self._coef = None
+
+    def add(self, grind, ratio, extraction_yield, tds_percent):
+        """Add one brew."""
+        x = np.array([1.0, grind, ratio])
+        y = np.array([extraction_yield, tds_percent])
+        self.add_stats(1, np.outer(x, x), np.outer(x, y), [grind] * 2, [ratio] * 2)
+
+    @property
+    def coefficients(self):
+        """Tuple of ((ey0, ey_grind, ey_ratio), (tds0, tds_grind, tds_ratio))."""
+        if self._coef is None:
+            penalty = np.diag([0.0, RIDGE_PENALTY, RIDGE_PENALTY]) * max(self.n, 1)
+            coef = np.linalg.lstsq(self.xtx + penalty, self.xty, rcond=None)[0]
+            self._coef = (tuple(coef[:, 0].tolist()), tuple(coef[:, 1].tolist()))
+        return self._coef
+
+    def predict(self, grind, ratio):
+        """Predict (extraction_yield, tds_percent) for a grind and ratio."""
+        ey, tds = self.coefficients
+        return (
+            ey[0] + ey[1] * grind + ey[2] * ratio,
+            tds[0] + tds[1] * grind + tds[2] * ratio,
+        )
+
+    def recommend(self, target_ey, target_tds):
+        """
+        Solve for the grind and ratio that hit a target EY and TDS.
+
+        The answer is clamped to the grind and ratio range this coffee has
+        actually been brewed at.
+
+        Returns:
+        tuple: (grind, ratio)
+        """
+        ey, tds = self.coefficients
+        det = ey[1] * tds[2] - ey[2] * tds[1]
+        mid_grind = sum(self.grind_range) / 2
+        mid_ratio = sum(self.ratio_range) / 2
+
+        if abs(det) > 1e-9:
+            rhs_ey = target_ey - ey[0]
+            rhs_tds = target_tds - tds[0]
+            grind = (rhs_ey * tds[2] - ey[2] * rhs_tds) / det
+            ratio = (ey[1] * rhs_tds - rhs_ey * tds[1]) / det
+        elif abs(ey[1]) > 1e-9:
+            # Grind and ratio aren't separable, so hold the ratio and fit EY
+            ratio = mid_ratio
+            grind = (target_ey - ey[0] - ey[2] * ratio) / ey[1]
+        else:
+            grind, ratio = mid_grind, mid_ratio
+
+        grind = min(max(grind, self.grind_range[0]), self.grind_range[1])
+        ratio = min(max(ratio, self.ratio_range[0]), self.ratio_range[1])
+        return grind, ratio
+
+
+def _brew_features(brew_log_df):
+    """Numeric model inputs for every usable row of the brew log."""
+    required = ["coffee_id", "dose", "total_water", "grind_size"]
+    required += ["tds_percent", "extraction_yield"]
+    if brew_log_df.empty or not set(required) <= set(brew_log_df.columns):
+        return pd.DataFrame(columns=["coffee_id", "water_recipe", "grind", "ratio"])
+
+    water_recipe = brew_log_df.get("water_recipe", pd.Series(index=brew_log_df.index))
+    features = pd.DataFrame(
+        {
+            "coffee_id": brew_log_df["coffee_id"].astype(str),
+            "water_recipe": water_recipe.fillna("").astype(str),
+            "grind": brew_log_df["grind_size"].map(parse_grind_setting),
+            "ratio": pd.to_numeric(brew_log_df["total_water"], errors="coerce")
+            / pd.to_numeric(brew_log_df["dose"], errors="coerce"),
+            "extraction_yield": pd.to_numeric(
+                brew_log_df["extraction_yield"], errors="coerce"
+            ),
+            "tds_percent": pd.to_numeric(brew_log_df["tds_percent"], errors="coerce"),
+        }
+    )
+    numeric = features[["grind", "ratio", "extraction_yield", "tds_percent"]]
+    return features[np.isfinite(numeric).all(axis=1)]
+
+
+class BrewModelCache:
+    """
+    Per-coffee brew models, plus one per (coffee, water recipe) pair.
+
+    Built from the whole log once, then kept current with add_brew as brews
+    are saved.
+    """
+
+    def __init__(self):
+        self.models = {}
+
+    def _model(self, key):
+        if key not in self.models:
+            self.models[key] = BrewModel()
+        return self.models[key]
+
+    @classmethod
+    def from_brew_log(cls, brew_log_df):
+        """Fit every model in one vectorized pass over the log."""
+        cache = cls()
+        features = _brew_features(brew_log_df)
+        if features.empty:
+            return cache
+
+        x = np.column_stack(
+            [np.ones(len(features)), features["grind"], features["ratio"]]
+        )
+        y = features[["extraction_yield", "tds_percent"]].to_numpy()
+        outer_xx = np.einsum("ni,nj->nij", x, x)
+        outer_xy = np.einsum("ni,nj->nij", x, y)
+
+        for keys in (["coffee_id"], ["coffee_id", "water_recipe"]):
+            codes, groups = pd.MultiIndex.from_frame(features[keys]).factorize()
+            xtx = np.zeros((len(groups), 3, 3))
+            xty = np.zeros((len(groups), 3, 2))
+            np.add.at(xtx, codes, outer_xx)
+            np.add.at(xty, codes, outer_xy)
+            ranges = features.groupby(codes)[["grind", "ratio"]].agg(["min", "max"])
+
+            for code, group in enumerate(groups):
+                key = group[0] if len(keys) == 1 else tuple(group)
+                cache._model(key).add_stats(
+                    int(round(xtx[code, 0, 0])),
+                    xtx[code],
+                    xty[code],
+                    ranges.loc[code, "grind"].tolist(),
+                    ranges.loc[code, "ratio"].tolist(),
+                )
+        return cache
+
+    def add_brew(self, brew):
+        """Fold one saved brew (a Brew Log row as a dict) into its models."""
+        features = _brew_features(pd.DataFrame([brew]))
+        for row in features.itertuples(index=False):
+            args = (row.grind, row.ratio, row.extraction_yield, row.tds_percent)
+            self._model(row.coffee_id).add(*args)
+            self._model((row.coffee_id, row.water_recipe)).add(*args)
+
+    def model_for(self, coffee_id, water_recipe=None):
+        """
+        The most specific model with enough brews, or None.
+
+        Prefers the (coffee, water recipe) model and falls back to the
+        coffee-wide one.
+        """
+        for key in ((str(coffee_id), water_recipe or ""), str(coffee_id)):
+            model = self.models.get(key)
+            if model is not None and model.n >= MIN_BREWS:
+                return model
+        return None
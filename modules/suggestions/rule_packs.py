@@ -0,0 +1,344 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+import time
+
+# Built-in rule packs shipped with the app
+BUILTIN_RULES_DIR = os.path.join(os.path.dirname(__file__), "rules")
+
+# Extra packs, loaded after the built-ins so they can extend or override them
+RULE_PACKS_DIR = os.environ.get("COFFEE_RULE_PACKS_DIR", "rule_packs")
+
+# Compiled packs are cached here and reused while no pack file has changed.
+# The cache is a pickle, so it is only read back when this user alone can
+# write it and the directory it sits in.
+RULE_CACHE_FILE = os.environ.get(
+    "COFFEE_RULE_CACHE_FILE",
+    os.path.join(os.path.expanduser("~"), ".cache", "coffee_tracker", "rules.pickle"),
+)
+
+# Bump when the compiled form changes so stale caches are rebuilt
+RULE_CACHE_VERSION = 1
+
+# Minimum seconds between checks of the pack files for changes
+RELOAD_CHECK_INTERVAL = 2.0
+
+RULE_PACK_EXTENSIONS = (".json", ".toml", ".yaml", ".yml")
+
+RULE_LIST_SECTIONS = ("varietals", "processes")
+ALIAS_SECTIONS = ("varietal_aliases", "process_aliases")
+
+
+class RulePackError(ValueError):
+    """A rule pack file that can't be read or doesn't match the schema."""
+
+
+def rule_pack_files():
+    """Pack files in load order: built-ins first, then RULE_PACKS_DIR, by name."""
+    files = []
+    for directory in (BUILTIN_RULES_DIR, RULE_PACKS_DIR):
+        if not os.path.isdir(directory):
+            continue
+        files.extend(
+            os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.lower().endswith(RULE_PACK_EXTENSIONS)
+        )
+    return files
+
+
+def pack_signature(files):
+    """Identify a set of pack files by path, modification time and size."""
+    signature = [RULE_CACHE_VERSION]
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def compiler_fingerprint(compile_fn):
+    """
+    Hash of the source of compile_fn's module and of the app modules it uses,
+    so a cache compiled by older code is never loaded.
+    """
+    module = inspect.getmodule(compile_fn)
+    sources = {module}
+    for value in vars(module).values():
+        owner = inspect.getmodule(value)
+        if owner is not None and owner.__name__.startswith("modules."):
+            sources.add(owner)
+
+    digest = hashlib.sha256()
+    for source in sorted(sources, key=lambda m: m.__name__):
+        try:
+            digest.update(inspect.getsource(source).encode())
+        except (OSError, TypeError):
+            digest.update(source.__name__.encode())
+    return digest.hexdigest()
+
+
+def read_rule_pack(path):
+    """
+    Parse one pack file as JSON, TOML or YAML.
+
+    TOML needs Python 3.11+ (tomllib) and YAML needs PyYAML.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == ".json":
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        if extension == ".toml":
+            import tomllib
+
+            with open(path, "rb") as f:
+                return tomllib.load(f)
+        import yaml
+
+        with open(path, encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    except ImportError as e:
+        raise RulePackError(f"{path}: {e.name} is needed to read {extension} packs")
+    except Exception as e:
+        raise RulePackError(f"{path}: {e}")
+
+
+def _check_fields(fields, where):
+    if not isinstance(fields, dict):
+        raise RulePackError(f"{where}: fields must be a table of strings")
+    for field, value in fields.items():
+        if not isinstance(value, str):
+            raise RulePackError(f"{where}.{field}: must be a string")
+
+
+def _check_rule(rule, where, allow_variants=True):
+    if not isinstance(rule, dict):
+        raise RulePackError(f"{where}: must be a table")
+    key = rule.get("key")
+    if not isinstance(key, str) or not key or "/" in key:
+        raise RulePackError(f"{where}.key: must be a non-empty string without '/'")
+    terms = rule.get("terms")
+    if (
+        not isinstance(terms, list)
+        or not terms
+        or not all(isinstance(term, str) and term for term in terms)
+    ):
+        raise RulePackError(f"{where}.terms: must be a non-empty list of strings")
+    _check_fields(rule.get("fields", {}), f"{where}.fields")
+
+    variants = rule.get("variants", [])
+    if variants and not allow_variants:
+        raise RulePackError(f"{where}.variants: variants can't be nested")
+    if not isinstance(variants, list):
+        raise RulePackError(f"{where}.variants: must be a list")
+    for i, variant in enumerate(variants):
+        _check_rule(variant, f"{where}.variants[{i}]", allow_variants=False)
+
+
+def validate_rule_pack(pack, source):
+    """
+    Check a parsed pack against the rule schema and normalise it.
+
+    Parameters:
+    pack (dict): Parsed pack file
+    source (str): Where the pack came from, used in error messages
+
+    Returns:
+    dict: The pack with terms lowercased and missing sections filled in
+
+    Raises:
+    RulePackError: On the first schema violation found
+    """
+    if not isinstance(pack, dict):
+        raise RulePackError(f"{source}: a rule pack must be a table")
+
+    _check_fields(pack.get("defaults", {}), f"{source}: defaults")
+    for section in RULE_LIST_SECTIONS:
+        rules = pack.get(section, [])
+        if not isinstance(rules, list):
+            raise RulePackError(f"{source}: {section} must be a list")
+        for i, rule in enumerate(rules):
+            _check_rule(rule, f"{source}: {section}[{i}]")
+
+    combinations = pack.get("combinations", [])
+    if not isinstance(combinations, list):
+        raise RulePackError(f"{source}: combinations must be a list")
+    for i, combination in enumerate(combinations):
+        where = f"{source}: combinations[{i}]"
+        if not isinstance(combination, dict) or not all(
+            isinstance(combination.get(side), str) for side in ("varietal", "process")
+        ):
+            raise RulePackError(f"{where}: needs varietal and process keys")
+        _check_fields(combination.get("fields", {}), f"{where}.fields")
+
+    for section in ALIAS_SECTIONS:
+        _check_fields(pack.get(section, {}), f"{source}: {section}")
+
+    def normalise(rule):
+        return {
+            "key": rule["key"],
+            "terms": [term.lower() for term in rule["terms"]],
+            "fields": dict(rule.get("fields", {})),
+            "variants": [normalise(v) for v in rule.get("variants", [])],
+        }
+
+    return {
+        "defaults": dict(pack.get("defaults", {})),
+        "varietals": [normalise(rule) for rule in pack.get("varietals", [])],
+        "processes": [normalise(rule) for rule in pack.get("processes", [])],
+        "combinations": [
+            {
+                "varietal": combination["varietal"],
+                "process": combination["process"],
+                "fields": dict(combination.get("fields", {})),
+            }
+            for combination in combinations
+        ],
+        "varietal_aliases": {
+            alias.lower(): key
+            for alias, key in pack.get("varietal_aliases", {}).items()
+        },
+        "process_aliases": {
+            alias.lower(): key for alias, key in pack.get("process_aliases", {}).items()
+        },
+    }
+
+
+def _merge_rules(rules, extra):
+    # A rule with a known key replaces it in place; new rules go first so a
+    # pack can add a more specific rule ahead of a built-in catch-all
+    positions = {rule["key"]: i for i, rule in enumerate(rules)}
+    added = []
+    for rule in extra:
+        if rule["key"] in positions:
+            rules[positions[rule["key"]]] = rule
+        else:
+            added.append(rule)
+    return added + rules
+
+
+def merge_rule_packs(packs):
+    """
+    Layer validated packs into one rule set, later packs winning.
+
+    Defaults and aliases are updated key by key, rules are replaced by key
+    (new ones are checked first) and combinations from later packs take
+    priority.
+    """
+    merged = {
+        "defaults": {},
+        "varietals": [],
+        "processes": [],
+        "combinations": [],
+        "varietal_aliases": {},
+        "process_aliases": {},
+    }
+    for pack in packs:
+        merged["defaults"].update(pack["defaults"])
+        for section in RULE_LIST_SECTIONS:
+            merged[section] = _merge_rules(merged[section], pack[section])
+        merged["combinations"] = pack["combinations"] + merged["combinations"]
+        for section in ALIAS_SECTIONS:
+            merged[section].update(pack[section])
+    return merged
+
+
+def load_rule_packs(files):
+    """
+    Read, validate and merge pack files.
+
+    Returns:
+    tuple: (merged rule set, list of error messages for packs that were skipped)
+    """
+    packs, errors = [], []
+    for path in files:
+        try:
+            packs.append(validate_rule_pack(read_rule_pack(path), path))
+        except RulePackError as e:
+            errors.append(str(e))
+    return merge_rule_packs(packs), errors
+
+
+def _is_private(stat):
+    """Whether a file is owned by this user and writable by no one else."""
+    if not hasattr(os, "getuid"):
+        return True  # No POSIX ownership to check
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def _read_cache(signature):
+    try:
+        directory = os.stat(os.path.dirname(RULE_CACHE_FILE))
+        with open(RULE_CACHE_FILE, "rb") as f:
+            if not (_is_private(directory) and _is_private(os.fstat(f.fileno()))):
+                return None
+            cached_signature, compiled = pickle.load(f)
+    except Exception:
+        return None
+    return compiled if cached_signature == signature else None
+
+
+def _write_cache(signature, compiled):
+    # Written to a temporary file and swapped in, so a concurrent reader never
+    # sees half a cache
+    try:
+        os.makedirs(os.path.dirname(RULE_CACHE_FILE), mode=0o700, exist_ok=True)
+        temp_path = f"{RULE_CACHE_FILE}.{os.getpid()}.tmp"
+        fd = os.open(temp_path, os.O_CREAT | os.O_TRUNC | os.O_WRONLY, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((signature, compiled), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, RULE_CACHE_FILE)
+    except OSError:
+        pass  # The cache is only an optimisation
+
+
+class CompiledRules:
+    """
+    Compiled rule packs that reload themselves when a pack file changes.
+
+    Compiling is done by compile_fn (merged rule set -> compiled object). The
+    result is pickled to RULE_CACHE_FILE, so later processes with the same
+    pack files and compiler code load it instead of recompiling. Pack files are checked at most
+    every RELOAD_CHECK_INTERVAL seconds, so edits take effect without a
+    restart.
+    """
+
+    def __init__(self, compile_fn):
+        self.compile_fn = compile_fn
+        self.fingerprint = compiler_fingerprint(compile_fn)
+        self.signature = None
+        self.compiled = None
+        self.errors = []
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def _load(self, signature, files):
+        compiled = _read_cache(signature)
+        if compiled is None:
+            rule_set, errors = load_rule_packs(files)
+            compiled = {"rules": self.compile_fn(rule_set), "errors": errors}
+            _write_cache(signature, compiled)
+        self.signature = signature
+        self.compiled = compiled["rules"]
+        self.errors = compiled["errors"]
+
+    def get(self):
+        """The current compiled rules, reloaded first if a pack changed."""
+        now = time.monotonic()
+        if self.compiled is not None and now - self.checked_at < RELOAD_CHECK_INTERVAL:
+            return self.compiled
+
+        with self.lock:
+            if now - self.checked_at >= RELOAD_CHECK_INTERVAL or self.compiled is None:
+                files = rule_pack_files()
+                signature = (self.fingerprint,) + pack_signature(files)
+                if signature != self.signature:
+                    self._load(signature, files)
+                self.checked_at = now
+        return self.compiled
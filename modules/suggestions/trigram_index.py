@@ -0,0 +1,114 @@
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+# Minimum Dice similarity between trigram sets for a fuzzy match
+MATCH_THRESHOLD = 0.6
+
+# Longest run of words compared against the index
+MAX_PHRASE_WORDS = 3
+
+# Short names share few trigrams, so one swapped or mistyped letter ("natrual",
+# "typika") can sink their score below MATCH_THRESHOLD. Candidates scoring at
+# least this much are still accepted when they are a single edit away from a
+# name of MIN_TYPO_LENGTH letters or more.
+TYPO_CANDIDATE_THRESHOLD = 0.4
+MIN_TYPO_LENGTH = 5
+
+
+def normalize_name(text):
+    """Lowercase, strip accents and turn separators into single spaces."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text).split())
+
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b):
+    """Edits (insert, delete, substitute or swap adjacent letters) from a to b."""
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (a[i - 1] != b[j - 1]),
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[-1]
+
+
+class TrigramIndex:
+    """
+    Fuzzy lookup of known names (e.g. "yirgacheffe") to rule keys.
+
+    Names are compared without spaces, so "SL 28" finds "sl28". An input
+    phrase of n words is only compared with names of n words, or single-word
+    names, which keeps an origin like "Colombia" from matching
+    "Gesha Colombia". A phrase one typo away from a name is matched even
+    when their trigrams overlap too little to reach the threshold.
+    """
+
+    def __init__(self, names):
+        """
+        Parameters:
+        names (dict): Known name -> rule key
+        """
+        self.entries = []
+        self.postings = defaultdict(list)
+        for name, key in names.items():
+            words = normalize_name(name).split()
+            if not words:
+                continue
+            joined = "".join(words)
+            grams = _trigrams(joined)
+            entry_id = len(self.entries)
+            self.entries.append((key, joined, len(words), len(grams)))
+            for gram in grams:
+                self.postings[gram].append(entry_id)
+
+    def search(self, text, threshold=MATCH_THRESHOLD):
+        """
+        Find the key whose name best matches any phrase in text.
+
+        Returns:
+        tuple: (key, score), or ("", 0.0) when nothing reaches threshold or
+        is a single typo away
+        """
+        words = normalize_name(text).split()
+        best_key, best_score = "", 0.0
+        typo_key, typo_score = "", 0.0
+
+        for size in range(1, min(len(words), MAX_PHRASE_WORDS) + 1):
+            for start in range(len(words) - size + 1):
+                phrase = "".join(words[start : start + size])
+                grams = _trigrams(phrase)
+                shared = Counter(
+                    entry_id
+                    for gram in grams
+                    for entry_id in self.postings.get(gram, ())
+                )
+                for entry_id, count in shared.items():
+                    key, name, name_words, name_grams = self.entries[entry_id]
+                    if name_words != size and name_words != 1:
+                        continue
+                    score = 2 * count / (len(grams) + name_grams)
+                    if score > best_score:
+                        best_key, best_score = key, score
+                    if (
+                        TYPO_CANDIDATE_THRESHOLD <= score < threshold
+                        and score > typo_score
+                        and len(name) >= MIN_TYPO_LENGTH
+                        and edit_distance(phrase, name) <= 1
+                    ):
+                        typo_key, typo_score = key, score
+
+        if best_score >= threshold:
+            return best_key, best_score
+        return typo_key, typo_score
@@ -0,0 +1,66 @@
+import heapq
+import numpy as np
+
+
+class KDTree:
+    """
+    Small k-d tree for nearest-neighbour queries over a few dimensions.
+
+    Built once by recursive median splits; a query only descends into the
+    far side of a split when the splitting plane is closer than the k-th
+    best match found so far.
+    """
+
+    def __init__(self, points):
+        """
+        Parameters:
+        points (array-like): (n, dims) coordinates, free of NaN
+        """
+        self.points = np.asarray(points, dtype=float).reshape(len(points), -1)
+        # Plain lists are much faster than NumPy for one point at a time
+        self.coordinates = self.points.tolist()
+        self.root = self._build(np.arange(len(self.points)), 0)
+
+    def _build(self, indices, depth):
+        if len(indices) == 0:
+            return None
+        axis = depth % self.points.shape[1]
+        indices = indices[np.argsort(self.points[indices, axis], kind="stable")]
+        middle = len(indices) // 2
+        # Node: (point index, split axis, left subtree, right subtree)
+        return (
+            int(indices[middle]),
+            axis,
+            self._build(indices[:middle], depth + 1),
+            self._build(indices[middle + 1 :], depth + 1),
+        )
+
+    def query(self, point, k=1):
+        """
+        The k points nearest to point.
+
+        Returns:
+        list: (distance, point index) tuples, nearest first
+        """
+        coordinates = self.coordinates
+        target = np.asarray(point, dtype=float).tolist()
+        best = []  # Max-heap of (-squared distance, index)
+
+        def visit(node):
+            if node is None:
+                return
+            index, axis, left, right = node
+            squared = sum((a - b) ** 2 for a, b in zip(coordinates[index], target))
+            if len(best) < k:
+                heapq.heappush(best, (-squared, index))
+            elif squared < -best[0][0]:
+                heapq.heapreplace(best, (-squared, index))
+
+            offset = target[axis] - coordinates[index][axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            visit(near)
+            if len(best) < k or offset * offset < -best[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return sorted((np.sqrt(-squared), index) for squared, index in best)
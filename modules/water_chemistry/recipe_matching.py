@@ -0,0 +1,82 @@
+import re
+from functools import lru_cache
+import numpy as np
+from modules.water_chemistry.kd_tree import KDTree
+
+# Profile dimensions recipes are matched on
+MATCH_COLUMNS = ["hardness_ppm", "alkalinity_ppm", "tds_ppm"]
+
+# ppm per unit of match distance in each dimension, so a 20 ppm TDS miss
+# weighs the same as a 10 ppm hardness or alkalinity miss
+MATCH_SCALE = np.array([1.0, 1.0, 2.0])
+
+# Water styles named in water_quality texts -> (hardness, alkalinity) targets
+# in ppm as CaCO3. The first style found in the text applies.
+WATER_STYLE_TARGETS = [
+    ("very soft", (35.0, 25.0)),
+    ("soft", (50.0, 35.0)),
+    ("lower mineral", (50.0, 35.0)),
+    ("higher mineral", (90.0, 50.0)),
+    ("balanced", (70.0, 40.0)),
+]
+DEFAULT_WATER_TARGET = (70.0, 40.0)
+DEFAULT_TARGET_TDS = 150.0
+
+_TDS = re.compile(r"(\d+(?:\.\d+)?)(?:-(\d+(?:\.\d+)?))? ppm TDS")
+_HARDNESS = re.compile(r"(\d+(?:\.\d+)?)(?:-(\d+(?:\.\d+)?))? ppm (?:\w+ )?hardness")
+
+
+def _midpoint(match):
+    low = float(match.group(1))
+    return (low + float(match.group(2) or low)) / 2
+
+
+@lru_cache(maxsize=256)
+def water_target_vector(water_quality):
+    """
+    Parse a suggestion's water_quality text into a MATCH_COLUMNS target.
+
+    TDS and hardness are read from the text where given ("120-140 ppm TDS",
+    "50-75 ppm calcium hardness"), the rest comes from the water style it
+    names ("softer water preferred", "higher mineral content").
+
+    Returns:
+    tuple: (hardness, alkalinity, tds) in ppm
+    """
+    text = str(water_quality or "").lower()
+    hardness, alkalinity = next(
+        (target for style, target in WATER_STYLE_TARGETS if style in text),
+        DEFAULT_WATER_TARGET,
+    )
+
+    match = _HARDNESS.search(text)
+    if match:
+        hardness = _midpoint(match)
+    match = _TDS.search(text.replace("tds", "TDS"))
+    tds = _midpoint(match) if match else DEFAULT_TARGET_TDS
+    return hardness, alkalinity, tds
+
+
+class RecipeIndex:
+    """Nearest-recipe lookup over water profiles, backed by a KDTree."""
+
+    def __init__(self, profiles):
+        """
+        Parameters:
+        profiles (pd.DataFrame): Output of water_profiles
+        """
+        usable = profiles[MATCH_COLUMNS].dropna()
+        self.names = list(usable.index)
+        self.tree = KDTree(usable.to_numpy() / MATCH_SCALE) if self.names else None
+
+    def nearest(self, target, k=3):
+        """
+        Recipes closest to a (hardness, alkalinity, tds) target.
+
+        Returns:
+        list: (recipe name, match distance) tuples, best first
+        """
+        if self.tree is None:
+            return []
+        matches = self.tree.query(np.asarray(target) / MATCH_SCALE, k)
+        return [(self.names[index], float(distance)) for distance, index in matches]
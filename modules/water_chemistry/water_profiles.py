@@ -0,0 +1,147 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Volume of one drop of concentrate, in mL
+DROP_VOLUME_ML = 0.05
+
+CACO3_MOLAR_MASS = 100.09
+
+# Mineral concentrates, one per drop column of the Water Recipes worksheet:
+# salt, grams of salt per litre of concentrate, molar mass of the salt as
+# weighed (hydrated), molar mass it leaves dissolved (anhydrous), the cation
+# and its atomic mass, and whether it adds hardness or alkalinity
+DEFAULT_CONCENTRATES = {
+    "magnesium_drops": {
+        "salt": "MgSO4·7H2O",
+        "grams_per_litre": 100.0,
+        "molar_mass": 246.47,
+        "dissolved_mass": 120.37,
+        "ion": "magnesium",
+        "ion_mass": 24.305,
+        "adds": "hardness",
+    },
+    "calcium_drops": {
+        "salt": "CaCl2·2H2O",
+        "grams_per_litre": 75.0,
+        "molar_mass": 147.01,
+        "dissolved_mass": 110.98,
+        "ion": "calcium",
+        "ion_mass": 40.078,
+        "adds": "hardness",
+    },
+    "sodium_drops": {
+        "salt": "NaHCO3",
+        "grams_per_litre": 50.0,
+        "molar_mass": 84.007,
+        "dissolved_mass": 84.007,
+        "ion": "sodium",
+        "ion_mass": 22.99,
+        "adds": "alkalinity",
+    },
+    "potassium_drops": {
+        "salt": "KHCO3",
+        "grams_per_litre": 50.0,
+        "molar_mass": 100.115,
+        "dissolved_mass": 100.115,
+        "ion": "potassium",
+        "ion_mass": 39.098,
+        "adds": "alkalinity",
+    },
+}
+
+# Override concentrate strengths without a code change, as JSON mapping a drop
+# column to grams per litre, e.g. {"calcium_drops": 80}
+CONCENTRATE_OVERRIDES = os.environ.get("COFFEE_WATER_CONCENTRATES", "")
+
+DROP_COLUMNS = list(DEFAULT_CONCENTRATES)
+
+ION_COLUMNS = ["magnesium_ppm", "calcium_ppm", "sodium_ppm", "potassium_ppm"]
+
+WATER_PROFILE_COLUMNS = ION_COLUMNS + ["hardness_ppm", "alkalinity_ppm", "tds_ppm"]
+
+
+def concentrate_strengths():
+    """DEFAULT_CONCENTRATES with any COFFEE_WATER_CONCENTRATES overrides applied."""
+    concentrates = {column: dict(c) for column, c in DEFAULT_CONCENTRATES.items()}
+    if CONCENTRATE_OVERRIDES:
+        for column, grams in json.loads(CONCENTRATE_OVERRIDES).items():
+            concentrates[column]["grams_per_litre"] = float(grams)
+    return concentrates
+
+
+def strength_matrix(concentrates=None):
+    """
+    What one drop of each concentrate adds to one litre of water.
+
+    Returns:
+    np.ndarray: (len(DROP_COLUMNS), len(WATER_PROFILE_COLUMNS)) in mg/L, rows
+    in DROP_COLUMNS order
+    """
+    concentrates = concentrates or concentrate_strengths()
+    matrix = np.zeros((len(DROP_COLUMNS), len(WATER_PROFILE_COLUMNS)))
+    for row, column in enumerate(DROP_COLUMNS):
+        concentrate = concentrates[column]
+        # g/L of concentrate is mg per mL, so this is mmol of salt per drop
+        mmol = (
+            concentrate["grams_per_litre"] * DROP_VOLUME_ML / concentrate["molar_mass"]
+        )
+        matrix[row, ION_COLUMNS.index(f"{concentrate['ion']}_ppm")] = (
+            mmol * concentrate["ion_mass"]
+        )
+        if concentrate["adds"] == "hardness":
+            matrix[row, WATER_PROFILE_COLUMNS.index("hardness_ppm")] = (
+                mmol * CACO3_MOLAR_MASS
+            )
+        else:
+            # One bicarbonate is half a carbonate's worth of alkalinity
+            matrix[row, WATER_PROFILE_COLUMNS.index("alkalinity_ppm")] = (
+                mmol * CACO3_MOLAR_MASS / 2
+            )
+        matrix[row, WATER_PROFILE_COLUMNS.index("tds_ppm")] = (
+            mmol * concentrate["dissolved_mass"]
+        )
+    return matrix
+
+
+def water_profiles(water_recipes_df, concentrates=None):
+    """
+    Mineral profile of every water recipe in one matrix product.
+
+    Parameters:
+    water_recipes_df (pd.DataFrame): The Water Recipes worksheet
+    concentrates (dict): Concentrate definitions, see DEFAULT_CONCENTRATES
+
+    Returns:
+    pd.DataFrame: WATER_PROFILE_COLUMNS in ppm (mg/L), indexed by recipe name.
+    Recipes without a usable total_volume_ml are all NaN
+    """
+    if water_recipes_df.empty or "name" not in water_recipes_df.columns:
+        return pd.DataFrame(columns=WATER_PROFILE_COLUMNS)
+
+    # The Brew Log refers to recipes by name, so the last of any duplicates wins
+    recipes = water_recipes_df[water_recipes_df["name"].notna()]
+    recipes = recipes[~recipes["name"].astype(str).duplicated(keep="last")]
+    drops = (
+        recipes.reindex(columns=DROP_COLUMNS)
+        .apply(pd.to_numeric, errors="coerce")
+        .fillna(0)
+        .to_numpy()
+    )
+    litres = (
+        pd.to_numeric(
+            recipes.get("total_volume_ml", pd.Series(index=recipes.index)),
+            errors="coerce",
+        ).to_numpy()
+        / 1000
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profiles = drops @ strength_matrix(concentrates) / litres[:, None]
+    profiles[~(litres > 0)] = np.nan
+
+    return pd.DataFrame(
+        profiles, index=recipes["name"].astype(str), columns=WATER_PROFILE_COLUMNS
+    )
+
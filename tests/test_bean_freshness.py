@@ -0,0 +1,118 @@
+import pandas as pd
+import pytest
+
+from modules.inventory import bean_freshness as freshness_module
+from modules.inventory.bean_freshness import (
+    ENTERING_PEAK_DAYS,
+    FRESHNESS_COLUMNS,
+    FRESHNESS_ENTERING,
+    FRESHNESS_PAST,
+    FRESHNESS_PEAK,
+    FRESHNESS_RESTING,
+    FRESHNESS_UNKNOWN,
+    bean_freshness,
+)
+
+TODAY = pd.Timestamp("2024-06-30")
+
+# Optimal days off roast per varietal; anything else has no window
+WINDOWS = {"Gesha": (10, 30), "Bourbon": (7, 21)}
+
+
+@pytest.fixture(autouse=True)
+def windows(monkeypatch):
+    lookups = []
+
+    def suggestions_for_keys(varietal, process):
+        lookups.append((varietal, process))
+        window = WINDOWS.get(varietal)
+        return {"optimal_age_days": window} if window else {}
+
+    monkeypatch.setattr(
+        freshness_module, "resolve_suggestion_keys", lambda v, p: (v, p)
+    )
+    monkeypatch.setattr(freshness_module, "suggestions_for_keys", suggestions_for_keys)
+    return lookups
+
+
+def beans(*rows):
+    return pd.DataFrame(rows, columns=["varietal", "process", "roast_date"])
+
+
+def roasted(days_ago):
+    return str((TODAY - pd.Timedelta(days=days_ago)).date())
+
+
+@pytest.mark.parametrize(
+    "days, status",
+    [
+        (0, FRESHNESS_RESTING),
+        (10 - ENTERING_PEAK_DAYS - 1, FRESHNESS_RESTING),
+        (10 - ENTERING_PEAK_DAYS, FRESHNESS_ENTERING),
+        (9, FRESHNESS_ENTERING),
+        (10, FRESHNESS_PEAK),
+        (30, FRESHNESS_PEAK),
+        (31, FRESHNESS_PAST),
+    ],
+)
+def test_window_boundaries(days, status):
+    result = bean_freshness(beans(("Gesha", "", roasted(days))), TODAY)
+
+    assert result["days_off_roast"].iloc[0] == days
+    assert result["freshness"].iloc[0] == status
+
+
+def test_roast_times_count_whole_days():
+    result = bean_freshness(beans(("Gesha", "", "2024-06-20 23:59")), TODAY)
+
+    assert result["days_off_roast"].iloc[0] == 10
+    assert result["freshness"].iloc[0] == FRESHNESS_PEAK
+
+
+def test_unknown_without_a_roast_date_or_window():
+    result = bean_freshness(
+        beans(
+            ("Gesha", "", ""),
+            ("Gesha", "", "soon"),
+            ("Caturra", "", roasted(12)),
+            (None, None, roasted(12)),
+        ),
+        TODAY,
+    )
+
+    assert result["freshness"].tolist() == [FRESHNESS_UNKNOWN] * 4
+    assert result[["peak_start_days", "peak_end_days"]].iloc[2:].isna().all().all()
+
+
+def test_windows_are_looked_up_once_per_pair(windows):
+    inventory = beans(
+        ("Gesha", "Washed", roasted(5)),
+        ("Bourbon", "Natural", roasted(15)),
+        ("Gesha", "Washed", roasted(40)),
+        ("Gesha", "Natural", roasted(12)),
+    )
+    inventory.index = [7, 3, 9, 1]
+
+    result = bean_freshness(inventory, TODAY)
+
+    assert sorted(windows) == [
+        ("Bourbon", "Natural"),
+        ("Gesha", "Natural"),
+        ("Gesha", "Washed"),
+    ]
+    assert result.index.tolist() == [7, 3, 9, 1]
+    assert result.columns.tolist() == FRESHNESS_COLUMNS
+    assert result["peak_start_days"].tolist() == [10, 7, 10, 10]
+    assert result["freshness"].tolist() == [
+        FRESHNESS_RESTING,
+        FRESHNESS_PEAK,
+        FRESHNESS_PAST,
+        FRESHNESS_PEAK,
+    ]
+
+
+def test_empty_inventory():
+    result = bean_freshness(beans(), TODAY)
+
+    assert result.empty
+    assert result.columns.tolist() == FRESHNESS_COLUMNS
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from modules.extraction_chart.brew_density import (
+    DENSITY_EY_EDGES,
+    DENSITY_TDS_EDGES,
+    MAX_HISTORY_MARKERS,
+    BrewDensity,
+)
+
+
+def random_log(n=500, seed=2):
+    rng = np.random.default_rng(seed)
+    ey = rng.normal(20, 2.5, n)
+    tds = rng.normal(1.35, 0.15, n)
+    # Brews on the map's outer edges, which np.histogram2d counts
+    ey[:4] = [DENSITY_EY_EDGES[0], DENSITY_EY_EDGES[-1]] * 2
+    tds[:4] = [DENSITY_TDS_EDGES[-1]] * 2 + [DENSITY_TDS_EDGES[0]] * 2
+    return pd.DataFrame(
+        {
+            "extraction_yield": ey,
+            "tds_percent": tds,
+            "coffee_id": rng.choice(["a", "b", ""], n),
+        }
+    )
+
+
+def histogram(log):
+    counts, _, _ = np.histogram2d(
+        log["extraction_yield"],
+        log["tds_percent"],
+        bins=[DENSITY_EY_EDGES, DENSITY_TDS_EDGES],
+    )
+    return counts
+
+
+def test_grids_match_histogram2d():
+    log = random_log()
+    density = BrewDensity.from_brew_log(log)
+
+    np.testing.assert_array_equal(density.counts[""], histogram(log))
+    for coffee_id in ("a", "b"):
+        np.testing.assert_array_equal(
+            density.counts[coffee_id],
+            histogram(log[log["coffee_id"] == coffee_id]),
+        )
+    assert density.counts[""].sum() < len(log)  # Some brews fall off the map
+
+
+def test_adding_brews_matches_a_full_rebuild():
+    log = random_log(n=300)
+    density = BrewDensity.from_brew_log(log.iloc[:200])
+    for brew in log.iloc[200:].to_dict("records"):
+        density.add_brew(brew)
+    rebuilt = BrewDensity.from_brew_log(log)
+
+    assert density.counts.keys() == rebuilt.counts.keys()
+    for coffee_id, counts in rebuilt.counts.items():
+        np.testing.assert_array_equal(density.counts[coffee_id], counts)
+        assert density.overlay(coffee_id, "x") == rebuilt.overlay(coffee_id, "x")
+
+
+def test_overlays_keep_markers_only_for_short_histories():
+    log = random_log(n=MAX_HISTORY_MARKERS + 50)
+    log["coffee_id"] = ["short"] * 10 + ["long"] * (len(log) - 10)
+    log.loc[:9, ["extraction_yield", "tds_percent"]] = [20.0, 1.35]
+    density = BrewDensity.from_brew_log(log)
+
+    short = density.overlay("short", "Short")
+    assert short.points == ((20.0, 1.35),) * 10
+    assert short.brews == 10
+    assert density.overlay("long", "Long").points == ()
+    assert density.overlay("missing", "Missing") is None
+
+    # Snapshots are reused until the coffee's grid changes
+    assert density.overlay("short", "Short") is short
+    density.add_brew(
+        {"extraction_yield": 21.0, "tds_percent": 1.4, "coffee_id": "short"}
+    )
+    assert density.overlay("short", "Short") is not short
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+from modules.brew_analytics.brew_rollups import (
+    DIMENSIONS,
+    EY_BIN_EDGES,
+    GRANULARITIES,
+    PERCENTILES,
+    TDS_BIN_EDGES,
+    BrewRollups,
+)
+from modules.brew_analytics.brewer_analytics import brewer_analytics
+
+
+def brew_log(**columns):
+    n = len(next(iter(columns.values())))
+    log = pd.DataFrame(
+        {
+            "date": pd.date_range("2024-01-01", periods=n, freq="D").astype(str),
+            "extraction_yield": [20.0] * n,
+            "tds_percent": [1.35] * n,
+            "dose": [15.0] * n,
+        }
+    )
+    for name, values in columns.items():
+        log[name] = values
+    return log
+
+
+def test_blank_brewers_and_coffees_only_count_towards_all():
+    log = brew_log(
+        brewer=["V60", " ", None, ""],
+        coffee_id=["a", "", "a", None],
+    )
+    rollups = BrewRollups.from_brew_log(log)
+    rollups.add_brew({"date": "2024-01-05", "extraction_yield": 20, "tds_percent": 1.3})
+
+    assert rollups.keys("Brewer") == ["V60"]
+    assert rollups.keys("Coffee") == ["a"]
+    assert rollups.trend("Monthly", "All")["brews"].sum() == 5
+
+
+def test_blank_brewers_are_left_out_of_brewer_analytics():
+    log = brew_log(brewer=["V60", "  ", None])
+    stats = brewer_analytics(log, pd.DataFrame({"name": ["V60"]}))
+
+    assert stats.index.tolist() == ["V60"]
+    assert stats.loc["V60", "brews"] == 1
+
+
+def random_log(n=600, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "date": (
+                pd.Timestamp("2024-01-01")
+                + pd.to_timedelta(rng.integers(0, 120, n), unit="D")
+            ).astype(str),
+            "extraction_yield": rng.normal(20, 1.5, n),
+            "tds_percent": rng.normal(1.35, 0.1, n),
+            "dose": rng.uniform(12, 20, n),
+            "brewer": rng.choice(["V60", "Kalita"], n),
+            "coffee_id": rng.choice(["a", "b", "c"], n),
+        }
+    )
+
+
+def test_monthly_rollups_match_the_raw_brews():
+    log = random_log()
+    rollups = BrewRollups.from_brew_log(log)
+    months = pd.to_datetime(log["date"]).dt.to_period("M").dt.start_time
+
+    for coffee_id, brews in log.groupby("coffee_id"):
+        trend = rollups.trend("Monthly", "Coffee", coffee_id)
+        by_month = brews.groupby(months[brews.index])
+        assert trend["brews"].tolist() == by_month.size().tolist()
+        np.testing.assert_allclose(trend["grams"], by_month["dose"].sum())
+        np.testing.assert_allclose(
+            trend["ey_mean"], by_month["extraction_yield"].mean()
+        )
+
+        # Histogram percentiles land within a bin of the exact ones; every
+        # brew here falls in the fine TDS bins
+        ey_width = np.diff(EY_BIN_EDGES).max()
+        tds_width = np.diff(TDS_BIN_EDGES).min()
+        assert tds_width <= 0.005
+        assert brews["tds_percent"].between(0.8, 2.0).all()
+        for p in PERCENTILES:
+            exact = by_month["extraction_yield"].quantile(p / 100)
+            np.testing.assert_allclose(trend[f"ey_p{p}"], exact, atol=ey_width)
+            exact = by_month["tds_percent"].quantile(p / 100)
+            np.testing.assert_allclose(trend[f"tds_p{p}"], exact, atol=tds_width)
+
+
+def test_adding_brews_matches_a_full_rebuild():
+    log = random_log(n=200)
+    rollups = BrewRollups.from_brew_log(log.iloc[:150])
+    for brew in log.iloc[150:].to_dict("records"):
+        rollups.add_brew(brew)
+    rebuilt = BrewRollups.from_brew_log(log)
+
+    for granularity in GRANULARITIES:
+        for dimension in DIMENSIONS:
+            for key in rebuilt.keys(dimension):
+                pd.testing.assert_frame_equal(
+                    rollups.trend(granularity, dimension, key),
+                    rebuilt.trend(granularity, dimension, key),
+                )
+
+
+def test_percentiles_of_single_and_tied_brews():
+    log = brew_log(tds_percent=[1.312, 1.312, 1.312, 1.451])
+    trend = BrewRollups.from_brew_log(log.iloc[:1]).trend("Monthly", "All")
+
+    assert abs(trend["tds_p50"].iloc[0] - 1.312) <= 0.005
+    assert abs(trend["ey_p90"].iloc[0] - 20.0) <= np.diff(EY_BIN_EDGES).max()
+
+    trend = BrewRollups.from_brew_log(log).trend("Monthly", "All")
+    exact = log["tds_percent"].quantile([0.1, 0.5, 0.9]).to_numpy()
+    np.testing.assert_allclose(
+        trend[["tds_p10", "tds_p50", "tds_p90"]].iloc[0], exact, atol=0.005
+    )
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.suggestions.brew_suggestion_model import (
+    RIDGE_PENALTY,
+    BrewModelCache,
+    parse_grind_setting,
+)
+
+
+def brew_log(n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    grind = rng.uniform(15, 30, n)
+    ratio = rng.uniform(14, 18, n)
+    return pd.DataFrame(
+        {
+            "coffee_id": rng.choice(["a", "b"], n),
+            "water_recipe": rng.choice(["", "Rao"], n),
+            "dose": 15.0,
+            "total_water": 15.0 * ratio,
+            "grind_size": [f"{g:.1f} clicks" for g in grind],
+            "extraction_yield": 30 - 0.4 * grind + 0.2 * ratio + rng.normal(0, 0.1, n),
+            "tds_percent": 2.5 - 0.01 * grind - 0.06 * ratio + rng.normal(0, 0.01, n),
+        }
+    )
+
+
+def test_parse_grind_setting():
+    assert parse_grind_setting("22 clicks") == 22.0
+    assert parse_grind_setting("setting 3.5") == 3.5
+    assert np.isnan(parse_grind_setting("fine"))
+    assert np.isnan(parse_grind_setting(None))
+
+
+def test_bulk_fit_matches_adding_brews_one_at_a_time():
+    log = brew_log()
+    bulk = BrewModelCache.from_brew_log(log)
+    incremental = BrewModelCache()
+    for brew in log.to_dict("records"):
+        incremental.add_brew(brew)
+
+    assert bulk.models.keys() == incremental.models.keys()
+    for key, model in bulk.models.items():
+        other = incremental.models[key]
+        assert model.n == other.n
+        np.testing.assert_allclose(model.xtx, other.xtx)
+        np.testing.assert_allclose(model.xty, other.xty)
+        assert model.grind_range == pytest.approx(other.grind_range)
+        assert model.ratio_range == pytest.approx(other.ratio_range)
+
+
+def test_coefficients_match_a_direct_ridge_fit():
+    log = brew_log()
+    model = BrewModelCache.from_brew_log(log).models["a"]
+
+    rows = log[log["coffee_id"] == "a"]
+    x = np.column_stack(
+        [
+            np.ones(len(rows)),
+            rows["grind_size"].map(parse_grind_setting),
+            rows["total_water"] / rows["dose"],
+        ]
+    )
+    y = rows[["extraction_yield", "tds_percent"]].to_numpy()
+    penalty = np.diag([0.0, RIDGE_PENALTY, RIDGE_PENALTY]) * len(rows)
+    expected = np.linalg.solve(x.T @ x + penalty, x.T @ y)
+
+    np.testing.assert_allclose(np.array(model.coefficients).T, expected)
+
+
+def test_recommendation_lands_on_the_target():
+    model = BrewModelCache.from_brew_log(brew_log()).model_for("a")
+    target_ey, target_tds = model.predict(22.0, 16.0)
+
+    grind, ratio = model.recommend(target_ey, target_tds)
+
+    assert model.predict(grind, ratio) == pytest.approx((target_ey, target_tds))
+
+
+def test_model_for_falls_back_to_the_coffee_wide_model():
+    cache = BrewModelCache.from_brew_log(brew_log())
+
+    assert cache.model_for("a", "Rao") is cache.models[("a", "Rao")]
+    assert cache.model_for("a", "Unknown recipe") is cache.models["a"]
+    assert cache.model_for("missing") is None
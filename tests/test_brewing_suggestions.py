@@ -0,0 +1,59 @@
+import pytest
+
+from modules.suggestions import get_brewing_suggestions, rule_packs
+from modules.suggestions.get_brewing_suggestions import (
+    RULES,
+    get_brewing_suggestions as suggestions,
+    resolve_suggestion_keys,
+)
+
+
+@pytest.fixture(autouse=True)
+def rule_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(rule_packs, "RULE_CACHE_FILE", str(tmp_path / "rules.pickle"))
+    monkeypatch.setattr(RULES, "compiled", None)
+    monkeypatch.setattr(RULES, "signature", None)
+
+
+@pytest.mark.parametrize(
+    "varietal, key",
+    [
+        ("Ethiopia Yirgacheff", "ethiopian/yirgacheffe"),
+        ("Ethiopia Yirgacheffe", "ethiopian/yirgacheffe"),
+        ("Ethiopia Sidama", "ethiopian/sidamo"),
+        ("Ethiopia", "ethiopian"),
+        ("Bourbon Rosado", "bourbon/pink_bourbon"),
+        ("Bourbon Amarillo", "bourbon/yellow_bourbon"),
+        ("Pink Bourbon", "bourbon/pink_bourbon"),
+        ("Catuai Amarelo", "catuai/yellow_catuai"),
+        ("Catuai Vermelho", "catuai/red_catuai"),
+        ("Typika", "typica"),
+        ("SL 28", "sl28"),
+        ("Colombia", ""),
+        ("", ""),
+    ],
+)
+def test_varietal_keys(varietal, key):
+    assert resolve_suggestion_keys(varietal, "")[0] == key
+
+
+@pytest.mark.parametrize(
+    "process, key",
+    [
+        ("Natrual", "natural"),
+        ("Fully Washed", "washed"),
+        ("Double Washed", "washed/double_washed"),
+        ("Typika", ""),
+    ],
+)
+def test_process_keys(process, key):
+    assert resolve_suggestion_keys("", process)[1] == key
+
+
+def test_variant_found_by_typo_gets_its_own_suggestions():
+    variant = suggestions("Ethiopia Yirgacheff", "Washed")
+    parent = suggestions("Ethiopia", "Washed")
+
+    assert variant == suggestions("Ethiopia Yirgacheffe", "Washed")
+    assert variant != parent
+    assert get_brewing_suggestions.rule_pack_errors() == []
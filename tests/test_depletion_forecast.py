@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.inventory.depletion_forecast import (
+    CONSUMPTION_WINDOW_DAYS,
+    FORECAST_COLUMNS,
+    MIN_RATE_DAYS,
+    ConsumptionTracker,
+    forecast_depletion,
+    reorder_list,
+)
+
+TODAY = pd.Timestamp("2024-06-30")
+
+
+def random_log(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 90, n)
+    return pd.DataFrame(
+        {
+            "date": [
+                str(TODAY - pd.Timedelta(days=int(d), minutes=int(m)))
+                for d, m in zip(days, rng.integers(0, 600, n))
+            ],
+            "coffee_id": rng.choice(["a", "b", "c"], n),
+            "dose": rng.uniform(12, 20, n).round(1),
+        }
+    )
+
+
+def test_adding_brews_matches_a_full_rebuild():
+    log = random_log()
+    tracker = ConsumptionTracker.from_brew_log(log.iloc[:250], TODAY)
+    for brew in log.iloc[250:].to_dict("records"):
+        tracker.add_brew(brew)
+    rebuilt = ConsumptionTracker.from_brew_log(log, TODAY)
+
+    assert tracker.first_brew == rebuilt.first_brew
+    for today in [TODAY, TODAY + pd.Timedelta(days=10)]:
+        pd.testing.assert_series_equal(
+            tracker.rates(today).sort_index(), rebuilt.rates(today).sort_index()
+        )
+
+
+def test_unusable_brews_are_skipped():
+    tracker = ConsumptionTracker()
+    tracker.add_brew({"date": "not a date", "coffee_id": "a", "dose": 15})
+    tracker.add_brew({"date": "2024-06-30", "coffee_id": "a", "dose": ""})
+
+    assert tracker.rates(TODAY).empty
+
+
+def test_rates_average_over_the_window():
+    tracker = ConsumptionTracker()
+    brews = [
+        # An old coffee: brewed since long before the window
+        ("2024-01-01", "old", 100.0),
+        ("2024-06-30", "old", 15.0),
+        (str(TODAY - pd.Timedelta(days=CONSUMPTION_WINDOW_DAYS - 1)), "old", 15.0),
+        # A new bag a fortnight in
+        ("2024-06-17", "new", 18.0),
+        ("2024-06-29", "new", 10.0),
+        # Brewed once yesterday
+        ("2024-06-29", "single", 14.0),
+    ]
+    for date, coffee_id, dose in brews:
+        tracker.add_brew({"date": date, "coffee_id": coffee_id, "dose": dose})
+
+    rates = tracker.rates(TODAY)
+
+    assert rates["old"] == pytest.approx(30.0 / CONSUMPTION_WINDOW_DAYS)
+    assert rates["new"] == pytest.approx(28.0 / 14)
+    assert rates["single"] == pytest.approx(14.0 / MIN_RATE_DAYS)
+
+
+def test_forecast_projects_run_out_dates():
+    beans = pd.DataFrame(
+        {"id": ["a", "b", "c", "d"], "grams_remaining": [100, 30, "", -5]},
+        index=[4, 2, 8, 6],
+    )
+    rates = pd.Series({"a": 12.5, "b": 2.0, "d": 3.0})
+
+    forecast = forecast_depletion(beans, rates, TODAY)
+
+    assert forecast.index.tolist() == [4, 2, 8, 6]
+    assert forecast["daily_grams"].tolist() == [12.5, 2.0, 0.0, 3.0]
+    assert forecast["days_left"].iloc[[0, 1, 3]].tolist() == [8.0, 15.0, 0.0]
+    assert forecast["days_left"].isna().tolist() == [False, False, True, False]
+    assert forecast["run_out_date"].tolist()[:2] == [
+        pd.Timestamp("2024-07-08"),
+        pd.Timestamp("2024-07-15"),
+    ]
+    assert pd.isna(forecast.loc[8, "run_out_date"])
+
+
+def test_partial_days_round_up():
+    beans = pd.DataFrame({"id": ["a"], "grams_remaining": [100]})
+
+    forecast = forecast_depletion(beans, pd.Series({"a": 30.0}), TODAY)
+
+    assert forecast["run_out_date"].iloc[0] == TODAY + pd.Timedelta(days=4)
+
+
+def test_reorder_list_is_soonest_first():
+    beans = pd.DataFrame(
+        {
+            "id": ["a", "b", "c"],
+            "name": ["Kenya", "Gesha", "Bourbon"],
+            "grams_remaining": [60, 10, 500],
+        }
+    )
+    rates = pd.Series({"a": 10.0, "b": 5.0, "c": 10.0})
+
+    due = reorder_list(beans, forecast_depletion(beans, rates, TODAY))
+
+    assert due["name"].tolist() == ["Gesha", "Kenya"]
+    assert due.columns.tolist() == ["id", "name", "grams_remaining"] + FORECAST_COLUMNS
+
+
+def test_empty_inventory():
+    forecast = forecast_depletion(pd.DataFrame(), pd.Series(dtype=float), TODAY)
+
+    assert forecast.empty
+    assert forecast.columns.tolist() == FORECAST_COLUMNS
@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+import re
+import tempfile
+import pandas as pd
+import pytest
+from modules.brew_export.export_brew_log import export_brew_log
+
+HEADER = ["date", "coffee_name", "tds_percent", "notes"]
+ROWS = [
+    ["2024-01-0%d" % (i % 9 + 1), f"Coffee {i}", f"1.{30 + i}", "" if i % 2 else "x"]
+    for i in range(23)
+]
+
+
+class FakeWorksheet:
+    """Answers row_values/get like gspread, counting range requests."""
+
+    def __init__(self, header, rows):
+        self.values = [header] + rows
+        self.row_count = len(self.values) + 5  # Trailing blank rows
+        self.requests = 0
+
+    def row_values(self, row):
+        return self.values[row - 1]
+
+    def get(self, a1_range):
+        self.requests += 1
+        start, end = map(int, re.findall(r"[A-Z]+(\d+)", a1_range))
+        # gspread drops trailing empty cells
+        rows = self.values[start - 1 : end]
+        return [
+            row[: max((i + 1 for i, v in enumerate(row) if v), default=0)]
+            for row in rows
+        ]
+
+
+class FakeSpreadsheet:
+    def __init__(self, worksheet):
+        self.brew_log = worksheet
+
+    def worksheet(self, name):
+        assert name == "Brew Log"
+        return self.brew_log
+
+
+@pytest.fixture
+def sheet():
+    return FakeSpreadsheet(FakeWorksheet(HEADER, ROWS))
+
+
+def export_bytes(sheet, file_format, **kwargs):
+    with export_brew_log(sheet, file_format, **kwargs) as export:
+        return export.read()
+
+
+def test_csv_round_trip(sheet):
+    data = export_bytes(sheet, "CSV", chunk_rows=5)
+    assert list(csv.reader(io.StringIO(data.decode("utf-8")))) == [HEADER] + ROWS
+    assert sheet.brew_log.requests == 6
+
+
+def test_jsonl_round_trip(sheet):
+    lines = export_bytes(sheet, "JSONL", chunk_rows=7).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [dict(zip(HEADER, r)) for r in ROWS]
+
+
+def test_parquet_round_trip(sheet):
+    pytest.importorskip("pyarrow")
+    data = export_bytes(sheet, "Parquet", chunk_rows=10)
+    frame = pd.read_parquet(io.BytesIO(data))
+    assert frame.columns.tolist() == HEADER
+    assert frame.astype(str).values.tolist() == ROWS
+
+
+def test_empty_log():
+    sheet = FakeSpreadsheet(FakeWorksheet([], []))
+    assert export_bytes(sheet, "CSV") == b""
+
+
+def test_export_is_a_file_download_button_accepts(sheet):
+    download_data = pytest.importorskip("streamlit.runtime.download_data_util")
+    with export_brew_log(sheet, "CSV", chunk_rows=5) as export:
+        data, _ = download_data.convert_data_to_bytes_and_infer_mime(
+            export, unsupported_error=TypeError(type(export))
+        )
+    assert data == export_bytes(sheet, "CSV")
+
+
+def test_failed_export_closes_its_file(sheet, monkeypatch):
+    opened = []
+    real_temporary_file = tempfile.TemporaryFile
+
+    def temporary_file(*args, **kwargs):
+        opened.append(real_temporary_file(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(tempfile, "TemporaryFile", temporary_file)
+    sheet.brew_log.get = lambda a1_range: 1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        export_brew_log(sheet, "CSV")
+    assert opened[0].closed
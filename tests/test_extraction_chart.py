@@ -0,0 +1,61 @@
+import pytest
+
+from modules.extraction_chart import add_extraction_chart as chart
+from modules.extraction_chart.add_extraction_chart import (
+    brew_point_label,
+    quantize_brew_point,
+    render_extraction_chart,
+)
+
+
+@pytest.mark.parametrize(
+    "tds, ey, label",
+    [
+        (1.3449, 20.13, "1.34% TDS\n20.1% EY\nIdeal"),
+        (1.35, 20.17, "1.35% TDS\n20.2% EY\nIdeal"),
+        # Plotted at 17.0 but still under-extracted
+        (1.2, 16.98, "1.20% TDS\n17.0% EY\nUnder-extracted"),
+        (1.5, 22.01, "1.50% TDS\n22.0% EY\nOver-extracted"),
+    ],
+)
+def test_labels_come_from_the_unrounded_point(tds, ey, label):
+    assert brew_point_label(tds, ey) == label
+
+
+def test_no_label_without_a_point():
+    assert brew_point_label(None, 20.0) is None
+    assert brew_point_label(1.35, 0) is None
+    assert quantize_brew_point(None, None) == (None, None)
+
+
+def test_the_chart_prints_the_label(monkeypatch):
+    texts = []
+    real_figure = chart.Figure
+
+    def figure(*args, **kwargs):
+        fig = real_figure(*args, **kwargs)
+        real_add_subplot = fig.add_subplot
+
+        def add_subplot(*args, **kwargs):
+            ax = real_add_subplot(*args, **kwargs)
+            real_annotate = ax.annotate
+            ax.annotate = lambda text, *a, **kw: (
+                texts.append(text) or real_annotate(text, *a, **kw)
+            )
+            return ax
+
+        fig.add_subplot = add_subplot
+        return fig
+
+    monkeypatch.setattr(chart, "Figure", figure)
+    point = quantize_brew_point(1.2, 16.98)
+
+    render_extraction_chart.__wrapped__(
+        *point, dpi=10, label=brew_point_label(1.2, 16.98)
+    )
+    render_extraction_chart.__wrapped__(*point, dpi=10)
+
+    assert texts == [
+        "Current Brew\n1.20% TDS\n17.0% EY\nUnder-extracted",
+        "Current Brew\n1.20% TDS\n17.0% EY\nIdeal",
+    ]
@@ -0,0 +1,194 @@
+import asyncio
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from modules.brew_import import import_brews as pipeline
+from modules.brew_import.import_brews import (
+    BREW_LOG_COLUMNS,
+    deduct_grams_used,
+    import_brews,
+    iter_batches,
+    prepare_brew_batch,
+    write_brew_import,
+)
+from modules.extraction_calculator.calculate_extraction import calculate_extraction
+
+BEANS = pd.DataFrame(
+    {"id": ["a", "b"], "name": ["Kenya AA", "Gesha"], "grams_remaining": [250, 100]}
+)
+COFFEE_NAMES = dict(zip(BEANS["id"], BEANS["name"]))
+
+
+def upload(records):
+    lines = "\n".join(json.dumps(record) for record in records)
+    return io.BytesIO(lines.encode("utf-8"))
+
+
+def brew(**fields):
+    record = {
+        "date": "2024-03-01 08:30",
+        "coffee_id": "a",
+        "dose": 15,
+        "total_water": 250,
+        "tds_percent": 1.38,
+        "extraction_yield": 20.1,
+    }
+    record.update(fields)
+    return record
+
+
+def test_iter_batches_splits_a_stream():
+    batches = list(iter_batches(({"n": i} for i in range(12)), batch_size=5))
+
+    assert [len(batch) for batch in batches] == [5, 5, 2]
+    assert pd.concat(batches)["n"].tolist() == list(range(12))
+
+
+def test_import_spans_batches():
+    records = [brew(coffee_id="ab"[i % 2], dose=10 + i) for i in range(11)]
+
+    result = import_brews(upload(records), "jsonl", BEANS, batch_size=4)
+
+    assert len(result["rows"]) == 11
+    assert result["rows"].columns.tolist() == BREW_LOG_COLUMNS
+    assert result["rejected"] == {}
+    assert result["grams_used"].to_dict() == {
+        "a": sum(10 + i for i in range(0, 11, 2)),
+        "b": sum(10 + i for i in range(1, 11, 2)),
+    }
+
+
+def test_rejected_rows_are_counted_by_reason():
+    records = [
+        brew(),
+        brew(coffee_id=""),
+        brew(coffee_id="unknown"),
+        brew(date="not a date"),
+        brew(dose=0),
+        brew(tds_percent=None, extraction_yield=None),
+    ]
+
+    valid, rejected = prepare_brew_batch(pd.DataFrame(records), COFFEE_NAMES)
+
+    assert len(valid) == 1
+    assert valid["coffee_name"].tolist() == ["Kenya AA"]
+    assert rejected == {
+        "missing coffee_id": 1,
+        "coffee_id not in inventory": 1,
+        "invalid date": 1,
+        "invalid dose": 1,
+        "missing TDS/EY": 1,
+    }
+
+
+def test_tds_and_ey_come_from_scale_measurements():
+    weights = {"dry_weight": 300.0, "wet_weight": 336.0, "beverage_weight": 211.2}
+    record = brew(tds_percent=None, extraction_yield=None, **weights)
+
+    valid, rejected = prepare_brew_batch(pd.DataFrame([record]), COFFEE_NAMES)
+    expected = calculate_extraction(
+        15,
+        weights["dry_weight"],
+        250,
+        weights["beverage_weight"],
+        weights["wet_weight"],
+    )
+
+    assert rejected == {}
+    assert valid["tds_percent"].iloc[0] == pytest.approx(expected["tds_percent"])
+    assert valid["extraction_yield"].iloc[0] == pytest.approx(
+        expected["extraction_yield"]
+    )
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [
+        {"beverage_weight": 211.2},
+        {"dry_weight": 300.0, "wet_weight": 336.0},
+    ],
+)
+def test_ey_is_derived_from_a_measured_tds(weights):
+    # A brew whose measurements are consistent with each other, so either
+    # the beverage or the retention pins down the same EY
+    measured = calculate_extraction(15, 300.0, 250, 211.2, 336.0)
+    record = brew(tds_percent=measured["tds_percent"], extraction_yield=None, **weights)
+
+    valid, rejected = prepare_brew_batch(pd.DataFrame([record]), COFFEE_NAMES)
+
+    assert rejected == {}
+    assert valid["tds_percent"].iloc[0] == pytest.approx(measured["tds_percent"])
+    assert valid["extraction_yield"].iloc[0] == pytest.approx(
+        measured["extraction_yield"]
+    )
+
+
+def test_tds_alone_is_not_enough():
+    _, rejected = prepare_brew_batch(
+        pd.DataFrame([brew(extraction_yield=None)]), COFFEE_NAMES
+    )
+
+    assert rejected == {"missing TDS/EY": 1}
+
+
+def test_deduct_grams_used():
+    grams_used = pd.Series({"a": 30.0})
+
+    updated = deduct_grams_used(BEANS, grams_used)
+
+    assert updated["grams_remaining"].tolist() == [220.0, 100.0]
+    assert BEANS["grams_remaining"].tolist() == [250, 100]
+
+
+class FakeWorksheet:
+    def __init__(self):
+        self.appended = []
+
+    def append_rows(self, values, value_input_option):
+        self.appended.append((values, value_input_option))
+
+
+class FakeSpreadsheet:
+    def __init__(self):
+        self.brew_log = FakeWorksheet()
+
+    def worksheet(self, name):
+        assert name == "Brew Log"
+        return self.brew_log
+
+
+def test_import_is_written_with_one_append(monkeypatch):
+    written = []
+
+    async def write_worksheets_async(spreadsheet, data_dict):
+        written.append(data_dict)
+
+    monkeypatch.setattr(pipeline, "write_worksheets_async", write_worksheets_async)
+    rows = import_brews(upload([brew(), brew(coffee_id="b")]), "jsonl", BEANS)["rows"]
+    sheet = FakeSpreadsheet()
+    header = ["date", "coffee_id", "dose", "tds_percent"]
+
+    asyncio.run(write_brew_import(sheet, rows, header, beans_df=BEANS))
+
+    assert len(sheet.brew_log.appended) == 1
+    values, value_input_option = sheet.brew_log.appended[0]
+    assert values == [
+        ["2024-03-01 08:30", "a", 15.0, 1.38],
+        ["2024-03-01 08:30", "b", 15.0, 1.38],
+    ]
+    assert value_input_option == "USER_ENTERED"
+    assert list(written[0]) == ["Beans Inventory"]
+
+
+def test_an_empty_brew_log_gets_a_header_row():
+    rows = import_brews(upload([brew()]), "jsonl", BEANS)["rows"]
+    sheet = FakeSpreadsheet()
+
+    asyncio.run(write_brew_import(sheet, rows, []))
+
+    values, _ = sheet.brew_log.appended[0]
+    assert values[0] == BREW_LOG_COLUMNS
+    assert len(values) == 2
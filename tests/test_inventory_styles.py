@@ -0,0 +1,93 @@
+import pandas as pd
+
+from modules.inventory.bean_freshness import (
+    FRESHNESS_ENTERING,
+    FRESHNESS_PAST,
+    FRESHNESS_PEAK,
+    FRESHNESS_RESTING,
+    FRESHNESS_UNKNOWN,
+)
+from modules.inventory.inventory_styles import (
+    DEFAULT_LOW_STOCK_THRESHOLD,
+    FRESHNESS_STYLES,
+    LOW_STOCK_STYLE,
+    low_stock_mask,
+    low_stock_thresholds,
+    style_inventory,
+)
+
+
+def css(style):
+    prop, value = style.split(": ")
+    return [(prop, value)]
+
+
+def cell_styles(styler):
+    """The rendered style of each styled cell, keyed by (row, column name)."""
+    styler._compute()
+    columns = styler.data.columns
+    return {(row, columns[col]): style for (row, col), style in styler.ctx.items()}
+
+
+def test_thresholds_default_per_bean():
+    beans = pd.DataFrame(
+        {
+            "grams_remaining": [40, 40, 40, 40],
+            "low_stock_threshold": [30, "", None, "x"],
+        }
+    )
+
+    thresholds = low_stock_thresholds(beans)
+
+    assert thresholds.tolist() == [30.0] + [DEFAULT_LOW_STOCK_THRESHOLD] * 3
+    assert low_stock_mask(beans).tolist() == [False, True, True, True]
+
+
+def test_thresholds_without_the_column():
+    beans = pd.DataFrame({"grams_remaining": [10, 50, 120]}, index=[5, 1, 3])
+
+    assert low_stock_thresholds(beans).index.tolist() == [5, 1, 3]
+    assert low_stock_mask(beans).tolist() == [True, False, False]
+
+
+def test_low_stock_uses_each_beans_threshold():
+    table = pd.DataFrame(
+        {
+            "name": ["Kenya", "Gesha", "Bourbon", "Blend"],
+            "grams_remaining": [80, 80, 20, ""],
+            "low_stock_threshold": [100, "", 10, ""],
+        }
+    )
+
+    styles = cell_styles(style_inventory(table))
+
+    assert styles == {(0, "grams_remaining"): css(LOW_STOCK_STYLE)}
+
+
+def test_freshness_cells_are_coloured_by_status():
+    table = pd.DataFrame(
+        {
+            "grams_remaining": [500] * 5,
+            "freshness": [
+                FRESHNESS_RESTING,
+                FRESHNESS_ENTERING,
+                FRESHNESS_PEAK,
+                FRESHNESS_PAST,
+                FRESHNESS_UNKNOWN,
+            ],
+        }
+    )
+
+    styles = cell_styles(style_inventory(table))
+
+    assert styles == {
+        (1, "freshness"): css(FRESHNESS_STYLES[FRESHNESS_ENTERING]),
+        (2, "freshness"): css(FRESHNESS_STYLES[FRESHNESS_PEAK]),
+        (3, "freshness"): css(FRESHNESS_STYLES[FRESHNESS_PAST]),
+    }
+
+
+def test_tables_without_styled_columns():
+    table = pd.DataFrame({"name": ["Kenya"]})
+
+    assert cell_styles(style_inventory(table)) == {}
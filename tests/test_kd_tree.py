@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.water_chemistry.kd_tree import KDTree
+from modules.water_chemistry.recipe_matching import (
+    MATCH_COLUMNS,
+    RecipeIndex,
+    water_target_vector,
+)
+
+
+def brute_force(points, point, k):
+    distances = np.sqrt(((points - point) ** 2).sum(axis=1))
+    order = np.lexsort((np.arange(len(points)), distances))[:k]
+    return [(distances[i], int(i)) for i in order]
+
+
+@pytest.mark.parametrize("dims, k", [(1, 1), (2, 3), (3, 5), (3, 50)])
+def test_query_matches_brute_force(dims, k):
+    rng = np.random.default_rng(dims * 100 + k)
+    points = rng.uniform(0, 200, (40, dims))
+    tree = KDTree(points)
+
+    for point in rng.uniform(-20, 220, (25, dims)):
+        found = tree.query(point, k)
+        expected = brute_force(points, point, k)
+        assert [i for _, i in found] == [i for _, i in expected]
+        np.testing.assert_allclose([d for d, _ in found], [d for d, _ in expected])
+
+
+def test_query_with_duplicate_points():
+    points = np.array([[1.0, 1.0], [1.0, 1.0], [5.0, 5.0]])
+
+    found = KDTree(points).query([1.0, 1.0], k=2)
+
+    assert sorted(i for _, i in found) == [0, 1]
+    assert [d for d, _ in found] == [0.0, 0.0]
+
+
+def test_recipe_index_ranks_recipes_by_scaled_distance():
+    profiles = pd.DataFrame(
+        [[70.0, 40.0, 150.0], [35.0, 25.0, 80.0], [90.0, 50.0, 200.0]],
+        index=["Balanced", "Soft", "Hard"],
+        columns=MATCH_COLUMNS,
+    )
+
+    matches = RecipeIndex(profiles).nearest(
+        water_target_vector("Softer water, 80-90 ppm TDS"), k=2
+    )
+
+    assert [name for name, _ in matches] == ["Soft", "Balanced"]
+    assert RecipeIndex(profiles.iloc[:0]).nearest((70.0, 40.0, 150.0)) == []
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.extraction_calculator.calculate_extraction import calculate_extraction
+from modules.extraction_calculator.optimize_brew_parameters import (
+    brew_profiles,
+    optimize_brew_parameters,
+)
+
+DRY_WEIGHT = 300.0
+
+
+def brew(plan, retention_ratio):
+    """Feed a plan back through the calculator as if it had been brewed."""
+    wet_weight = DRY_WEIGHT + retention_ratio * plan["coffee_dose"]
+    return calculate_extraction(
+        plan["coffee_dose"],
+        DRY_WEIGHT,
+        plan["total_water"],
+        plan["beverage_weight"],
+        wet_weight,
+    )
+
+
+@pytest.mark.parametrize(
+    "target_tds, target_ey, retention_ratio",
+    [(1.35, 20.0, 2.0), (1.15, 18.5, 2.4), (1.55, 22.0, 1.6), (8.5, 19.0, 0.9)],
+)
+def test_plans_brew_to_their_target(target_tds, target_ey, retention_ratio):
+    plans = [
+        optimize_brew_parameters(
+            target_tds, target_ey, retention_ratio, total_water=250.0
+        ),
+        optimize_brew_parameters(
+            target_tds, target_ey, retention_ratio, coffee_dose=15.0
+        ),
+    ]
+
+    for plan in plans:
+        brewed = brew(plan, retention_ratio)
+        assert brewed["tds_percent"] == pytest.approx(target_tds)
+        assert brewed["extraction_yield"] == pytest.approx(target_ey)
+        assert brewed["brew_ratio"] == pytest.approx(plan["brew_ratio"])
+    assert plans[0]["total_water"] == 250.0
+    assert plans[1]["coffee_dose"] == 15.0
+
+
+def test_a_grid_of_targets_round_trips():
+    tds, ey = np.meshgrid(np.linspace(1.0, 1.7, 8), np.linspace(17.0, 23.0, 7))
+
+    plan = optimize_brew_parameters(tds, ey, total_water=500.0)
+    brewed = brew(plan, 2.0)
+
+    np.testing.assert_allclose(brewed["tds_percent"], tds)
+    np.testing.assert_allclose(brewed["extraction_yield"], ey)
+
+
+def test_brew_profiles_recover_retention():
+    plans = [
+        optimize_brew_parameters(tds, ey, ratio, coffee_dose=dose)
+        for tds, ey, ratio, dose in [
+            (1.3, 19.5, 1.8, 15.0),
+            (1.4, 20.5, 1.8, 18.0),
+            (1.35, 21.0, 2.6, 20.0),
+        ]
+    ]
+    log = pd.DataFrame(
+        {
+            "coffee_id": ["a", "a", "b"],
+            "dose": [plan["coffee_dose"] for plan in plans],
+            "total_water": [plan["total_water"] for plan in plans],
+            "tds_percent": [1.3, 1.4, 1.35],
+            "extraction_yield": [19.5, 20.5, 21.0],
+        }
+    )
+
+    profiles = brew_profiles(log)
+
+    np.testing.assert_allclose(profiles["retention_ratio"], [1.8, 2.6])
+    assert profiles["brews"].tolist() == [2, 1]
+
+
+def test_plans_need_a_dose_or_water():
+    with pytest.raises(ValueError):
+        optimize_brew_parameters(1.35, 20.0)
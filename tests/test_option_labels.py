@@ -0,0 +1,131 @@
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+
+import app
+from modules.option_lists.option_labels import (
+    brewer_option_labels,
+    coffee_option_labels,
+    inventory_option_labels,
+    water_recipe_option_labels,
+)
+
+BEANS = pd.DataFrame(
+    {
+        "id": ["a", "b", "c", "d", None],
+        "name": ["Kenya AA", "Gesha", None, "Blend", "Orphan"],
+        "grams_remaining": [250, "12.25", 100, "", 40],
+    }
+)
+
+
+def test_coffee_labels():
+    assert coffee_option_labels(BEANS) == {
+        "a": "Kenya AA (250.0g)",
+        "b": "Gesha (12.2g)",
+    }
+
+
+def test_inventory_labels():
+    assert inventory_option_labels(BEANS) == {
+        "a": "Kenya AA (ID: a)",
+        "b": "Gesha (ID: b)",
+        "d": "Blend (ID: d)",
+    }
+
+
+def test_water_recipe_and_brewer_labels():
+    recipes = pd.DataFrame(
+        {"name": ["Rao", None, "Soft"], "notes": ["Balanced", "x", np.nan]}
+    )
+    brewers = pd.DataFrame({"name": ["V60", None, "Kalita"]})
+
+    assert water_recipe_option_labels(recipes) == {
+        "Rao": "Rao - Balanced",
+        "Soft": "Soft - nan",
+    }
+    assert brewer_option_labels(brewers) == {"V60": "V60", "Kalita": "Kalita"}
+
+
+@pytest.mark.parametrize(
+    "build_labels",
+    [
+        coffee_option_labels,
+        inventory_option_labels,
+        water_recipe_option_labels,
+        brewer_option_labels,
+    ],
+)
+def test_empty_or_unrelated_sheets_have_no_labels(build_labels):
+    assert build_labels(pd.DataFrame()) == {}
+    assert build_labels(pd.DataFrame({"other": [1]})) == {}
+
+
+@pytest.fixture
+def sheet():
+    st.session_state["sheet_id"] = uuid.uuid4().hex
+
+
+def counting(build_labels, calls):
+    def build(df):
+        calls.append(len(df))
+        return build_labels(df)
+
+    return build
+
+
+def test_saves_relabel_only_the_changed_rows(sheet):
+    beans = BEANS.iloc[:2].copy()
+    calls = []
+    builders = [counting(coffee_option_labels, calls), inventory_option_labels]
+    app.cache_worksheet("Beans Inventory", beans, 0)
+    for build in builders:
+        app.get_option_labels("Beans Inventory", beans, build)
+    assert calls == [2]
+
+    # One coffee used, one added
+    beans.at[1, "grams_remaining"] = 0.5
+    beans = pd.concat(
+        [beans, pd.DataFrame([{"id": "e", "name": "Sidamo", "grams_remaining": 340}])],
+        ignore_index=True,
+    )
+    previous_revision = app.get_data_revision("Beans Inventory")
+    app.cache_worksheet("Beans Inventory", beans, 1)
+    app.refresh_option_labels("Beans Inventory", previous_revision, beans.iloc[1:])
+
+    assert app.get_data_revision("Beans Inventory") != previous_revision
+    assert calls == [2, 2]
+    for build, full_rebuild in zip(
+        builders, [coffee_option_labels, inventory_option_labels]
+    ):
+        assert app.get_option_labels("Beans Inventory", beans, build) == full_rebuild(
+            beans
+        )
+    assert calls == [2, 2]
+
+
+def test_stale_labels_are_rebuilt_on_next_use(sheet):
+    beans = BEANS.iloc[:2].copy()
+    calls = []
+    build = counting(inventory_option_labels, calls)
+    app.cache_worksheet("Beans Inventory", beans, 0)
+    app.get_option_labels("Beans Inventory", beans, build)
+    stale_revision = app.get_data_revision("Beans Inventory")
+
+    # Saved twice without a refresh in between
+    beans.at[0, "name"] = "Kenya AB"
+    app.cache_worksheet("Beans Inventory", beans, 1)
+    previous_revision = app.get_data_revision("Beans Inventory")
+    beans.at[1, "name"] = "Gesha Natural"
+    app.cache_worksheet("Beans Inventory", beans, 2)
+    app.refresh_option_labels("Beans Inventory", previous_revision, beans.iloc[1:])
+
+    assert previous_revision != stale_revision
+    assert calls == [2]
+    assert app.get_option_labels(
+        "Beans Inventory", beans, build
+    ) == inventory_option_labels(beans)
+    assert calls == [2, 2]
@@ -0,0 +1,29 @@
+from modules.gsheets.provision_sheet import build_provisioning_requests
+from modules.gsheets.sheet_layout import WORKSHEET_LAYOUT
+
+
+def number_formats(requests):
+    return [
+        request["repeatCell"]["cell"]["userEnteredFormat"]["numberFormat"]
+        for request in requests
+        if "repeatCell" in request
+    ]
+
+
+def test_no_column_format_rounds_what_is_read_back():
+    formats = number_formats(build_provisioning_requests())
+
+    assert formats
+    assert {f["type"] for f in formats} <= {"TEXT", "DATE", "DATE_TIME"}
+
+
+def test_beans_inventory_has_the_low_stock_threshold_column():
+    assert "low_stock_threshold" in WORKSHEET_LAYOUT["Beans Inventory"]["columns"]
+
+
+def test_one_batch_lays_out_every_worksheet():
+    requests = build_provisioning_requests()
+    added = [r["addSheet"]["properties"]["title"] for r in requests if "addSheet" in r]
+
+    assert added == list(WORKSHEET_LAYOUT)
+    assert requests[-1] == {"deleteSheet": {"sheetId": 0}}
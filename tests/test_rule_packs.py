@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from modules.suggestions import rule_packs
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / "cache" / "rules.pickle"
+    monkeypatch.setattr(rule_packs, "RULE_CACHE_FILE", str(path))
+    return path
+
+
+def compile_keys(rule_set):
+    return sorted(rule["key"] for rule in rule_set["varietals"])
+
+
+def test_cache_round_trip(cache_file):
+    signature = ("fingerprint", rule_packs.RULE_CACHE_VERSION)
+    rule_packs._write_cache(signature, {"rules": ["geisha"], "errors": []})
+
+    assert rule_packs._read_cache(signature) == {"rules": ["geisha"], "errors": []}
+    assert rule_packs._read_cache(("other", rule_packs.RULE_CACHE_VERSION)) is None
+    assert os.stat(cache_file.parent).st_mode & 0o777 == 0o700
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="needs POSIX permissions")
+def test_cache_writable_by_others_is_ignored(cache_file):
+    signature = ("fingerprint", rule_packs.RULE_CACHE_VERSION)
+    rule_packs._write_cache(signature, {"rules": [], "errors": []})
+    os.chmod(cache_file, 0o666)
+
+    assert rule_packs._read_cache(signature) is None
+
+
+def test_signature_covers_compiler_source(cache_file):
+    rules = rule_packs.CompiledRules(compile_keys)
+    rules.get()
+
+    assert rules.signature[0] == rule_packs.compiler_fingerprint(compile_keys)
+    assert rules.signature[1:] == rule_packs.pack_signature(
+        rule_packs.rule_pack_files()
+    )
+    assert rules.get() == compile_keys(
+        rule_packs.load_rule_packs(rule_packs.rule_pack_files())[0]
+    )
@@ -0,0 +1,149 @@
+import os
+import pickle
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from modules.gsheets import shared_cache
+from modules.gsheets.shared_cache import (
+    FileCache,
+    MemoryCache,
+    cache_key,
+    get_or_load,
+    store_worksheet,
+    worksheet_generation,
+    worksheet_key,
+)
+
+
+@pytest.fixture(params=["memory", "file"])
+def cache(request, tmp_path):
+    return MemoryCache() if request.param == "memory" else FileCache(str(tmp_path))
+
+
+def test_get_or_load_loads_once(cache):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return "value"
+
+    assert get_or_load(cache_key("k"), load, cache=cache) == "value"
+    assert get_or_load(cache_key("k"), load, cache=cache) == "value"
+    assert len(calls) == 1
+
+
+def test_expired_entries_are_reloaded(cache):
+    cache.set(cache_key("k"), "stale", ttl=-1)
+
+    assert cache.get(cache_key("k")) is None
+    assert get_or_load(cache_key("k"), lambda: "fresh", cache=cache) == "fresh"
+
+
+def test_refresh_ignores_the_cached_value(cache):
+    cache.set(cache_key("k"), "stale", ttl=60)
+
+    value = get_or_load(cache_key("k"), lambda: "fresh", cache=cache, refresh=True)
+
+    assert value == "fresh"
+    assert cache.get(cache_key("k")) == "fresh"
+
+
+def test_waiters_take_the_lease_holders_result(cache, monkeypatch):
+    monkeypatch.setattr(shared_cache, "LEASE_POLL_INTERVAL", 0.01)
+    key = cache_key("k")
+    assert cache.acquire(key, ttl=60)
+
+    results = []
+    waiter = threading.Thread(
+        target=lambda: results.append(
+            get_or_load(key, lambda: "waiter", cache=cache, refresh=True)
+        )
+    )
+    waiter.start()
+    time.sleep(0.05)
+    cache.set(key, "holder", ttl=60)
+    cache.release(key)
+    waiter.join(timeout=5)
+
+    assert results == ["holder"]
+
+
+def test_failed_load_releases_the_lease(cache):
+    def fail():
+        raise RuntimeError("Sheets API error")
+
+    with pytest.raises(RuntimeError):
+        get_or_load(cache_key("k"), fail, cache=cache)
+    assert cache.acquire(cache_key("k"), ttl=60)
+
+
+def test_store_worksheet_moves_the_generation_on_and_drops_the_old_frame(cache):
+    first = store_worksheet("sheet", "Brew Log", pd.DataFrame({"ey": [20.0]}), cache)
+    second = store_worksheet("sheet", "Brew Log", pd.DataFrame({"ey": [21.0]}), cache)
+
+    assert second > first
+    assert worksheet_generation("sheet", "Brew Log", cache) == second
+    assert cache.get(worksheet_key("sheet", "Brew Log", first)) is None
+    stored = cache.get(worksheet_key("sheet", "Brew Log", second))
+    assert stored["ey"].tolist() == [21.0]
+
+
+def test_store_worksheet_drops_the_frame_loaded_before_any_save(cache):
+    cache.set(worksheet_key("sheet", "Brew Log", 0), pd.DataFrame(), ttl=60)
+
+    store_worksheet("sheet", "Brew Log", pd.DataFrame({"ey": [20.0]}), cache)
+
+    assert cache.get(worksheet_key("sheet", "Brew Log", 0)) is None
+
+
+def test_memory_cache_sweeps_expired_entries_on_set(monkeypatch):
+    monkeypatch.setattr(shared_cache, "SWEEP_INTERVAL", 0)
+    cache = MemoryCache()
+    cache.set(cache_key("old"), "value", ttl=-1)
+    cache.acquire(cache_key("old"), ttl=-1)
+
+    cache.set(cache_key("new"), "value", ttl=60)
+
+    assert list(cache.values) == [cache_key("new")]
+    assert cache.leases == {}
+
+
+def test_file_cache_sweeps_expired_entries_on_set(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_cache, "SWEEP_INTERVAL", 0)
+    cache = FileCache(str(tmp_path))
+    cache.set(cache_key("old"), "value", ttl=-1)
+
+    cache.set(cache_key("new"), "value", ttl=60)
+
+    assert os.listdir(tmp_path) == [
+        os.path.basename(cache._path(cache_key("new"), ".pickle"))
+    ]
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [b"", b"not a pickle", pickle.dumps(("missing", "fields"))],
+)
+def test_file_cache_treats_unreadable_entries_as_misses(tmp_path, contents):
+    cache = FileCache(str(tmp_path))
+    path = cache._path(cache_key("k"), ".pickle")
+    with open(path, "wb") as f:
+        f.write(contents)
+
+    assert cache.get(cache_key("k")) is None
+    assert not os.path.exists(path)
+
+
+def test_file_cache_takes_over_abandoned_leases(tmp_path):
+    cache = FileCache(str(tmp_path))
+    key = cache_key("k")
+
+    assert cache.acquire(key, ttl=60)
+    assert not cache.acquire(key, ttl=60)
+
+    past = time.time() - 120
+    os.utime(cache._path(key, ".lease"), (past, past))
+    assert cache.acquire(key, ttl=60)
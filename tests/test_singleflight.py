@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from modules.gsheets import shared_cache, worksheet_io
+from modules.gsheets.shared_cache import MemoryCache
+from modules.gsheets.singleflight import SingleFlight
+
+CALLERS = 8
+
+
+def call_together(func, callers=CALLERS):
+    """Run func on callers threads released at the same moment."""
+    barrier = threading.Barrier(callers)
+
+    def call():
+        barrier.wait()
+        try:
+            return func()
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(callers) as pool:
+        return list(pool.map(lambda _: call(), range(callers)))
+
+
+def slow(result, calls):
+    def load():
+        calls.append(threading.get_ident())
+        time.sleep(0.2)  # Long enough for every caller to arrive
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return load
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    calls = []
+    result = object()
+
+    results = call_together(lambda: flight.do("key", slow(result, calls)))
+
+    assert len(calls) == 1
+    assert all(r is result for r in results)
+    assert flight.in_flight() == 0
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight()
+    calls = []
+    error = ValueError("quota exceeded")
+
+    results = call_together(lambda: flight.do("key", slow(error, calls)))
+
+    assert len(calls) == 1
+    assert all(r is error for r in results)
+
+    # A failed call isn't remembered
+    assert flight.in_flight() == 0
+    assert flight.do("key", lambda: "retried") == "retried"
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    calls = []
+    keys = iter(range(CALLERS))
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            key = next(keys)
+        return flight.do(key, slow(key, calls))
+
+    results = call_together(call)
+
+    assert len(calls) == CALLERS
+    assert sorted(results) == list(range(CALLERS))
+
+
+def test_finished_calls_run_afresh():
+    flight = SingleFlight()
+
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+
+
+class FakeWorksheet:
+    def __init__(self):
+        self.calls = []
+
+    def get_all_values(self):
+        return slow([["name", "grams"], ["Gesha", "250"]], self.calls)()
+
+
+class FakeSpreadsheet:
+    id = "sheet"
+
+    def __init__(self):
+        self.beans = FakeWorksheet()
+
+    def worksheet(self, name):
+        assert name == "Beans Inventory"
+        return self.beans
+
+
+@pytest.mark.parametrize("refresh", [False, True])
+def test_concurrent_fetches_make_one_request(refresh, monkeypatch):
+    monkeypatch.setattr(shared_cache, "SHARED_CACHE", MemoryCache())
+    sheet = FakeSpreadsheet()
+
+    frames = call_together(
+        lambda: worksheet_io.fetch_worksheet(sheet, "Beans Inventory", refresh)
+    )
+
+    assert len(sheet.beans.calls) == 1
+    expected = pd.DataFrame([["Gesha", "250"]], columns=["name", "grams"])
+    for frame in frames:
+        pd.testing.assert_frame_equal(frame, expected)
+    assert worksheet_io.WORKSHEET_FETCHES.in_flight() == 0
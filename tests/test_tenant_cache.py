@@ -0,0 +1,29 @@
+import pandas as pd
+
+from modules.gsheets.tenant_cache import TenantCache
+
+
+def test_shallow_copies_keep_edits_to_one_session():
+    cache = TenantCache(tenant_budget=2**20, process_budget=2**20)
+    cache.put("sheet", ("worksheet", "Beans Inventory"), pd.DataFrame({"grams": [250]}))
+
+    session_df = cache.get("sheet", ("worksheet", "Beans Inventory")).copy(deep=False)
+    session_df.at[0, "grams"] = 100
+
+    shared = cache.get("sheet", ("worksheet", "Beans Inventory"))
+    assert shared.at[0, "grams"] == 250
+
+
+def test_least_recently_used_entries_are_evicted_past_the_budget():
+    frame = pd.DataFrame({"x": range(1000)})
+    size = int(frame.memory_usage(deep=True).sum())
+    cache = TenantCache(tenant_budget=2 * size + size // 2, process_budget=10 * size)
+
+    cache.put("sheet", "a", frame)
+    cache.put("sheet", "b", frame.copy())
+    cache.get("sheet", "a")
+    cache.put("sheet", "c", frame.copy())
+
+    assert cache.get("sheet", "b") is None
+    assert cache.get("sheet", "a") is not None
+    assert cache.get("sheet", "c") is not None
@@ -0,0 +1,87 @@
+import itertools
+
+import pytest
+
+from modules.suggestions.trigram_index import (
+    TrigramIndex,
+    _trigrams,
+    edit_distance,
+    normalize_name,
+)
+
+NAMES = {
+    "Yirgacheffe": "yirgacheffe",
+    "Gesha": "gesha",
+    "Geisha": "gesha",
+    "SL28": "sl28",
+    "Gesha Colombia": "gesha_colombia",
+    "Pink Bourbon": "pink_bourbon",
+    "Bourbon": "bourbon",
+    "Natural": "natural",
+}
+
+
+def dice(a, b):
+    a, b = _trigrams(a), _trigrams(b)
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def brute_force_search(names, text, threshold):
+    # Every phrase of the input against every name, as the index should do
+    words = normalize_name(text).split()
+    best_key, best_score = "", 0.0
+    for size, start in itertools.product(range(1, 4), range(len(words))):
+        phrase = words[start : start + size]
+        if len(phrase) != size:
+            continue
+        for name, key in names.items():
+            name_words = normalize_name(name).split()
+            if len(name_words) not in (size, 1):
+                continue
+            score = dice("".join(phrase), "".join(name_words))
+            if score > best_score:
+                best_key, best_score = key, score
+    return (best_key, best_score) if best_score >= threshold else ("", 0.0)
+
+
+def test_edit_distance():
+    assert edit_distance("natrual", "natural") == 1
+    assert edit_distance("typika", "typica") == 1
+    assert edit_distance("kitten", "sitting") == 3
+    assert edit_distance("", "sl28") == 4
+
+
+def test_normalize_name():
+    assert normalize_name("  Yirgachéffe-Kochere ") == "yirgacheffe kochere"
+    assert normalize_name(None) == ""
+
+
+@pytest.mark.parametrize(
+    "text, key",
+    [
+        ("Yirgacheff", "yirgacheffe"),
+        ("yrgacheffe washed", "yirgacheffe"),
+        ("Geisha", "gesha"),
+        ("SL 28", "sl28"),
+        ("pink bourbn", "pink_bourbon"),
+        ("Colombia", ""),
+        ("Caturra", ""),
+        # One typo from a short name, below the trigram threshold
+        ("Natrual", "natural"),
+        ("bourbno", "bourbon"),
+        ("Gehsa", ""),
+    ],
+)
+def test_search(text, key):
+    assert TrigramIndex(NAMES).search(text)[0] == key
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Yirgacheff", "naturl process", "Geisha Colombia", "SL 28 Kenya", "Bourbn"],
+)
+def test_search_matches_brute_force(text):
+    key, score = TrigramIndex(NAMES).search(text)
+    expected_key, expected_score = brute_force_search(NAMES, text, 0.6)
+
+    assert (key, score) == (expected_key, pytest.approx(expected_score))
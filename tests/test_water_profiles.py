@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.water_chemistry.water_profiles import (
+    CACO3_MOLAR_MASS,
+    DEFAULT_CONCENTRATES,
+    DROP_COLUMNS,
+    DROP_VOLUME_ML,
+    WATER_PROFILE_COLUMNS,
+    water_profiles,
+)
+
+
+def recipe_profile(recipe, concentrates=DEFAULT_CONCENTRATES):
+    """One recipe's minerals, salt by salt."""
+    profile = dict.fromkeys(WATER_PROFILE_COLUMNS, 0.0)
+    litres = float(recipe["total_volume_ml"]) / 1000
+    for column, concentrate in concentrates.items():
+        grams = float(recipe.get(column) or 0) * DROP_VOLUME_ML
+        mmol = grams * concentrate["grams_per_litre"] / concentrate["molar_mass"]
+        ppm = mmol / litres
+        profile[f"{concentrate['ion']}_ppm"] += ppm * concentrate["ion_mass"]
+        profile["tds_ppm"] += ppm * concentrate["dissolved_mass"]
+        if concentrate["adds"] == "hardness":
+            profile["hardness_ppm"] += ppm * CACO3_MOLAR_MASS
+        else:
+            profile["alkalinity_ppm"] += ppm * CACO3_MOLAR_MASS / 2
+    return [profile[column] for column in WATER_PROFILE_COLUMNS]
+
+
+def random_recipes(n=40, seed=4):
+    rng = np.random.default_rng(seed)
+    recipes = pd.DataFrame(
+        rng.integers(0, 30, (n, len(DROP_COLUMNS))), columns=DROP_COLUMNS
+    )
+    recipes.insert(0, "name", [f"Recipe {i}" for i in range(n)])
+    recipes["total_volume_ml"] = rng.choice([500, 1000, 3785], n)
+    return recipes
+
+
+def test_matrix_matches_a_per_recipe_loop():
+    recipes = random_recipes()
+
+    profiles = water_profiles(recipes)
+
+    expected = [recipe_profile(recipe) for recipe in recipes.to_dict("records")]
+    assert profiles.index.tolist() == recipes["name"].tolist()
+    np.testing.assert_allclose(profiles.to_numpy(), expected)
+
+
+def test_concentrate_strengths_can_be_overridden():
+    recipes = random_recipes(n=10)
+    concentrates = {column: dict(c) for column, c in DEFAULT_CONCENTRATES.items()}
+    concentrates["calcium_drops"]["grams_per_litre"] = 80.0
+
+    profiles = water_profiles(recipes, concentrates)
+
+    expected = [
+        recipe_profile(recipe, concentrates) for recipe in recipes.to_dict("records")
+    ]
+    np.testing.assert_allclose(profiles.to_numpy(), expected)
+
+
+def test_one_drop_of_epsom_salt_in_a_litre():
+    recipe = pd.DataFrame(
+        [{"name": "Epsom", "magnesium_drops": 1, "total_volume_ml": 1000}]
+    )
+
+    profile = water_profiles(recipe).loc["Epsom"]
+
+    # 5 mg of MgSO4·7H2O
+    assert profile["magnesium_ppm"] == pytest.approx(5 / 246.47 * 24.305)
+    assert profile["hardness_ppm"] == pytest.approx(5 / 246.47 * 100.09)
+    assert profile["alkalinity_ppm"] == 0
+    assert profile["tds_ppm"] == pytest.approx(5 / 246.47 * 120.37)
+
+
+def test_unusable_rows():
+    recipes = pd.DataFrame(
+        {
+            "name": ["Soft", None, "No volume", "Soft"],
+            "calcium_drops": ["4", 3, 2, "bad"],
+            "sodium_drops": [2, 3, 2, 1],
+            "total_volume_ml": [1000, 1000, "", 500],
+        }
+    )
+
+    profiles = water_profiles(recipes)
+
+    # The last duplicate wins, missing drop columns and bad counts are no drops
+    assert profiles.index.tolist() == ["No volume", "Soft"]
+    assert profiles.loc["No volume"].isna().all()
+    np.testing.assert_allclose(
+        profiles.loc["Soft"],
+        recipe_profile({"sodium_drops": 1, "total_volume_ml": 500}),
+    )
+
+
+def test_empty_sheet():
+    profiles = water_profiles(pd.DataFrame())
+
+    assert profiles.empty
+    assert profiles.columns.tolist() == WATER_PROFILE_COLUMNS